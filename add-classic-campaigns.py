@@ -4,13 +4,14 @@ Add classic 1990s campaigns to corpus (allowing to exceed 157 target)
 """
 
 import json
+from campaign_resolver import split_new
+from corpus_store import CORPUS_FILE, STORE_DIR, CorpusStore
+from corpus_stats import CorpusColumns, print_counts, print_statistics
 
 def load_existing_corpus():
     """Load current corpus"""
     try:
-        with open('data/retrieval-corpus.json', 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            return data.get('campaigns', [])
+        return CorpusStore().campaigns()
     except FileNotFoundError:
         print("❌ Current corpus not found")
         return []
@@ -25,34 +26,10 @@ def load_new_campaigns():
         print(f"❌ Error loading campaigns: {e}")
         return []
 
-def create_campaign_key(campaign):
-    """Create unique key for deduplication"""
-    campaign_name = campaign.get('campaign', '').strip().lower()
-    brand = campaign.get('brand', '').strip().lower()
-    year = campaign.get('year', 0)
-    return f"{campaign_name}|{brand}|{year}"
-
 def deduplicate_campaigns(existing, new_campaigns):
     """Remove duplicates between existing and new campaigns"""
-    
-    existing_keys = set()
-    for campaign in existing:
-        key = create_campaign_key(campaign)
-        existing_keys.add(key)
-    
-    unique_new = []
-    duplicates = []
-    
-    for campaign in new_campaigns:
-        key = create_campaign_key(campaign)
-        
-        if key in existing_keys:
-            duplicates.append(campaign)
-        else:
-            unique_new.append(campaign)
-            existing_keys.add(key)
-    
-    return unique_new, duplicates
+    # Brand aliases, title variants and year tolerance, in one shared resolver
+    return split_new(existing, new_campaigns)
 
 def main():
     print("🔄 Adding classic 1990s campaigns (exceeding 157 target allowed)...")
@@ -83,40 +60,16 @@ def main():
     # Combine campaigns
     all_campaigns = existing_campaigns + unique_new
     
-    # Sort by year and brand
-    all_campaigns.sort(key=lambda x: (x.get('year', 0), x.get('brand', ''), x.get('campaign', '')))
-    
-    # Create final corpus
-    final_corpus = {"campaigns": all_campaigns}
-    
-    # Save updated corpus
-    with open('data/retrieval-corpus.json', 'w', encoding='utf-8') as f:
-        json.dump(final_corpus, f, indent=2, ensure_ascii=False)
-    
-    # Save backup
-    with open('corpus-with-classics.json', 'w', encoding='utf-8') as f:
-        json.dump(final_corpus, f, indent=2, ensure_ascii=False)
-    
-    print(f"\n💾 Updated corpus saved to data/retrieval-corpus.json")
-    print(f"💾 Backup saved to corpus-with-classics.json")
+    # Only the new batch is written: one store segment, appended to the corpus in place
+    if unique_new:
+        unique_new.sort(key=lambda x: (x.get('year', 0), x.get('brand', ''), x.get('campaign', '')))
+        segment = CorpusStore().append(unique_new, 'add-classic-campaigns.py')
+        print(f"\n💾 {len(unique_new)} campaigns appended to {CORPUS_FILE}")
+        print(f"💾 Segment {segment['file']} added to {STORE_DIR}")
     
     # Generate comprehensive statistics
-    brands = set(c.get('brand', '') for c in all_campaigns)
-    years = [c.get('year', 0) for c in all_campaigns if isinstance(c.get('year'), int)]
-    
-    all_devices = []
-    for campaign in all_campaigns:
-        devices = campaign.get('rhetoricalDevices', [])
-        if isinstance(devices, list):
-            all_devices.extend(devices)
-    
-    unique_devices = set(all_devices)
-    
-    print(f"\n📊 Final Dataset Statistics:")
-    print(f"   Total Campaigns: {len(all_campaigns)}")
-    print(f"   Unique Brands: {len(brands)}")
-    print(f"   Year Range: {min(years) if years else 'N/A'} - {max(years) if years else 'N/A'}")
-    print(f"   Rhetorical Devices: {len(unique_devices)}")
+    columns = CorpusColumns(existing_campaigns).extend(unique_new)
+    print_statistics(columns, "📊 Final Dataset Statistics:")
     
     # Show progress beyond target
     print(f"\n🎯 TARGET STATUS:")
@@ -136,25 +89,11 @@ def main():
         print(f"   {i+1:2d}. {campaign.get('campaign', 'Unknown')} - {campaign.get('brand', 'Unknown')} ({campaign.get('year', 'N/A')}) {award}")
     
     # Show decade distribution
-    decade_counts = {}
-    for year in years:
-        decade = (year // 10) * 10
-        decade_counts[decade] = decade_counts.get(decade, 0) + 1
-    
-    print(f"\n📅 Campaigns by Decade:")
-    for decade in sorted(decade_counts.keys()):
-        print(f"   {decade}s: {decade_counts[decade]} campaigns")
+    print_counts({f"{decade}s": count for decade, count in columns.decade_counts().items()},
+                 "📅 Campaigns by Decade:", "campaigns", limit=None)
     
     # Show most awarded brands
-    brand_counts = {}
-    for campaign in all_campaigns:
-        brand = campaign.get('brand', 'Unknown')
-        brand_counts[brand] = brand_counts.get(brand, 0) + 1
-    
-    top_brands = sorted(brand_counts.items(), key=lambda x: x[1], reverse=True)[:15]
-    print(f"\n🏢 Most Represented Brands:")
-    for brand, count in top_brands:
-        print(f"   {brand}: {count} campaigns")
+    print_counts(columns.brand_counts(), "🏢 Most Represented Brands:", "campaigns", limit=15)
     
     return len(all_campaigns)
 
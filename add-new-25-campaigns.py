@@ -4,13 +4,14 @@ Add 25 new campaigns to existing corpus
 """
 
 import json
+from campaign_resolver import split_new
+from corpus_store import CORPUS_FILE, STORE_DIR, CorpusStore
+from corpus_stats import CorpusColumns, print_statistics
 
 def load_existing_corpus():
     """Load current corpus"""
     try:
-        with open('data/retrieval-corpus.json', 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            return data.get('campaigns', [])
+        return CorpusStore().campaigns()
     except FileNotFoundError:
         print("❌ Current corpus not found")
         return []
@@ -27,26 +28,8 @@ def load_new_campaigns():
 
 def deduplicate_campaigns(existing, new_campaigns):
     """Remove duplicates between existing and new campaigns"""
-    
-    # Create lookup set for existing campaigns
-    existing_keys = set()
-    for campaign in existing:
-        key = f"{campaign.get('campaign', '').lower()}|{campaign.get('brand', '').lower()}|{campaign.get('year', 0)}"
-        existing_keys.add(key)
-    
-    # Filter new campaigns
-    unique_new = []
-    duplicates = []
-    
-    for campaign in new_campaigns:
-        key = f"{campaign.get('campaign', '').lower()}|{campaign.get('brand', '').lower()}|{campaign.get('year', 0)}"
-        
-        if key in existing_keys:
-            duplicates.append(campaign)
-        else:
-            unique_new.append(campaign)
-    
-    return unique_new, duplicates
+    # Brand aliases, title variants and year tolerance, in one shared resolver
+    return split_new(existing, new_campaigns)
 
 def main():
     print("🔄 Adding 25 new campaigns to corpus...")
@@ -75,40 +58,15 @@ def main():
     # Combine campaigns
     all_campaigns = existing_campaigns + unique_new
     
-    # Sort by year and brand for consistency
-    all_campaigns.sort(key=lambda x: (x.get('year', 0), x.get('brand', ''), x.get('campaign', '')))
-    
-    # Create final corpus
-    final_corpus = {"campaigns": all_campaigns}
-    
-    # Save updated corpus
-    with open('data/retrieval-corpus.json', 'w', encoding='utf-8') as f:
-        json.dump(final_corpus, f, indent=2, ensure_ascii=False)
-    
-    # Also save backup
-    with open('corpus-with-25-new.json', 'w', encoding='utf-8') as f:
-        json.dump(final_corpus, f, indent=2, ensure_ascii=False)
-    
-    print(f"\n💾 Updated corpus saved to data/retrieval-corpus.json")
-    print(f"💾 Backup saved to corpus-with-25-new.json")
+    # Only the new batch is written: one store segment, appended to the corpus in place
+    if unique_new:
+        unique_new.sort(key=lambda x: (x.get('year', 0), x.get('brand', ''), x.get('campaign', '')))
+        segment = CorpusStore().append(unique_new, 'add-new-25-campaigns.py')
+        print(f"\n💾 {len(unique_new)} campaigns appended to {CORPUS_FILE}")
+        print(f"💾 Segment {segment['file']} added to {STORE_DIR}")
     
     # Generate statistics
-    brands = set(c.get('brand', '') for c in all_campaigns)
-    years = [c.get('year', 0) for c in all_campaigns if isinstance(c.get('year'), int)]
-    
-    all_devices = []
-    for campaign in all_campaigns:
-        devices = campaign.get('rhetoricalDevices', [])
-        if isinstance(devices, list):
-            all_devices.extend(devices)
-    
-    unique_devices = set(all_devices)
-    
-    print(f"\n📊 Updated Dataset Statistics:")
-    print(f"   Total Campaigns: {len(all_campaigns)}")
-    print(f"   Unique Brands: {len(brands)}")
-    print(f"   Year Range: {min(years) if years else 'N/A'} - {max(years) if years else 'N/A'}")
-    print(f"   Rhetorical Devices: {len(unique_devices)}")
+    print_statistics(CorpusColumns(existing_campaigns).extend(unique_new), "📊 Updated Dataset Statistics:")
     
     # Check progress toward 157
     if len(all_campaigns) >= 157:
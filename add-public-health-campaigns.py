@@ -4,13 +4,14 @@ Add 38 public health and non-profit campaigns to reach 200 total campaigns
 """
 
 import json
+from campaign_resolver import split_new
+from corpus_store import CORPUS_FILE, STORE_DIR, CorpusStore
+from corpus_stats import CorpusColumns, print_counts, print_statistics
 
 def load_existing_corpus():
     """Load current corpus"""
     try:
-        with open('data/retrieval-corpus.json', 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            return data.get('campaigns', [])
+        return CorpusStore().campaigns()
     except FileNotFoundError:
         print("❌ Current corpus not found")
         return []
@@ -38,34 +39,10 @@ def load_public_health_campaigns():
         print(f"❌ Error loading public health campaigns: {e}")
         return []
 
-def create_campaign_key(campaign):
-    """Create unique key for deduplication"""
-    campaign_name = campaign.get('campaign', '').strip().lower()
-    brand = campaign.get('brand', '').strip().lower()
-    year = campaign.get('year', 0)
-    return f"{campaign_name}|{brand}|{year}"
-
 def deduplicate_campaigns(existing, new_campaigns):
     """Remove duplicates between existing and new campaigns"""
-    
-    existing_keys = set()
-    for campaign in existing:
-        key = create_campaign_key(campaign)
-        existing_keys.add(key)
-    
-    unique_new = []
-    duplicates = []
-    
-    for campaign in new_campaigns:
-        key = create_campaign_key(campaign)
-        
-        if key in existing_keys:
-            duplicates.append(campaign)
-        else:
-            unique_new.append(campaign)
-            existing_keys.add(key)
-    
-    return unique_new, duplicates
+    # Brand aliases, title variants and year tolerance, in one shared resolver
+    return split_new(existing, new_campaigns)
 
 def main():
     print("🔄 Adding public health and non-profit campaigns to reach 200 total...")
@@ -96,40 +73,16 @@ def main():
     # Combine campaigns
     all_campaigns = existing_campaigns + unique_new
     
-    # Sort by year and brand
-    all_campaigns.sort(key=lambda x: (x.get('year', 0), x.get('brand', ''), x.get('campaign', '')))
-    
-    # Create final corpus
-    final_corpus = {"campaigns": all_campaigns}
-    
-    # Save updated corpus
-    with open('data/retrieval-corpus.json', 'w', encoding='utf-8') as f:
-        json.dump(final_corpus, f, indent=2, ensure_ascii=False)
-    
-    # Save backup
-    with open('corpus-with-public-health.json', 'w', encoding='utf-8') as f:
-        json.dump(final_corpus, f, indent=2, ensure_ascii=False)
-    
-    print(f"\n💾 Updated corpus saved to data/retrieval-corpus.json")
-    print(f"💾 Backup saved to corpus-with-public-health.json")
+    # Only the new batch is written: one store segment, appended to the corpus in place
+    if unique_new:
+        unique_new.sort(key=lambda x: (x.get('year', 0), x.get('brand', ''), x.get('campaign', '')))
+        segment = CorpusStore().append(unique_new, 'add-public-health-campaigns.py')
+        print(f"\n💾 {len(unique_new)} campaigns appended to {CORPUS_FILE}")
+        print(f"💾 Segment {segment['file']} added to {STORE_DIR}")
     
     # Generate comprehensive statistics
-    brands = set(c.get('brand', '') for c in all_campaigns)
-    years = [c.get('year', 0) for c in all_campaigns if isinstance(c.get('year'), int)]
-    
-    all_devices = []
-    for campaign in all_campaigns:
-        devices = campaign.get('rhetoricalDevices', [])
-        if isinstance(devices, list):
-            all_devices.extend(devices)
-    
-    unique_devices = set(all_devices)
-    
-    print(f"\n📊 Final Dataset Statistics:")
-    print(f"   Total Campaigns: {len(all_campaigns)}")
-    print(f"   Unique Brands: {len(brands)}")
-    print(f"   Year Range: {min(years) if years else 'N/A'} - {max(years) if years else 'N/A'}")
-    print(f"   Rhetorical Devices: {len(unique_devices)}")
+    columns = CorpusColumns(existing_campaigns).extend(unique_new)
+    print_statistics(columns, "📊 Final Dataset Statistics:")
     
     # Show 200 campaign milestone achievement
     print(f"\n🎯 200 CAMPAIGN MILESTONE:")
@@ -181,32 +134,10 @@ def main():
         if count > 0:
             print(f"   {category}: {count} campaigns")
     
-    # Show most awarded organizations
-    org_counts = {}
-    for campaign in unique_new:
-        brand = campaign.get('brand', 'Unknown')
-        org_counts[brand] = org_counts.get(brand, 0) + 1
-    
-    top_orgs = sorted(org_counts.items(), key=lambda x: x[1], reverse=True)[:10]
-    print(f"\n🏢 Most Active Public Health Organizations:")
-    for org, count in top_orgs:
-        print(f"   {org}: {count} campaigns")
-    
-    # Show rhetorical devices in public health
-    ph_devices = []
-    for campaign in unique_new:
-        devices = campaign.get('rhetoricalDevices', [])
-        if isinstance(devices, list):
-            ph_devices.extend(devices)
-    
-    device_counts = {}
-    for device in ph_devices:
-        device_counts[device] = device_counts.get(device, 0) + 1
-    
-    top_devices = sorted(device_counts.items(), key=lambda x: x[1], reverse=True)[:10]
-    print(f"\n🎯 Top Rhetorical Devices in Public Health:")
-    for device, count in top_devices:
-        print(f"   {device}: {count} uses")
+    # Show most awarded organizations and their devices
+    batch = CorpusColumns(unique_new)
+    print_counts(batch.brand_counts(), "🏢 Most Active Public Health Organizations:", "campaigns")
+    print_counts(batch.device_counts(), "🎯 Top Rhetorical Devices in Public Health:", "uses")
     
     return len(all_campaigns)
 
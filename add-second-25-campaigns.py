@@ -4,13 +4,14 @@ Add second batch of 25 campaigns to corpus
 """
 
 import json
+from campaign_resolver import split_new
+from corpus_store import CORPUS_FILE, STORE_DIR, CorpusStore
+from corpus_stats import CorpusColumns, print_counts, print_statistics
 
 def load_existing_corpus():
     """Load current corpus"""
     try:
-        with open('data/retrieval-corpus.json', 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            return data.get('campaigns', [])
+        return CorpusStore().campaigns()
     except FileNotFoundError:
         print("❌ Current corpus not found")
         return []
@@ -25,36 +26,10 @@ def load_new_campaigns():
         print(f"❌ Error loading new campaigns: {e}")
         return []
 
-def create_campaign_key(campaign):
-    """Create unique key for deduplication"""
-    campaign_name = campaign.get('campaign', '').strip().lower()
-    brand = campaign.get('brand', '').strip().lower()
-    year = campaign.get('year', 0)
-    return f"{campaign_name}|{brand}|{year}"
-
 def deduplicate_campaigns(existing, new_campaigns):
     """Remove duplicates between existing and new campaigns"""
-    
-    # Create lookup set for existing campaigns
-    existing_keys = set()
-    for campaign in existing:
-        key = create_campaign_key(campaign)
-        existing_keys.add(key)
-    
-    # Filter new campaigns
-    unique_new = []
-    duplicates = []
-    
-    for campaign in new_campaigns:
-        key = create_campaign_key(campaign)
-        
-        if key in existing_keys:
-            duplicates.append(campaign)
-        else:
-            unique_new.append(campaign)
-            existing_keys.add(key)  # Prevent duplicates within new batch
-    
-    return unique_new, duplicates
+    # Brand aliases, title variants and year tolerance, in one shared resolver
+    return split_new(existing, new_campaigns)
 
 def main():
     print("🔄 Adding second batch of 25 campaigns...")
@@ -83,40 +58,16 @@ def main():
     # Combine campaigns
     all_campaigns = existing_campaigns + unique_new
     
-    # Sort by year and brand for consistency
-    all_campaigns.sort(key=lambda x: (x.get('year', 0), x.get('brand', ''), x.get('campaign', '')))
-    
-    # Create final corpus
-    final_corpus = {"campaigns": all_campaigns}
-    
-    # Save updated corpus
-    with open('data/retrieval-corpus.json', 'w', encoding='utf-8') as f:
-        json.dump(final_corpus, f, indent=2, ensure_ascii=False)
-    
-    # Also save backup
-    with open('corpus-with-second-25.json', 'w', encoding='utf-8') as f:
-        json.dump(final_corpus, f, indent=2, ensure_ascii=False)
-    
-    print(f"\n💾 Updated corpus saved to data/retrieval-corpus.json")
-    print(f"💾 Backup saved to corpus-with-second-25.json")
+    # Only the new batch is written: one store segment, appended to the corpus in place
+    if unique_new:
+        unique_new.sort(key=lambda x: (x.get('year', 0), x.get('brand', ''), x.get('campaign', '')))
+        segment = CorpusStore().append(unique_new, 'add-second-25-campaigns.py')
+        print(f"\n💾 {len(unique_new)} campaigns appended to {CORPUS_FILE}")
+        print(f"💾 Segment {segment['file']} added to {STORE_DIR}")
     
     # Generate comprehensive statistics
-    brands = set(c.get('brand', '') for c in all_campaigns)
-    years = [c.get('year', 0) for c in all_campaigns if isinstance(c.get('year'), int)]
-    
-    all_devices = []
-    for campaign in all_campaigns:
-        devices = campaign.get('rhetoricalDevices', [])
-        if isinstance(devices, list):
-            all_devices.extend(devices)
-    
-    unique_devices = set(all_devices)
-    
-    print(f"\n📊 Updated Dataset Statistics:")
-    print(f"   Total Campaigns: {len(all_campaigns)}")
-    print(f"   Unique Brands: {len(brands)}")
-    print(f"   Year Range: {min(years) if years else 'N/A'} - {max(years) if years else 'N/A'}")
-    print(f"   Rhetorical Devices: {len(unique_devices)}")
+    columns = CorpusColumns(existing_campaigns).extend(unique_new)
+    print_statistics(columns, "📊 Updated Dataset Statistics:")
     
     # Check progress toward 157
     if len(all_campaigns) >= 157:
@@ -133,14 +84,10 @@ def main():
         print(f"   {i+1:2d}. {campaign.get('campaign', 'Unknown')} - {campaign.get('brand', 'Unknown')} ({campaign.get('year', 'N/A')})")
     
     # Show year distribution
-    year_counts = {}
-    for year in years:
-        year_counts[year] = year_counts.get(year, 0) + 1
-    
-    recent_years = sorted([y for y in year_counts.keys() if y >= 2020], reverse=True)
-    print(f"\n📅 Recent Years Distribution:")
-    for year in recent_years[:10]:
-        print(f"   {year}: {year_counts[year]} campaigns")
+    year_counts = columns.year_counts()
+    recent_years = sorted([y for y in year_counts if y >= 2020], reverse=True)
+    print_counts({year: year_counts[year] for year in recent_years},
+                 "📅 Recent Years Distribution:", "campaigns")
     
     return len(all_campaigns)
 
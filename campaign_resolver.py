@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Entity resolution for corpus campaigns
+Decides whether two campaign records describe the same campaign. Brands go
+through an alias table (P&G = Procter & Gamble, VW = Volkswagen, ...) after
+case, accents, punctuation and company suffixes are normalized away;
+titles are normalized the same way and may differ slightly; years may be
+off by YEAR_TOLERANCE, and a sub-brand matches its parent brand.
+Candidates are found by blocking on the brand's first word after any
+leading article and on the year, so each lookup compares against a handful
+of records instead of the whole corpus. One resolver replaces the
+per-script create_campaign_key functions.
+"""
+
+import re
+import sys
+import json
+import unicodedata
+from functools import lru_cache
+from difflib import SequenceMatcher
+
+# Years a repeated campaign may be off by (launch year vs award year)
+YEAR_TOLERANCE = 1
+
+# Minimum similarity for titles that are not equal once normalized
+TITLE_SIMILARITY = 0.9
+
+# Normalized alias -> normalized canonical brand
+BRAND_ALIASES = {
+    'p and g': 'procter and gamble',
+    'pg': 'procter and gamble',
+    'procter and gamble': 'procter and gamble',
+    'vw': 'volkswagen',
+    'mercedes': 'mercedes benz',
+    'coke': 'coca cola',
+    'coca cola company': 'coca cola',
+    'absolut': 'absolut vodka',
+    'north face': 'the north face',
+    'mcdonald s': 'mcdonalds',
+    'ab inbev': 'anheuser busch',
+    'anheuser busch inbev': 'anheuser busch',
+    'got milk': 'california milk processor board',
+    'playstation': 'sony playstation',
+    'ge': 'general electric',
+    'libresse': 'bodyform libresse',
+    'bodyform': 'bodyform libresse',
+}
+
+# Skipped at the start of titles, and of brands when blocking
+LEADING_ARTICLES = ('the', 'a', 'an')
+
+COMPANY_SUFFIXES = {'inc', 'ltd', 'llc', 'co', 'corp', 'corporation', 'company', 'plc', 'gmbh'}
+
+# \'hh escapes left in text by RTF exports decoded as plain text
+RTF_HEX_RE = re.compile(r"\\'([0-9a-fA-F]{2})")
+NON_WORD_RE = re.compile(r'[^0-9a-z]+')
+
+
+def _words(text):
+    """Lowercase ASCII words of text, with accents, quotes and '&' normalized"""
+    text = RTF_HEX_RE.sub(lambda m: bytes.fromhex(m.group(1)).decode('cp1252', 'replace'), str(text or ''))
+    text = unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode('ascii')
+    text = text.lower().replace('&', ' and ').replace("'", '')
+    return NON_WORD_RE.sub(' ', text).split()
+
+
+@lru_cache(maxsize=4096)
+def normalize_brand(brand):
+    words = _words(brand)
+    while words and words[-1] in COMPANY_SUFFIXES:
+        words.pop()
+    name = ' '.join(words)
+    return BRAND_ALIASES.get(name, name)
+
+
+def normalize_title(title):
+    words = _words(title)
+    if words and words[0] in LEADING_ARTICLES and len(words) > 1:
+        words = words[1:]
+    return ' '.join(words)
+
+
+def brands_match(brand, other):
+    """Same brand, or one is a sub-brand of the other (Philips / Philips Hue)"""
+    if brand == other:
+        return True
+    shorter, longer = sorted((brand, other), key=len)
+    return bool(shorter) and longer.startswith(shorter + ' ')
+
+
+def block_key(brand):
+    """Blocking prefix: a brand's first word, which its sub-brands share
+
+    Leading articles are skipped, so 'the north face' and 'the body shop'
+    land in separate blocks instead of one block for every 'the ...' brand.
+    """
+    words = brand.split(' ')
+    while len(words) > 1 and words[0] in LEADING_ARTICLES:
+        words.pop(0)
+    return words[0]
+
+
+def campaign_year(campaign):
+    """Year as an int, or None when missing or not a number"""
+    try:
+        return int(campaign.get('year'))
+    except (TypeError, ValueError):
+        return None
+
+
+def normalized(campaign):
+    """(title, brand, year) as the resolver compares them"""
+    # Some theory entries use name/theory instead of campaign/brand
+    title = campaign.get('campaign') or campaign.get('name')
+    brand = campaign.get('brand') or campaign.get('theory')
+    return normalize_title(title), normalize_brand(str(brand or '')), campaign_year(campaign)
+
+
+class CampaignResolver:
+    """Entities seen so far, indexed for matching new campaign records
+
+    Every record is assigned an entity id (the index of the first record of
+    that entity). Exact title/brand matches are found by dict lookup; fuzzy
+    title matches only among entities in the same brand block within
+    the year tolerance, where sub-brands also match.
+    """
+
+    def __init__(self, campaigns=(), year_tolerance=YEAR_TOLERANCE, similarity=TITLE_SIMILARITY):
+        self.year_tolerance = year_tolerance
+        self.similarity = similarity
+        self.entities = []
+        # (title, brand) -> entity ids
+        self.exact = {}
+        # block_key(brand) -> year (or None) -> entity ids
+        self.blocks = {}
+        for campaign in campaigns:
+            self.add(campaign)
+
+    def _years_match(self, year, other):
+        return year is None or other is None or abs(year - other) <= self.year_tolerance
+
+    def _candidates(self, brand, year):
+        block = self.blocks.get(block_key(brand))
+        if not block:
+            return
+        if year is None:
+            years = list(block)
+        else:
+            years = list(range(year - self.year_tolerance, year + self.year_tolerance + 1)) + [None]
+        for bucket in years:
+            yield from block.get(bucket, ())
+
+    def find(self, title, brand, year):
+        """Entity id matching a normalized record, or None"""
+        if not title:
+            # Nothing to compare: never merge untitled records
+            return None
+        for entity_id in self.exact.get((title, brand), ()):
+            if self._years_match(year, self.entities[entity_id][2]):
+                return entity_id
+
+        for entity_id in self._candidates(brand, year):
+            other_title, other_brand, other_year = self.entities[entity_id]
+            if not brands_match(brand, other_brand) or not self._years_match(year, other_year):
+                continue
+            matcher = SequenceMatcher(None, title, other_title)
+            if (matcher.real_quick_ratio() >= self.similarity and matcher.quick_ratio() >= self.similarity
+                    and matcher.ratio() >= self.similarity):
+                return entity_id
+        return None
+
+    def resolve(self, campaign):
+        """Entity id of an already seen campaign, or None"""
+        return self.find(*normalized(campaign))
+
+    def add_normalized(self, title, brand, year):
+        """Record a new entity and return its id"""
+        entity_id = len(self.entities)
+        self.entities.append((title, brand, year))
+        self.exact.setdefault((title, brand), []).append(entity_id)
+        self.blocks.setdefault(block_key(brand), {}).setdefault(year, []).append(entity_id)
+        return entity_id
+
+    def assign(self, campaign):
+        """Entity id for a campaign, adding a new entity when nothing matches
+
+        Usable as the key function of corpus_merge.merge_campaigns.
+        """
+        record = normalized(campaign)
+        entity_id = self.find(*record)
+        if entity_id is None:
+            entity_id = self.add_normalized(*record)
+        return entity_id
+
+    add = assign
+
+    def __contains__(self, campaign):
+        return self.resolve(campaign) is not None
+
+    def __len__(self):
+        return len(self.entities)
+
+
+def split_new(existing, new_campaigns):
+    """Return (unique new, duplicates) for a batch checked against existing campaigns
+
+    Repeats inside the batch count as duplicates too.
+    """
+    resolver = CampaignResolver(existing)
+    unique_new = []
+    duplicates = []
+    for campaign in new_campaigns:
+        if campaign in resolver:
+            duplicates.append(campaign)
+        else:
+            resolver.add(campaign)
+            unique_new.append(campaign)
+    return unique_new, duplicates
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        print("Usage: campaign_resolver.py CORPUS.json")
+        return 1
+    with open(argv[0], 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    campaigns = data if isinstance(data, list) else data.get('campaigns', [])
+
+    resolver = CampaignResolver()
+    groups = {}
+    for campaign in campaigns:
+        groups.setdefault(resolver.assign(campaign), []).append(campaign)
+    repeated = [group for group in groups.values() if len(group) > 1]
+
+    print(f"📊 {len(campaigns)} campaigns resolve to {len(resolver)} entities")
+    for group in repeated[:20]:
+        names = ' = '.join(f"{c.get('campaign')} ({c.get('brand')}, {c.get('year')})" for c in group)
+        print(f"   {names}")
+    if len(repeated) > 20:
+        print(f"   ... and {len(repeated) - 20} more")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
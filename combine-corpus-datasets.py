@@ -4,6 +4,9 @@ Combine and deduplicate corpus datasets to create the final 157-campaign corpus
 """
 
 import json
+from campaign_resolver import CampaignResolver
+from corpus_merge import merge_campaigns
+from corpus_stats import CorpusColumns, print_counts, print_statistics
 
 def load_corpus(filename):
     """Load corpus from JSON file"""
@@ -18,57 +21,19 @@ def load_corpus(filename):
         print(f"❌ JSON error in {filename}: {e}")
         return []
 
-def create_campaign_key(campaign):
-    """Create a unique key for campaign deduplication"""
-    campaign_name = campaign.get('campaign', '').strip().lower()
-    brand = campaign.get('brand', '').strip().lower()
-    year = campaign.get('year', 0)
-    
-    # Handle brand variations (e.g., "P&G" vs "Procter & Gamble")
-    brand_variations = {
-        'p&g': 'procter & gamble',
-        'procter & gamble': 'p&g',
-    }
-    
-    normalized_brand = brand_variations.get(brand, brand)
-    
-    return f"{campaign_name}|{normalized_brand}|{year}"
-
 def deduplicate_campaigns(campaigns):
     """Remove duplicate campaigns while preserving the most complete version"""
     
-    seen_keys = {}
-    unique_campaigns = []
-    duplicates = []
-    
-    for campaign in campaigns:
-        key = create_campaign_key(campaign)
-        
-        if key in seen_keys:
-            # Found duplicate
-            existing_campaign = seen_keys[key]
-            duplicates.append({
-                'campaign': campaign.get('campaign', ''),
-                'brand': campaign.get('brand', ''),
-                'year': campaign.get('year', ''),
-                'duplicate_of': existing_campaign.get('campaign', '')
-            })
-            
-            # Keep the version with more complete data
-            existing_data_count = sum(1 for v in existing_campaign.values() if v)
-            new_data_count = sum(1 for v in campaign.values() if v)
-            
-            if new_data_count > existing_data_count:
-                # Replace with more complete version
-                seen_keys[key] = campaign
-                # Update in unique_campaigns list
-                for i, uc in enumerate(unique_campaigns):
-                    if create_campaign_key(uc) == key:
-                        unique_campaigns[i] = campaign
-                        break
-        else:
-            seen_keys[key] = campaign
-            unique_campaigns.append(campaign)
+    # One resolver lookup per campaign instead of rescanning the kept list;
+    # brand aliases such as P&G / Procter & Gamble resolve to one entity
+    unique_campaigns, merged = merge_campaigns(campaigns, CampaignResolver().assign)
+    
+    duplicates = [{
+        'campaign': campaign.get('campaign', ''),
+        'brand': campaign.get('brand', ''),
+        'year': campaign.get('year', ''),
+        'duplicate_of': existing_campaign.get('campaign', '')
+    } for campaign, existing_campaign in merged]
     
     return unique_campaigns, duplicates
 
@@ -112,22 +77,8 @@ def main():
     print(f"\n💾 Saved final corpus to final-157-corpus.json")
     
     # Generate comprehensive statistics
-    brands = set(c.get('brand', '') for c in unique_campaigns)
-    years = [c.get('year', 0) for c in unique_campaigns if isinstance(c.get('year'), int)]
-    
-    all_devices = []
-    for campaign in unique_campaigns:
-        devices = campaign.get('rhetoricalDevices', [])
-        if isinstance(devices, list):
-            all_devices.extend(devices)
-    
-    unique_devices = set(all_devices)
-    
-    print(f"\n📊 Final Dataset Statistics:")
-    print(f"   Total Campaigns: {len(unique_campaigns)}")
-    print(f"   Unique Brands: {len(brands)}")
-    print(f"   Year Range: {min(years) if years else 'N/A'} - {max(years) if years else 'N/A'}")
-    print(f"   Rhetorical Devices: {len(unique_devices)}")
+    columns = CorpusColumns(unique_campaigns)
+    print_statistics(columns, "📊 Final Dataset Statistics:")
     
     # Check against target
     if len(unique_campaigns) >= 157:
@@ -139,25 +90,11 @@ def main():
         print(f"   Still need {157 - len(unique_campaigns)} more campaigns")
     
     # Show brand distribution
-    brand_counts = {}
-    for campaign in unique_campaigns:
-        brand = campaign.get('brand', 'Unknown')
-        brand_counts[brand] = brand_counts.get(brand, 0) + 1
-    
-    top_brands = sorted(brand_counts.items(), key=lambda x: x[1], reverse=True)[:15]
-    print(f"\n🏢 Top Brands (Top 15):")
-    for brand, count in top_brands:
-        print(f"   {brand}: {count} campaigns")
+    print_counts(columns.brand_counts(), "🏢 Top Brands (Top 15):", "campaigns", limit=15)
     
     # Show decade distribution
-    decade_counts = {}
-    for year in years:
-        decade = (year // 10) * 10
-        decade_counts[decade] = decade_counts.get(decade, 0) + 1
-    
-    print(f"\n📅 Campaigns by Decade:")
-    for decade in sorted(decade_counts.keys()):
-        print(f"   {decade}s: {decade_counts[decade]} campaigns")
+    print_counts({f"{decade}s": count for decade, count in columns.decade_counts().items()},
+                 "📅 Campaigns by Decade:", "campaigns", limit=None)
     
     return len(unique_campaigns)
 
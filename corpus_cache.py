@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Content-addressed decode cache for corpus sources
+Maps a source's sha256, how it was decoded and the decoder, scanner and
+recovery versions to the campaign list recovered from it, stored gzip-compressed under
+.corpus_cache/. Unchanged assets load from the cache without being decoded
+again; decoded text is only written out when a debug path is requested.
+"""
+
+import os
+import sys
+import gzip
+import json
+import hashlib
+from json_recovery import RECOVERY_VERSION, recover_objects
+from rtf_parallel import PARALLEL_VERSION, decode_array
+from rtf_scan import SCAN_VERSION, mapped
+from rtf_text import DECODER_VERSION, rtf_to_text
+
+CACHE_DIR = os.environ.get('CORPUS_CACHE_DIR', '.corpus_cache')
+CACHE_VERSION = f"rtf{DECODER_VERSION}-scan{SCAN_VERSION}-parallel{PARALLEL_VERSION}-recovery{RECOVERY_VERSION}"
+
+
+def decode_source(raw, path):
+    """Plain text of a source's bytes, decoding RTF and reading anything else as UTF-8"""
+    text = raw.decode('utf-8')
+    if path.lower().endswith('.rtf'):
+        return rtf_to_text(text)
+    return text
+
+
+def decode_mode(path, debug_path=None):
+    """'array' when only an RTF source's campaigns array is decoded, else 'text'
+
+    The two count damage offsets from different places, so they are cached apart.
+    """
+    return 'array' if debug_path is None and path.lower().endswith('.rtf') else 'text'
+
+
+def cache_path(digest, mode, cache_dir=CACHE_DIR):
+    return os.path.join(cache_dir, f"{digest}-{mode}-{CACHE_VERSION}.json.gz")
+
+
+def read_cache(path):
+    try:
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, EOFError, json.JSONDecodeError) as e:
+        print(f"⚠️ Ignoring unreadable cache entry {path}: {e}")
+        return None
+
+
+def write_cache(path, entry):
+    """Write a cache entry atomically so concurrent runs never see half a file"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+        json.dump(entry, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp_path, path)
+
+
+def load_campaigns(path, debug_path=None, cache_dir=CACHE_DIR, use_cache=True, workers=1):
+    """Return (campaigns, damage, cached) for a source file
+
+    Raises ValueError when the source has no campaigns array. With
+    debug_path the decoded text is written there, decoding the source even
+    on a cache hit. Otherwise RTF sources only have their campaigns array
+    decoded, so RTF damage offsets count from the array's '['; with more
+    than one worker large arrays are decoded in parallel segments.
+    """
+    with mapped(path) as data:
+        # sha256 reads the mapped pages directly, without copying the file
+        digest = hashlib.sha256(data).hexdigest()
+        mode = decode_mode(path, debug_path)
+        entry_path = cache_path(digest, mode, cache_dir)
+
+        entry = read_cache(entry_path) if use_cache and debug_path is None else None
+        if entry is not None:
+            if entry.get('error'):
+                raise ValueError(entry['error'])
+            return entry['campaigns'], entry['damage'], True
+
+        try:
+            if debug_path:
+                text = decode_source(bytes(data), path)
+                with open(debug_path, 'w', encoding='utf-8') as f:
+                    f.write(text)
+                campaigns, recovery = recover_objects(text)
+                damage = recovery.damage
+            elif mode == 'array':
+                # Decode only the campaigns array region of the mapped file
+                campaigns, damage, _ = decode_array(path, workers)
+            else:
+                campaigns, recovery = recover_objects(decode_source(bytes(data), path))
+                damage = recovery.damage
+        except ValueError as e:
+            # Remember sources without campaigns too, so they are not decoded again
+            if use_cache:
+                write_cache(entry_path, {"source": path, "sha256": digest, "error": str(e)})
+            raise
+
+    if use_cache:
+        write_cache(entry_path, {
+            "source": path,
+            "sha256": digest,
+            "campaigns": campaigns,
+            "damage": damage
+        })
+    return campaigns, damage, False
+
+
+def debug_requested(argv=None):
+    """True when a script was run with --debug"""
+    argv = sys.argv[1:] if argv is None else argv
+    return '--debug' in argv
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        print("Usage: corpus_cache.py SOURCE [SOURCE ...]")
+        return 1
+    for path in argv:
+        try:
+            campaigns, damage, cached = load_campaigns(path)
+        except ValueError as e:
+            print(f"⏭️  {path}: {e}")
+            continue
+        state = "cached" if cached else "decoded"
+        print(f"📄 {path}: {len(campaigns)} campaigns, {len(damage)} damaged region(s) ({state})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
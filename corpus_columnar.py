@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+Columnar binary corpus artifact
+Writes the published corpus a second time as data/retrieval-corpus.columns:
+one column per field, each a string table (offsets + UTF-8 bytes) or a
+fixed-width array, with rhetoricalDevices dictionary-encoded. A reader maps
+the file, parses only the small JSON header and decodes a value when it is
+asked for, so a consumer that needs headline and rhetoricalDevices never
+touches the rationale text. It only pays off for such projections: whole
+campaigns are still read faster from the JSON. The server reads the same
+layout in server/utils/columnarCorpus.ts.
+
+Layout (little-endian): MAGIC, u32 header length, JSON header, then the
+buffers the header points at, each 4-byte aligned. Every column has a
+state byte per campaign (missing / null / value) so campaigns round-trip
+with the same keys; values that fit no typed column are stored as JSON text.
+"""
+
+import os
+import sys
+import json
+import mmap
+import hashlib
+import struct
+from array import array
+
+MAGIC = b'CFCOLS\x00\x01'
+
+# Bump when the header or buffer layout changes
+COLUMNAR_VERSION = 2
+
+# Per-campaign state byte of every column
+MISSING, NULL, VALUE = 0, 1, 2
+
+U32 = struct.Struct('<I')
+
+
+def columns_path(corpus_file):
+    """data/retrieval-corpus.json -> data/retrieval-corpus.columns"""
+    return os.path.splitext(corpus_file)[0] + '.columns'
+
+
+def source_signature(path):
+    """Size and sha256 of the JSON a derived artifact mirrors, or None"""
+    if not path or not os.path.exists(path):
+        return None
+    with open(path, 'rb') as f:
+        digest = hashlib.sha256(f.read()).hexdigest()
+    return {"file": path, "size": os.path.getsize(path), "sha256": digest}
+
+
+def is_source_stale(source, corpus_file):
+    """True when corpus_file no longer matches a recorded source signature"""
+    if not os.path.exists(corpus_file):
+        return False
+    current = source_signature(corpus_file)
+    source = source or {}
+    return (source.get('size'), source.get('sha256')) != (current['size'], current['sha256'])
+
+
+def field_kind(values):
+    """Column type for the present, non-null values of a field"""
+    if all(isinstance(v, bool) for v in values):
+        return 'bool'
+    if all(isinstance(v, int) and not isinstance(v, bool) and -2**31 <= v < 2**31 for v in values):
+        return 'int'
+    if all(isinstance(v, str) for v in values):
+        return 'string'
+    if all(isinstance(v, list) and all(isinstance(s, str) for s in v) for v in values):
+        return 'strings'
+    return 'json'
+
+
+def _string_table(strings):
+    """(offsets, data) buffers for a list of str"""
+    offsets = array('I', [0])
+    chunks = []
+    total = 0
+    for text in strings:
+        encoded = text.encode('utf-8')
+        chunks.append(encoded)
+        total += len(encoded)
+        offsets.append(total)
+    return offsets, b''.join(chunks)
+
+
+def _le(values):
+    """Bytes of an array in little-endian order"""
+    if sys.byteorder != 'little':
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def encode_field(name, campaigns):
+    """(kind, state, {buffer name: bytes}) for one field over every campaign"""
+    state = bytearray(len(campaigns))
+    present = []
+    for i, campaign in enumerate(campaigns):
+        if name in campaign:
+            value = campaign[name]
+            state[i] = NULL if value is None else VALUE
+            if value is not None:
+                present.append(value)
+    kind = field_kind(present)
+
+    values = iter(present)
+    row_values = [next(values) if s == VALUE else None for s in state]
+    if kind == 'bool':
+        return kind, state, {'values': bytes(1 if v else 0 for v in row_values)}
+    if kind == 'int':
+        return kind, state, {'values': _le(array('i', (v or 0 for v in row_values)))}
+    if kind == 'strings':
+        codes = {}
+        flat = array('I')
+        offsets = array('I', [0])
+        for value in row_values:
+            for text in value or ():
+                flat.append(codes.setdefault(text, len(codes)))
+            offsets.append(len(flat))
+        dict_offsets, dict_data = _string_table(list(codes))
+        return kind, state, {'offsets': _le(offsets), 'codes': _le(flat),
+                             'dictOffsets': _le(dict_offsets), 'dictData': dict_data}
+    if kind == 'json':
+        row_values = [None if v is None else json.dumps(v, ensure_ascii=False) for v in row_values]
+    offsets, data = _string_table(v or '' for v in row_values)
+    return kind, state, {'offsets': _le(offsets), 'data': data}
+
+
+def write_columnar(path, campaigns, source=None):
+    """Write campaigns as a columnar artifact atomically
+
+    source is the JSON corpus the artifact mirrors; its size and sha256 are
+    recorded so readers can tell when the artifact is stale.
+    """
+    names = []
+    seen = set()
+    for campaign in campaigns:
+        for name in campaign:
+            if name not in seen:
+                seen.add(name)
+                names.append(name)
+
+    buffers = []
+    fields = []
+    position = 0
+    for name in names:
+        kind, state, encoded = encode_field(name, campaigns)
+        spec = {"name": name, "kind": kind, "buffers": {}}
+        for buffer_name, data in [('state', bytes(state))] + list(encoded.items()):
+            spec['buffers'][buffer_name] = [position, len(data)]
+            padding = -len(data) % 4
+            buffers.append(data + b'\x00' * padding)
+            position += len(data) + padding
+        fields.append(spec)
+
+    header = {
+        "version": COLUMNAR_VERSION,
+        "count": len(campaigns),
+        "source": source_signature(source),
+        "fields": fields
+    }
+    header_bytes = json.dumps(header, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    header_bytes += b' ' * (-(len(MAGIC) + U32.size + len(header_bytes)) % 4)
+
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(U32.pack(len(header_bytes)))
+        f.write(header_bytes)
+        for data in buffers:
+            f.write(data)
+    os.replace(tmp_path, path)
+    return header
+
+
+class Column:
+    """Lazy, read-only sequence over one field; values are decoded on access"""
+
+    def __init__(self, corpus, spec):
+        self.corpus = corpus
+        self.name = spec['name']
+        self.kind = spec['kind']
+        self._buffers = {name: corpus.body + offset for name, (offset, _) in spec['buffers'].items()}
+        self._dictionary = {}
+
+    def __len__(self):
+        return len(self.corpus)
+
+    def state(self, index):
+        return self.corpus.data[self._buffers['state'] + index]
+
+    def _u32(self, buffer, index):
+        return U32.unpack_from(self.corpus.data, self._buffers[buffer] + 4 * index)[0]
+
+    def _text(self, offsets, data, index):
+        start = self._u32(offsets, index)
+        end = self._u32(offsets, index + 1)
+        begin = self._buffers[data]
+        return self.corpus.data[begin + start:begin + end].decode('utf-8')
+
+    def _device(self, code):
+        text = self._dictionary.get(code)
+        if text is None:
+            text = self._dictionary[code] = self._text('dictOffsets', 'dictData', code)
+        return text
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        if self.state(index) != VALUE:
+            return None
+        if self.kind == 'bool':
+            return bool(self.corpus.data[self._buffers['values'] + index])
+        if self.kind == 'int':
+            return struct.unpack_from('<i', self.corpus.data, self._buffers['values'] + 4 * index)[0]
+        if self.kind == 'strings':
+            start = self._u32('offsets', index)
+            end = self._u32('offsets', index + 1)
+            return [self._device(self._u32('codes', i)) for i in range(start, end)]
+        text = self._text('offsets', 'data', index)
+        return json.loads(text) if self.kind == 'json' else text
+
+
+class ColumnarCorpus:
+    """Memory-mapped columnar artifact; only the header is parsed when opened
+
+    Raises ValueError for files that are not a columnar corpus of this version.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.data[:len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a columnar corpus")
+        header_length = U32.unpack_from(self.data, len(MAGIC))[0]
+        header_start = len(MAGIC) + U32.size
+        self.header = json.loads(self.data[header_start:header_start + header_length])
+        if self.header.get('version') != COLUMNAR_VERSION:
+            self.close()
+            raise ValueError(f"{path} has columnar version {self.header.get('version')}, "
+                             f"expected {COLUMNAR_VERSION}")
+        self.body = header_start + header_length
+        self.fields = [spec['name'] for spec in self.header['fields']]
+        self._specs = {spec['name']: spec for spec in self.header['fields']}
+        self._columns = {}
+
+    def __len__(self):
+        return self.header['count']
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.data.close()
+
+    def is_stale(self, corpus_file):
+        """True when corpus_file no longer matches the JSON the artifact was built from"""
+        return is_source_stale(self.header.get('source'), corpus_file)
+
+    def column(self, name):
+        """Lazy column of one field; KeyError for fields no campaign has"""
+        column = self._columns.get(name)
+        if column is None:
+            column = self._columns[name] = Column(self, self._specs[name])
+        return column
+
+    def campaign(self, index, fields=None):
+        """One campaign as a dict, with only the given fields when fields is set"""
+        campaign = {}
+        for name in fields or self.fields:
+            if name not in self._specs:
+                continue
+            column = self.column(name)
+            if column.state(index) != MISSING:
+                campaign[name] = column[index]
+        return campaign
+
+    def campaigns(self, fields=None):
+        return [self.campaign(i, fields) for i in range(len(self))]
+
+
+def main(argv=None):
+    from corpus_store import CORPUS_FILE
+    argv = sys.argv[1:] if argv is None else argv
+    corpus_file = argv[0] if argv else CORPUS_FILE
+    with open(corpus_file, 'r', encoding='utf-8') as f:
+        campaigns = json.load(f).get('campaigns', [])
+
+    path = columns_path(corpus_file)
+    header = write_columnar(path, campaigns, source=corpus_file)
+    print(f"💾 {header['count']} campaigns written to {path}")
+    print(f"📊 {os.path.getsize(path):,} bytes (JSON: {os.path.getsize(corpus_file):,} bytes)")
+    for spec in header['fields']:
+        size = sum(length for _, length in spec['buffers'].values())
+        print(f"   {spec['name']:<20} {spec['kind']:<8} {size:8,} bytes")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Batch ingestion of every corpus source in attached_assets
+Discovers the RTF exports and pasted .txt campaign batches, decodes them
+through the decode cache on a process pool, recovers the campaign objects
+in each one and writes a single merged stream of campaign records tagged
+with their provenance
+"""
+
+import os
+import sys
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from corpus_cache import load_campaigns
+from figures_io import FORMATS, RecordWriter
+
+ASSETS_DIR = 'attached_assets'
+SOURCE_EXTENSIONS = ('.rtf', '.txt')
+OUTPUT_FILE = 'corpus-ingested.json'
+
+# Worker processes for decoding sources (1 decodes in-process)
+WORKERS = int(os.environ.get('CORPUS_WORKERS', os.cpu_count() or 1))
+
+
+def find_sources(folder=ASSETS_DIR):
+    """Every .rtf/.txt file in folder, skipping macOS resource forks"""
+    sources = []
+    for name in sorted(os.listdir(folder)):
+        path = os.path.join(folder, name)
+        if name.startswith('._') or not os.path.isfile(path):
+            continue
+        if name.lower().endswith(SOURCE_EXTENSIONS):
+            sources.append(path)
+    return sources
+
+
+def normalize_campaign(campaign):
+    """Tidy the fields every source disagrees on, leaving the rest untouched"""
+    normalized = {}
+    for key, value in campaign.items():
+        if isinstance(value, str):
+            value = value.strip()
+        normalized[key] = value
+
+    year = normalized.get('year')
+    if isinstance(year, str) and year.isdigit():
+        normalized['year'] = int(year)
+    devices = normalized.get('rhetoricalDevices')
+    if isinstance(devices, str):
+        normalized['rhetoricalDevices'] = [devices] if devices else []
+    return normalized
+
+
+def ingest_source(path):
+    """Decode one source into (path, campaigns, damage, error)
+
+    Sources without a campaigns array (e.g. encoded figure datasets) come
+    back with no campaigns and an explanatory error.
+    """
+    try:
+        campaigns, damage, _ = load_campaigns(path)
+    except (OSError, UnicodeDecodeError, ValueError) as e:
+        return path, [], [], str(e)
+
+    fmt = os.path.splitext(path)[1].lstrip('.').lower()
+    records = []
+    for index, campaign in enumerate(campaigns):
+        if not isinstance(campaign, dict):
+            continue
+        record = normalize_campaign(campaign)
+        record['provenance'] = {"file": path, "format": fmt, "index": index}
+        records.append(record)
+    return path, records, damage, None
+
+
+def ingest_sources(sources, workers=WORKERS):
+    """Yield ingest_source results in source order, decoding in parallel"""
+    if workers <= 1 or len(sources) <= 1:
+        yield from map(ingest_source, sources)
+        return
+    with ProcessPoolExecutor(max_workers=min(workers, len(sources))) as executor:
+        yield from executor.map(ingest_source, sources)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ingest every corpus source into one merged stream")
+    parser.add_argument('--assets', default=ASSETS_DIR, help="folder to discover sources in")
+    parser.add_argument('sources', nargs='*', help="explicit source files (default: discover)")
+    parser.add_argument('--output', default=OUTPUT_FILE, help="merged output (.json name)")
+    parser.add_argument('--format', choices=FORMATS, default='jsonl', help="output format")
+    parser.add_argument('--workers', type=int, default=WORKERS, help="decoding processes")
+    args = parser.parse_args(argv)
+
+    sources = args.sources or find_sources(args.assets)
+    if not sources:
+        print(f"❌ No .rtf/.txt sources found in {args.assets}")
+        return 1
+    print(f"🔍 Ingesting {len(sources)} sources with {args.workers} worker(s)")
+
+    totals = {"campaigns": 0, "damaged": 0, "skipped": 0}
+    with RecordWriter(args.output, args.format) as writer:
+        for path, records, damage, error in ingest_sources(sources, args.workers):
+            name = os.path.basename(path)
+            if error:
+                totals["skipped"] += 1
+                print(f"⏭️  {name}: {error}")
+                continue
+            for record in records:
+                writer.write(record)
+            totals["campaigns"] += len(records)
+            totals["damaged"] += len(damage)
+            note = f", {len(damage)} damaged region(s)" if damage else ""
+            print(f"📄 {name}: {len(records)} campaigns{note}")
+
+    print(f"💾 {totals['campaigns']} campaigns from {len(sources) - totals['skipped']} sources "
+          f"saved to {', '.join(writer.paths)}")
+    if totals["damaged"]:
+        print(f"🩹 {totals['damaged']} damaged region(s) skipped or repaired")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Linear-time keyed merge for campaign lists
+Keeps a dict from each campaign key to the slot of the record currently
+kept for it, so a more complete duplicate replaces the earlier record in
+place instead of being found again by a scan of the output. One pass, one
+key computation per campaign, and the output keeps first-seen order.
+"""
+
+
+def completeness(campaign):
+    """Number of fields with a value"""
+    return sum(1 for value in campaign.values() if value)
+
+
+def merge_campaigns(campaigns, key, score=completeness):
+    """Return (unique, duplicates) for an iterable of campaigns
+
+    Campaigns with the same key(campaign) collapse into one slot holding the
+    highest scoring record; on a tie the earlier record stays. duplicates
+    lists a (campaign, kept) pair for every later arrival, where kept is the
+    record its slot held when it arrived.
+    """
+    slots = {}
+    unique = []
+    scores = []
+    duplicates = []
+
+    for campaign in campaigns:
+        campaign_key = key(campaign)
+        slot = slots.get(campaign_key)
+        if slot is None:
+            slots[campaign_key] = len(unique)
+            unique.append(campaign)
+            scores.append(score(campaign))
+            continue
+
+        duplicates.append((campaign, unique[slot]))
+        campaign_score = score(campaign)
+        if campaign_score > scores[slot]:
+            unique[slot] = campaign
+            scores[slot] = campaign_score
+
+    return unique, duplicates
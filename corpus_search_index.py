@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Substring search index shipped with the corpus
+Maps every trigram of the rationale tokens to a posting list of campaign
+positions in data/retrieval-corpus.json, and writes them next to it as
+retrieval-corpus.search-index.json. A rationale containing some text has
+every trigram of the text's tokens, so intersecting their postings narrows
+a substring search to a few candidates that are then checked against the
+rationale itself, instead of scanning every rationale per query. The
+server loads the lists in server/utils/corpusSearchIndex.ts, which builds
+the same index when the file is missing or stale, so both sides must
+tokenize alike.
+"""
+
+import os
+import re
+import sys
+import json
+from corpus_columnar import is_source_stale, source_signature
+
+# Bump when the layout or the tokenizer changes
+SEARCH_INDEX_VERSION = 4
+
+# Fields searched by substring
+GRAM_FIELDS = ('rationale',)
+GRAM_LENGTH = 3
+
+# Shorter tokens have no trigram
+MIN_TOKEN_LENGTH = GRAM_LENGTH
+
+TOKEN_RE = re.compile(r'[0-9a-z]+')
+
+
+def search_index_path(corpus_file):
+    """data/retrieval-corpus.json -> data/retrieval-corpus.search-index.json"""
+    return os.path.splitext(corpus_file)[0] + '.search-index.json'
+
+
+def tokenize(text):
+    """Lowercase alphanumeric runs of at least MIN_TOKEN_LENGTH characters"""
+    if not isinstance(text, str):
+        return []
+    return [token for token in TOKEN_RE.findall(text.lower()) if len(token) >= MIN_TOKEN_LENGTH]
+
+
+def trigrams(token):
+    """Distinct trigrams of a token, in order (so the shipped file is reproducible)"""
+    return list(dict.fromkeys(token[i:i + GRAM_LENGTH] for i in range(len(token) - GRAM_LENGTH + 1)))
+
+
+def _post(postings, key, campaign_id):
+    ids = postings.setdefault(key, [])
+    # Ids arrive in order, so each list stays sorted and free of repeats
+    if not ids or ids[-1] != campaign_id:
+        ids.append(campaign_id)
+
+
+def build_search_index(campaigns, source=None):
+    """Posting lists for a list of campaigns, as the plain dict that is shipped"""
+    grams = {field: {} for field in GRAM_FIELDS}
+    for campaign_id, campaign in enumerate(campaigns):
+        for field in GRAM_FIELDS:
+            for token in tokenize(campaign.get(field)):
+                for gram in trigrams(token):
+                    _post(grams[field], gram, campaign_id)
+
+    return {
+        "version": SEARCH_INDEX_VERSION,
+        "count": len(campaigns),
+        "source": source_signature(source),
+        "grams": grams
+    }
+
+
+def write_search_index(path, campaigns, source=None):
+    """Build and write the index atomically"""
+    index = build_search_index(campaigns, source)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp_path, path)
+    return index
+
+
+class CorpusSearchIndex:
+    """Lookups over a loaded index"""
+
+    def __init__(self, data):
+        if data.get('version') != SEARCH_INDEX_VERSION:
+            raise ValueError(f"Search index version {data.get('version')}, expected {SEARCH_INDEX_VERSION}")
+        self.data = data
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def __len__(self):
+        return self.data['count']
+
+    def is_stale(self, corpus_file):
+        """True when corpus_file no longer matches the JSON the index was built from"""
+        return is_source_stale(self.data.get('source'), corpus_file)
+
+    def substring_candidates(self, text, field='rationale'):
+        """Sorted ids of campaigns whose field may contain text, or None when every one may
+
+        A superset of the matches: callers check the candidates against the
+        field itself. None when text has no token to narrow the search by.
+        """
+        postings = self.data['grams'][field]
+        grams = set().union(*map(trigrams, tokenize(text)))
+        if not grams:
+            return None
+        ids = None
+        for gram in grams:
+            matches = set(postings.get(gram, ()))
+            ids = matches if ids is None else ids & matches
+            if not ids:
+                break
+        return sorted(ids)
+
+
+def main(argv=None):
+    from corpus_store import CORPUS_FILE
+    argv = sys.argv[1:] if argv is None else argv
+    corpus_file = argv[0] if argv else CORPUS_FILE
+    with open(corpus_file, 'r', encoding='utf-8') as f:
+        campaigns = json.load(f).get('campaigns', [])
+
+    path = search_index_path(corpus_file)
+    index = write_search_index(path, campaigns, source=corpus_file)
+    print(f"💾 Search index for {index['count']} campaigns written to {path} ({os.path.getsize(path):,} bytes)")
+    for field, postings in index['grams'].items():
+        print(f"   {field:<18} {len(postings):6,} trigrams")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
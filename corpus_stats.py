@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Columnar corpus statistics
+Loads campaigns once into array-backed columns - year, dictionary-encoded
+brand, theory flag and a flattened device list with offsets - and computes
+the merge and quality reports as group-bys over those columns. Each batch
+appended to the columns is grouped over its array slice inside Counter,
+min and max rather than with per-campaign dict lookups, and merged into
+running totals, so ingestion steps extend the columns with each batch
+instead of re-scanning the corpus and a report on a 100k-entry corpus only
+sorts its distinct values.
+"""
+
+import sys
+import json
+from array import array
+from collections import Counter
+from corpus_store import CORPUS_FILE
+
+# Year column value for campaigns without an integer year
+NO_YEAR = 0
+
+# Brand code 0: campaigns without a brand name, reported under this name
+NO_BRAND = 0
+UNKNOWN_BRAND = 'Unknown'
+
+
+class CorpusColumns:
+    """Columns of a corpus, built once and extended batch by batch"""
+
+    def __init__(self, campaigns=()):
+        self.years = array('i')
+        self.brands = array('I')
+        self.theory = array('b')
+        # Device codes of campaign i are devices[device_offsets[i]:device_offsets[i + 1]]
+        self.devices = array('I')
+        self.device_offsets = array('I', [0])
+        self.brand_names = [UNKNOWN_BRAND]
+        self.device_names = []
+        self._brand_codes = {'': NO_BRAND, UNKNOWN_BRAND: NO_BRAND}
+        self._device_codes = {}
+        # Group-by totals over the columns so far, keyed by code
+        self._year_totals = Counter()
+        self._brand_totals = Counter()
+        self._device_totals = Counter()
+        self._theory = 0
+        self._first_year = None
+        self._last_year = None
+        self.extend(campaigns)
+
+    def _encode(self, value, names, codes):
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(names)
+            names.append(value)
+        return code
+
+    def extend(self, campaigns):
+        """Append a batch of campaigns to the columns"""
+        start = len(self.years)
+        device_start = len(self.devices)
+        for campaign in campaigns:
+            year = campaign.get('year')
+            self.years.append(year if isinstance(year, int) and not isinstance(year, bool) else NO_YEAR)
+            brand = campaign.get('brand')
+            self.brands.append(self._encode(brand, self.brand_names, self._brand_codes)
+                               if isinstance(brand, str) else NO_BRAND)
+            self.theory.append(1 if campaign.get('isTheory') else 0)
+            devices = campaign.get('rhetoricalDevices')
+            if isinstance(devices, list):
+                self.devices.extend(self._encode(device, self.device_names, self._device_codes)
+                                    for device in devices if isinstance(device, str))
+            self.device_offsets.append(len(self.devices))
+
+        years = Counter(self.years[start:])
+        years.pop(NO_YEAR, None)
+        if years:
+            first, last = min(years), max(years)
+            self._first_year = first if self._first_year is None else min(self._first_year, first)
+            self._last_year = last if self._last_year is None else max(self._last_year, last)
+        self._theory += sum(self.theory[start:])
+        self._year_totals.update(years)
+        self._brand_totals.update(self.brands[start:])
+        self._device_totals.update(self.devices[device_start:])
+        return self
+
+    def __len__(self):
+        return len(self.years)
+
+    def year_range(self):
+        """(first, last) year, or (None, None) when no campaign has a year"""
+        return self._first_year, self._last_year
+
+    def year_counts(self):
+        """Campaigns per year, oldest first"""
+        return {year: self._year_totals[year] for year in sorted(self._year_totals)}
+
+    def decade_counts(self):
+        """Campaigns per decade, oldest first"""
+        decades = Counter()
+        for year, count in self._year_totals.items():
+            decades[year // 10 * 10] += count
+        return dict(sorted(decades.items()))
+
+    def brand_counts(self, top=None):
+        """Campaigns per brand, most frequent first, those without one under 'Unknown'"""
+        return {self.brand_names[code]: count for code, count in self._brand_totals.most_common(top)}
+
+    def device_counts(self, top=None):
+        """Uses per rhetorical device, most frequent first"""
+        return {self.device_names[code]: count
+                for code, count in self._device_totals.most_common(top)}
+
+    def unique_brands(self):
+        """Distinct brands, counting campaigns without one as a single brand"""
+        return len(self._brand_totals)
+
+    def unique_devices(self):
+        return len(self._device_totals)
+
+    def theory_count(self):
+        return self._theory
+
+    def summary(self, top=10):
+        """Every report at once, as a plain dict"""
+        first, last = self.year_range()
+        return {
+            'total': len(self),
+            'theory': self.theory_count(),
+            'unique_brands': self.unique_brands(),
+            'unique_devices': self.unique_devices(),
+            'year_range': (first, last),
+            'decades': self.decade_counts(),
+            'top_brands': self.brand_counts(top),
+            'top_devices': self.device_counts(top)
+        }
+
+
+def print_statistics(columns, title="📊 Final Dataset Statistics:"):
+    """The totals block the corpus scripts print after every merge"""
+    first, last = columns.year_range()
+    print(f"\n{title}")
+    print(f"   Total Campaigns: {len(columns)}")
+    print(f"   Unique Brands: {columns.unique_brands()}")
+    print(f"   Year Range: {first or 'N/A'} - {last or 'N/A'}")
+    print(f"   Rhetorical Devices: {columns.unique_devices()}")
+
+
+def print_counts(counts, title, unit, limit=10):
+    print(f"\n{title}")
+    for name, count in list(counts.items())[:limit]:
+        print(f"   {name}: {count} {unit}")
+
+
+def load_columns(corpus_file=CORPUS_FILE):
+    with open(corpus_file, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return CorpusColumns(data if isinstance(data, list) else data.get('campaigns', []))
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    columns = load_columns(argv[0] if argv else CORPUS_FILE)
+    print_statistics(columns, "📊 Corpus Statistics:")
+    print(f"   Theory Frameworks: {columns.theory_count()}")
+    print_counts({f"{decade}s": count for decade, count in columns.decade_counts().items()},
+                 "📅 Campaigns by Decade:", "campaigns", limit=None)
+    print_counts(columns.brand_counts(), "🏢 Top Brands by Campaign Count:", "campaigns")
+    print_counts(columns.device_counts(), "🎯 Most Used Rhetorical Devices:", "uses")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,398 @@
+#!/usr/bin/env python3
+"""
+Append-only segmented corpus store
+The corpus lives in data/corpus-store/ as immutable segment files plus a
+manifest listing them in order. Adding a batch writes one new segment and
+a new manifest; the manifest is replaced atomically, so a reader that
+loads it once sees a consistent snapshot even while a writer is running.
+Once there are more than COMPACT_SEGMENTS segments they are compacted into
+one; segments dropped from the manifest are only deleted at the next
+compaction, after any reader still holding the old manifest has finished.
+
+data/retrieval-corpus.json stays the published view the server reads. New
+batches are written over its last few bytes in place, in exactly the
+layout json.dump(indent=2) produces, so an append writes the new entries
+and nothing else; the file is only rewritten in full (atomically) when the
+whole corpus is replaced or published. The tradeoff: a reader opening the
+file during that one small write can see it mid-append, and a crash can
+leave it cut short. The manifest is marked "appending" before the write
+and cleared after it, and the segments already hold the batch, so the
+next sync() rebuilds the file from them when the mark is still there.
+Whether the file escapes non-ASCII characters is detected when it is
+imported and kept on every later write.
+
+The columnar copy and the search indexes next to it (see corpus_columnar
+and corpus_search_index) are derived from the whole corpus, so appends do
+not touch them: they are rebuilt when the corpus is imported, replaced or
+published and at every compaction, which already reads every segment.
+Until then readers see that they were built from another version of the
+JSON and fall back to it.
+"""
+
+import os
+import re
+import sys
+import json
+import fcntl
+import hashlib
+import argparse
+import textwrap
+from contextlib import contextmanager
+from corpus_columnar import columns_path, write_columnar
+from corpus_search_index import search_index_path, write_search_index
+
+CORPUS_FILE = 'data/retrieval-corpus.json'
+STORE_DIR = os.environ.get('CORPUS_STORE_DIR', 'data/corpus-store')
+MANIFEST_FILE = 'manifest.json'
+
+# Bump when the manifest or segment layout changes
+STORE_VERSION = 1
+
+COMPACT_SEGMENTS = int(os.environ.get('CORPUS_COMPACT_SEGMENTS', 16))
+
+# How much of the corpus tail is read to find the end of the campaigns array
+TAIL_BYTES = 4096
+
+
+def file_signature(path):
+    stat = os.stat(path)
+    return {"mtime": stat.st_mtime, "size": stat.st_size}
+
+
+def escapes_non_ascii(data):
+    """Whether JSON bytes were written with ensure_ascii; None when they cannot tell"""
+    if not data.isascii():
+        return False
+    if re.search(rb'\\u(?:00[89a-fA-F]|0[1-9a-fA-F]|[1-9a-fA-F])', data):
+        return True
+    return None
+
+
+def format_entries(campaigns, ensure_ascii=True):
+    """Campaigns laid out as json.dump(indent=2) writes elements of the array"""
+    return ',\n'.join(
+        textwrap.indent(json.dumps(campaign, indent=2, ensure_ascii=ensure_ascii), ' ' * 4)
+        for campaign in campaigns
+    )
+
+
+def append_campaigns(corpus_file, campaigns, ensure_ascii=True):
+    """Append campaigns to the end of the corpus array in place
+
+    Only the tail of the file is read and rewritten. Returns the byte offset
+    the new entries start at. Raises ValueError when the file does not end
+    with the campaigns array.
+    """
+    with open(corpus_file, 'r+b') as f:
+        size = f.seek(0, os.SEEK_END)
+        tail_start = max(0, size - TAIL_BYTES)
+        f.seek(tail_start)
+        tail = f.read()
+
+        close = tail.rfind(b']')
+        if close == -1 or tail[close + 1:].strip() != b'}':
+            raise ValueError(f"{corpus_file} does not end with the campaigns array")
+        last = len(tail[:close].rstrip())
+        empty = tail[:last].endswith(b'[')
+
+        entries = format_entries(campaigns, ensure_ascii).encode('utf-8')
+        if empty:
+            # json.dump writes an empty array as "[]"
+            new_tail = b'\n' + entries + b'\n  ]' + tail[close + 1:]
+        else:
+            new_tail = b',\n' + entries + tail[last:]
+
+        f.seek(tail_start + last)
+        f.write(new_tail)
+        f.truncate()
+    return tail_start + last
+
+
+def write_corpus(corpus_file, campaigns, ensure_ascii=True):
+    """Rewrite the whole published corpus atomically"""
+    tmp_path = corpus_file + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({"campaigns": campaigns}, f, indent=2, ensure_ascii=ensure_ascii)
+    os.replace(tmp_path, corpus_file)
+
+
+class CorpusStore:
+    """Segments and manifest of one corpus, plus the file it is published to"""
+
+    def __init__(self, path=STORE_DIR, corpus_file=CORPUS_FILE):
+        self.path = path
+        self.corpus_file = corpus_file
+        self.manifest_path = os.path.join(path, MANIFEST_FILE)
+
+    def read_manifest(self):
+        """The current manifest, or None before the store is created"""
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            return None
+        if manifest.get('version') != STORE_VERSION:
+            raise ValueError(f"{self.manifest_path} has store version "
+                             f"{manifest.get('version')}, expected {STORE_VERSION}")
+        return manifest
+
+    def _write_manifest(self, manifest):
+        tmp_path = self.manifest_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.manifest_path)
+
+    @contextmanager
+    def _locked(self):
+        """Serialize writers; readers never take the lock"""
+        os.makedirs(self.path, exist_ok=True)
+        with open(os.path.join(self.path, '.lock'), 'w') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _write_segment(self, campaigns, source, generation):
+        """Write an immutable segment, returning its manifest entry"""
+        data = json.dumps({"source": source, "campaigns": campaigns},
+                          ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()
+        name = f"{generation:06d}-{digest[:12]}.json"
+        path = os.path.join(self.path, name)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        return {"file": name, "source": source, "count": len(campaigns), "sha256": digest}
+
+    def read_segment(self, entry):
+        with open(os.path.join(self.path, entry['file']), 'r', encoding='utf-8') as f:
+            return json.load(f)['campaigns']
+
+    def snapshot(self):
+        """Return (generation, campaigns) as of one manifest"""
+        for attempt in range(2):
+            manifest = self.read_manifest()
+            if manifest is None:
+                raise FileNotFoundError(f"No corpus store at {self.path}")
+            try:
+                campaigns = []
+                for entry in manifest['segments']:
+                    campaigns.extend(self.read_segment(entry))
+                return manifest['generation'], campaigns
+            except FileNotFoundError:
+                # Compacted away while we were reading: start over from the new manifest
+                if attempt:
+                    raise
+
+    def campaigns(self):
+        """Campaigns of the current snapshot, importing the published corpus first if needed"""
+        self.sync()
+        return self.snapshot()[1]
+
+    def _replace_segments(self, manifest, entry):
+        """Point the manifest at one segment, retiring the old ones"""
+        for name in manifest.get('retired', []):
+            try:
+                os.remove(os.path.join(self.path, name))
+            except FileNotFoundError:
+                pass
+        manifest['retired'] = [old['file'] for old in manifest['segments']
+                               if old['file'] != entry['file']]
+        manifest['segments'] = [entry]
+
+    def _published(self, manifest):
+        """Record the signature of the published corpus"""
+        manifest['published'] = dict(file_signature(self.corpus_file), file=self.corpus_file)
+
+    def _derive(self, manifest, campaigns):
+        """Rebuild the columnar copy and search indexes from the published campaigns"""
+        write_columnar(columns_path(self.corpus_file), campaigns, source=self.corpus_file)
+        write_search_index(search_index_path(self.corpus_file), campaigns, source=self.corpus_file)
+        manifest['derived'] = manifest['generation']
+
+    def derived_stale(self, manifest):
+        """True when batches were appended since the derived artifacts were built"""
+        return manifest.get('derived') != manifest['generation']
+
+    def _in_sync(self, manifest):
+        published = manifest.get('published') or {}
+        if published.get('file') != self.corpus_file or not os.path.exists(self.corpus_file):
+            return False
+        signature = file_signature(self.corpus_file)
+        return (published.get('mtime'), published.get('size')) == (signature['mtime'], signature['size'])
+
+    def _import(self, manifest):
+        """Make the published corpus the store's only segment"""
+        with open(self.corpus_file, 'rb') as f:
+            data = f.read()
+        campaigns = json.loads(data).get('campaigns', [])
+        if manifest is None:
+            manifest = {"version": STORE_VERSION, "generation": 0, "segments": [], "retired": []}
+        ensure_ascii = escapes_non_ascii(data)
+        if ensure_ascii is not None:
+            manifest['ensure_ascii'] = ensure_ascii
+        manifest['generation'] += 1
+        entry = self._write_segment(campaigns, self.corpus_file, manifest['generation'])
+        self._replace_segments(manifest, entry)
+        self._published(manifest)
+        self._derive(manifest, campaigns)
+        self._write_manifest(manifest)
+        print(f"🗂️  Imported {len(campaigns)} campaigns from {self.corpus_file} into {self.path}")
+        return manifest
+
+    def import_corpus(self):
+        """Re-import the published corpus as the store's only segment"""
+        with self._locked():
+            return self._import(self.read_manifest())
+
+    def _ensure_ascii(self, manifest):
+        return manifest.get('ensure_ascii', True)
+
+    def _recover(self, manifest):
+        """Rebuild the published corpus after an append that did not finish"""
+        print(f"⚠️ An append to {self.corpus_file} did not finish; rebuilding it from {self.path}")
+        write_corpus(self.corpus_file, self._read_all(manifest), self._ensure_ascii(manifest))
+        del manifest['appending']
+        self._published(manifest)
+        self._write_manifest(manifest)
+        return manifest
+
+    def _current(self):
+        """The manifest, once the published corpus is known to match it"""
+        manifest = self.read_manifest()
+        if manifest is not None and manifest.get('appending'):
+            return self._recover(manifest)
+        if manifest is None or not self._in_sync(manifest):
+            return self._import(manifest)
+        return manifest
+
+    def sync(self):
+        """Create the store, or re-import the published corpus if it was changed outside it"""
+        with self._locked():
+            return self._current()
+
+    def append(self, campaigns, source):
+        """Add a batch as a new segment and append it to the published corpus
+
+        Neither the rest of the corpus nor the derived artifacts are read or
+        rewritten. Returns the new segment's manifest entry.
+        """
+        with self._locked():
+            manifest = self._current()
+            manifest['generation'] += 1
+            entry = self._write_segment(campaigns, source, manifest['generation'])
+            manifest['segments'].append(entry)
+            # Lets sync() rebuild the published corpus if the append is cut short
+            manifest['appending'] = True
+            self._write_manifest(manifest)
+
+            ensure_ascii = self._ensure_ascii(manifest)
+            try:
+                append_campaigns(self.corpus_file, campaigns, ensure_ascii)
+            except ValueError as e:
+                print(f"⚠️ {e}; rewriting it instead")
+                write_corpus(self.corpus_file, self._read_all(manifest), ensure_ascii)
+            del manifest['appending']
+            self._published(manifest)
+            self._write_manifest(manifest)
+
+            if len(manifest['segments']) > COMPACT_SEGMENTS:
+                self._compact(manifest)
+        return entry
+
+    def replace(self, campaigns, source):
+        """Replace the whole corpus (edits, removals, re-sorting) with one new segment"""
+        with self._locked():
+            manifest = self.read_manifest()
+            if manifest is None:
+                manifest = {"version": STORE_VERSION, "generation": 0, "segments": [], "retired": []}
+            manifest['generation'] += 1
+            entry = self._write_segment(campaigns, source, manifest['generation'])
+            self._replace_segments(manifest, entry)
+            manifest.pop('appending', None)
+            write_corpus(self.corpus_file, campaigns, self._ensure_ascii(manifest))
+            self._published(manifest)
+            self._derive(manifest, campaigns)
+            self._write_manifest(manifest)
+        return entry
+
+    def _read_all(self, manifest):
+        campaigns = []
+        for entry in manifest['segments']:
+            campaigns.extend(self.read_segment(entry))
+        return campaigns
+
+    def _compact(self, manifest):
+        """Merge every segment into one and rebuild the derived artifacts
+
+        The snapshot and published corpus are unchanged.
+        """
+        count = len(manifest['segments'])
+        campaigns = self._read_all(manifest)
+        manifest['generation'] += 1
+        entry = self._write_segment(campaigns, 'compaction', manifest['generation'])
+        self._replace_segments(manifest, entry)
+        if self._in_sync(manifest):
+            self._derive(manifest, campaigns)
+        self._write_manifest(manifest)
+        print(f"🧹 Compacted {count} segments into {entry['file']}")
+
+    def compact(self):
+        """Compact the segments, or just rebuild stale derived artifacts"""
+        with self._locked():
+            manifest = self.read_manifest()
+            if manifest is None:
+                return
+            if len(manifest['segments']) > 1:
+                self._compact(manifest)
+            elif self.derived_stale(manifest) and self._in_sync(manifest):
+                self._derive(manifest, self._read_all(manifest))
+                self._write_manifest(manifest)
+
+    def publish(self):
+        """Rewrite the published corpus from the current snapshot"""
+        with self._locked():
+            manifest = self.read_manifest()
+            if manifest is None:
+                raise FileNotFoundError(f"No corpus store at {self.path}")
+            campaigns = self._read_all(manifest)
+            manifest.pop('appending', None)
+            write_corpus(self.corpus_file, campaigns, self._ensure_ascii(manifest))
+            self._published(manifest)
+            self._derive(manifest, campaigns)
+            self._write_manifest(manifest)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inspect and maintain the segmented corpus store")
+    parser.add_argument('command', choices=['status', 'compact', 'publish', 'import'])
+    parser.add_argument('--store', default=STORE_DIR, help="store directory")
+    parser.add_argument('--corpus', default=CORPUS_FILE, help="published corpus file")
+    args = parser.parse_args(argv)
+
+    store = CorpusStore(args.store, args.corpus)
+    if args.command == 'import':
+        store.import_corpus()
+    elif args.command == 'compact':
+        store.sync()
+        store.compact()
+    elif args.command == 'publish':
+        store.publish()
+        print(f"💾 Published snapshot to {args.corpus}")
+
+    manifest = store.sync()
+    total = sum(entry['count'] for entry in manifest['segments'])
+    print(f"📊 Generation {manifest['generation']}: {total} campaigns in "
+          f"{len(manifest['segments'])} segment(s)")
+    for entry in manifest['segments']:
+        print(f"   {entry['file']}  {entry['count']:5d}  {entry['source']}")
+    if store.derived_stale(manifest):
+        print("⚠️ Columnar copy and search indexes predate the last append; "
+              "run compact or publish to rebuild them")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,413 @@
+#!/usr/bin/env python3
+"""
+Content-addressed corpus versions
+Each campaign is stored once under data/corpus-versions/blobs/, as
+written (key order kept) in a blob named by the sha256 of its canonical
+JSON, so reordering keys never creates a new blob. A version is a small
+manifest holding the blob ids added and removed since its parent; the full
+ordered id list is only stored when the order cannot be rebuilt from the
+parent (a re-sorted corpus). Committing a version writes only blobs that
+are new, any version can be materialized on demand, and the diff between a
+version and its parent comes straight from the manifest, reading only the
+blobs that changed. The manifest also records the file's top-level shape
+(a bare list or an object holding "campaigns"), so `show --output` writes a
+version back byte for byte as json.dump(indent=2) wrote it.
+
+This replaces the full copy-per-milestone files (retrieval-corpus-final-157.json,
+corpus-with-classics.json, ...); `import-legacy` turns them into versions.
+"""
+
+import os
+import re
+import sys
+import json
+import hashlib
+import argparse
+from collections import Counter
+from datetime import datetime, timezone
+from corpus_store import CORPUS_FILE
+from theory_ingest import campaign_key
+
+VERSIONS_DIR = os.environ.get('CORPUS_VERSIONS_DIR', 'data/corpus-versions')
+
+# Bump when the blob or manifest layout changes
+VERSIONS_VERSION = 2
+
+NAME_RE = re.compile(r'^[A-Za-z0-9._-]+$')
+
+# The milestone copies the corpus scripts used to leave behind, oldest first
+LEGACY_FILES = [
+    ('original-60', 'data/retrieval-corpus-original-60.json'),
+    ('enhanced-68', 'data/retrieval-corpus-enhanced-68.json'),
+    ('restored', 'data/retrieval-corpus-restored.json'),
+    ('final-85', 'data/retrieval-corpus-final-85.json'),
+    ('complete-110', 'data/retrieval-corpus-complete-110.json'),
+    ('with-25-new', 'corpus-with-25-new.json'),
+    ('final-133', 'data/retrieval-corpus-final-133.json'),
+    ('with-second-25', 'corpus-with-second-25.json'),
+    ('final-157', 'data/retrieval-corpus-final-157.json'),
+    ('post-batch4', 'data/retrieval-corpus-post-batch4.json'),
+    ('with-classics', 'corpus-with-classics.json'),
+    ('with-public-health', 'corpus-with-public-health.json'),
+    ('with-theory', 'corpus-with-theory.json'),
+    ('with-theory-batch2', 'corpus-with-theory-batch2.json'),
+]
+
+
+def canonical_bytes(campaign):
+    """Key order and whitespace never change a campaign's blob id"""
+    return json.dumps(campaign, sort_keys=True, ensure_ascii=False,
+                      separators=(',', ':')).encode('utf-8')
+
+
+def blob_bytes(campaign):
+    """What a blob holds: the campaign compacted, in its own key order"""
+    return json.dumps(campaign, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def delta(parent_ids, blob_ids):
+    """Return (added, removed) blob ids between two id lists, counting repeats"""
+    remaining = Counter(parent_ids)
+    added = []
+    for blob_id in blob_ids:
+        if remaining[blob_id]:
+            remaining[blob_id] -= 1
+        else:
+            added.append(blob_id)
+    removed = []
+    for blob_id in reversed(parent_ids):
+        if remaining[blob_id]:
+            remaining[blob_id] -= 1
+            removed.append(blob_id)
+    removed.reverse()
+    return added, removed
+
+
+def apply_delta(parent_ids, added, removed):
+    """The parent's ids without the removed ones (last copies first), then the added ones"""
+    dropping = Counter(removed)
+    kept = []
+    for blob_id in reversed(parent_ids):
+        if dropping[blob_id]:
+            dropping[blob_id] -= 1
+        else:
+            kept.append(blob_id)
+    kept.reverse()
+    return kept + list(added)
+
+
+def read_corpus(path):
+    """Return (campaigns, layout) of a corpus file
+
+    layout records the top level: {"shape": "list"} for a bare list, or
+    {"shape": "object"} for {"campaigns": [...]}, plus "fields" (the object
+    with campaigns set to None) when it has other keys, and "ascii" when
+    the file escapes non-ASCII characters.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        text = f.read()
+    data = json.loads(text)
+    if isinstance(data, list):
+        campaigns, layout = data, {"shape": "list"}
+    else:
+        campaigns, layout = data.get('campaigns', []), {"shape": "object"}
+        if list(data) != ['campaigns']:
+            layout['fields'] = {key: None if key == 'campaigns' else value for key, value in data.items()}
+    if text != format_corpus(data) and text == format_corpus(data, ascii=True):
+        layout['ascii'] = True
+    return campaigns, layout
+
+
+def format_corpus(data, ascii=False):
+    """A corpus document laid out as json.dump(indent=2) writes it"""
+    return json.dumps(data, indent=2, ensure_ascii=ascii)
+
+
+class CorpusVersions:
+    """Blob store and version manifests under one directory"""
+
+    def __init__(self, path=VERSIONS_DIR):
+        self.path = path
+        self.blob_dir = os.path.join(path, 'blobs')
+        self.version_dir = os.path.join(path, 'versions')
+
+    def blob_path(self, blob_id):
+        return os.path.join(self.blob_dir, blob_id[:2], blob_id[2:] + '.json')
+
+    def write_blob(self, campaign):
+        """Store a campaign if it is new
+
+        Returns (blob id, whether the blob holds it in this key order); a
+        blob written earlier keeps the key order it was first seen in.
+        """
+        data = blob_bytes(campaign)
+        blob_id = hashlib.sha256(canonical_bytes(campaign)).hexdigest()
+        path = self.blob_path(blob_id)
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                return blob_id, f.read() == data
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        return blob_id, True
+
+    def read_blob(self, blob_id):
+        with open(self.blob_path(blob_id), 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def manifest_path(self, name):
+        return os.path.join(self.version_dir, name + '.json')
+
+    def versions(self):
+        """Every version manifest, oldest first"""
+        try:
+            names = os.listdir(self.version_dir)
+        except FileNotFoundError:
+            return []
+        manifests = [self.version(name[:-5]) for name in names if name.endswith('.json')]
+        return sorted(manifests, key=lambda manifest: manifest['sequence'])
+
+    def version(self, name):
+        """Manifest of one version
+
+        Raises KeyError for unknown names and ValueError for manifests of
+        another layout version.
+        """
+        try:
+            with open(self.manifest_path(name), 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            raise KeyError(f"No corpus version named {name!r}") from None
+        if manifest.get('version') != VERSIONS_VERSION:
+            raise ValueError(f"{self.manifest_path(name)} has versions layout "
+                             f"{manifest.get('version')}, expected {VERSIONS_VERSION}")
+        return manifest
+
+    def commit(self, name, campaigns, source=None, parent=None, layout=None):
+        """Record campaigns as a new version, by default a child of the latest one
+
+        layout is the top level of the file they came from (see read_corpus);
+        by default the {"campaigns": [...]} object write_corpus writes.
+        Returns the version manifest. Raises ValueError for invalid or taken names.
+        """
+        if not NAME_RE.match(name):
+            raise ValueError(f"Invalid version name {name!r}")
+        if os.path.exists(self.manifest_path(name)):
+            raise ValueError(f"Version {name!r} already exists")
+
+        versions = self.versions()
+        if parent is None and versions:
+            parent = versions[-1]['name']
+        parent_ids = self.blob_ids(parent) if parent else []
+
+        blob_ids = []
+        verbatim = {}
+        for position, campaign in enumerate(campaigns):
+            blob_id, same_order = self.write_blob(campaign)
+            blob_ids.append(blob_id)
+            if not same_order:
+                # Same content as a stored blob with its keys in another order
+                verbatim[str(position)] = campaign
+        added, removed = delta(parent_ids, blob_ids)
+        manifest = {
+            "version": VERSIONS_VERSION,
+            "name": name,
+            "sequence": versions[-1]['sequence'] + 1 if versions else 1,
+            "parent": parent,
+            "source": source,
+            "created": datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            "count": len(blob_ids),
+            "added": added,
+            "removed": removed
+        }
+        manifest.update(layout or {"shape": "object"})
+        if verbatim:
+            manifest['verbatim'] = verbatim
+        if apply_delta(parent_ids, added, removed) != blob_ids:
+            # Reordered (e.g. re-sorted): the delta alone cannot rebuild it
+            manifest['campaigns'] = blob_ids
+
+        os.makedirs(self.version_dir, exist_ok=True)
+        path = self.manifest_path(name)
+        with open(path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=1)
+        os.replace(path + '.tmp', path)
+        return manifest
+
+    def blob_ids(self, name):
+        """Ordered blob ids of a version, rebuilt from its ancestors when not stored"""
+        chain = []
+        manifest = self.version(name)
+        while 'campaigns' not in manifest and manifest['parent']:
+            chain.append(manifest)
+            manifest = self.version(manifest['parent'])
+        blob_ids = manifest.get('campaigns', manifest['added'])
+        for manifest in reversed(chain):
+            blob_ids = apply_delta(blob_ids, manifest['added'], manifest['removed'])
+        return blob_ids
+
+    def materialize(self, name):
+        """The campaigns of a version, in their original order and key order"""
+        verbatim = self.version(name).get('verbatim', {})
+        return [verbatim[str(position)] if str(position) in verbatim else self.read_blob(blob_id)
+                for position, blob_id in enumerate(self.blob_ids(name))]
+
+    def document(self, name):
+        """A version as the file it was committed from: a bare list or an object"""
+        manifest = self.version(name)
+        campaigns = self.materialize(name)
+        if manifest['shape'] == 'list':
+            return campaigns
+        fields = manifest.get('fields') or {"campaigns": None}
+        return {key: campaigns if key == 'campaigns' else value for key, value in fields.items()}
+
+    def text(self, name):
+        """A version serialized as the file it was committed from"""
+        return format_corpus(self.document(name), self.version(name).get('ascii', False))
+
+    def export(self, name, path):
+        """Write a version back to a corpus file atomically"""
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(self.text(name))
+        os.replace(tmp_path, path)
+
+    def diff(self, old, new):
+        """Return {"added", "removed", "changed"} campaigns between two versions
+
+        A campaign removed and added under the same campaign/brand key is
+        reported as changed, as an (old, new) pair. Between a version and its
+        parent the blob ids come from the manifest; only changed blobs are read.
+        """
+        old_manifest = self.version(old)
+        new_manifest = self.version(new)
+        if new_manifest['parent'] == old:
+            added_ids, removed_ids = new_manifest['added'], new_manifest['removed']
+        elif old_manifest['parent'] == new:
+            added_ids, removed_ids = old_manifest['removed'], old_manifest['added']
+        else:
+            added_ids, removed_ids = delta(self.blob_ids(old), self.blob_ids(new))
+
+        removed = {}
+        for blob_id in removed_ids:
+            campaign = self.read_blob(blob_id)
+            removed.setdefault(campaign_key(campaign), []).append(campaign)
+
+        added = []
+        changed = []
+        for blob_id in added_ids:
+            campaign = self.read_blob(blob_id)
+            previous = removed.get(campaign_key(campaign))
+            if previous:
+                changed.append((previous.pop(0), campaign))
+            else:
+                added.append(campaign)
+
+        return {
+            "added": added,
+            "removed": [campaign for campaigns in removed.values() for campaign in campaigns],
+            "changed": changed
+        }
+
+    def disk_usage(self):
+        total = 0
+        for root, _, files in os.walk(self.path):
+            total += sum(os.path.getsize(os.path.join(root, name)) for name in files)
+        return total
+
+
+def import_legacy(versions, remove=False):
+    """Commit the legacy milestone copies as a chain of versions
+
+    With remove, a copy is only deleted once its version writes it back
+    byte for byte.
+    """
+    copied = 0
+    for name, path in LEGACY_FILES:
+        if not os.path.exists(path):
+            print(f"⏭️  {path}: not found")
+            continue
+        try:
+            versions.version(name)
+            print(f"⏭️  {name}: already imported")
+        except KeyError:
+            campaigns, layout = read_corpus(path)
+            manifest = versions.commit(name, campaigns, source=path, layout=layout)
+            print(f"📦 {name}: {manifest['count']} campaigns, "
+                  f"+{len(manifest['added'])} -{len(manifest['removed'])}")
+        copied += os.path.getsize(path)
+        if remove:
+            with open(path, 'r', encoding='utf-8') as f:
+                original = f.read()
+            if versions.text(name) == original:
+                os.remove(path)
+            else:
+                print(f"⚠️ {path}: kept, {name} does not reproduce it exactly")
+    print(f"💾 {copied:,} bytes of copies now take {versions.disk_usage():,} bytes in {versions.path}")
+
+
+def describe(campaign):
+    return f"{campaign.get('campaign', 'Unknown')} ({campaign.get('brand', 'Unknown')}, {campaign.get('year', 'N/A')})"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Content-addressed corpus versions")
+    parser.add_argument('--dir', default=VERSIONS_DIR, help="versions directory")
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('list', help="list versions")
+    commit = commands.add_parser('commit', help="record a corpus file as a new version")
+    commit.add_argument('name')
+    commit.add_argument('--corpus', default=CORPUS_FILE)
+    show = commands.add_parser('show', help="materialize a version")
+    show.add_argument('name')
+    show.add_argument('--output', help="write the corpus here instead of a summary")
+    diff = commands.add_parser('diff', help="campaigns added, removed and changed")
+    diff.add_argument('old')
+    diff.add_argument('new')
+    legacy = commands.add_parser('import-legacy', help="import the milestone copies")
+    legacy.add_argument('--remove', action='store_true',
+                        help="delete each copy once its version reproduces it exactly")
+    args = parser.parse_args(argv)
+
+    versions = CorpusVersions(args.dir)
+    try:
+        if args.command == 'list':
+            for manifest in versions.versions():
+                print(f"{manifest['sequence']:3d}. {manifest['name']:<22} {manifest['count']:5d} campaigns  "
+                      f"+{len(manifest['added'])} -{len(manifest['removed'])}  {manifest['created']}")
+        elif args.command == 'commit':
+            campaigns, layout = read_corpus(args.corpus)
+            manifest = versions.commit(args.name, campaigns, source=args.corpus, layout=layout)
+            print(f"✅ {args.name}: {manifest['count']} campaigns, "
+                  f"+{len(manifest['added'])} -{len(manifest['removed'])} since {manifest['parent']}")
+        elif args.command == 'show':
+            if args.output:
+                versions.export(args.name, args.output)
+                print(f"💾 {versions.version(args.name)['count']} campaigns of {args.name} "
+                      f"saved to {args.output}")
+            else:
+                for campaign in versions.materialize(args.name):
+                    print(f"   {describe(campaign)}")
+        elif args.command == 'diff':
+            changes = versions.diff(args.old, args.new)
+            for campaign in changes['added']:
+                print(f"+ {describe(campaign)}")
+            for campaign in changes['removed']:
+                print(f"- {describe(campaign)}")
+            for old, new in changes['changed']:
+                fields = sorted(k for k in set(old) | set(new) if old.get(k) != new.get(k))
+                print(f"~ {describe(new)}: {', '.join(fields)}")
+            print(f"📊 {len(changes['added'])} added, {len(changes['removed'])} removed, "
+                  f"{len(changes['changed'])} changed")
+        elif args.command == 'import-legacy':
+            import_legacy(versions, args.remove)
+    except (KeyError, ValueError) as e:
+        print(f"❌ {e.args[0]}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,14 +3,15 @@
 Enhance corpus data quality - fix inconsistencies, add metadata, deduplicate
 """
 
-import json
 from collections import defaultdict
+from campaign_resolver import CampaignResolver
+from corpus_merge import merge_campaigns
+from corpus_store import CORPUS_FILE, STORE_DIR, CorpusStore
+from corpus_stats import CorpusColumns
 
 def load_corpus():
     """Load current corpus"""
-    with open('data/retrieval-corpus.json', 'r', encoding='utf-8') as f:
-        data = json.load(f)
-        return data.get('campaigns', [])
+    return CorpusStore().campaigns()
 
 def enhance_campaign_quality(campaign):
     """Enhance individual campaign data quality"""
@@ -82,14 +83,18 @@ def enhance_campaign_quality(campaign):
     
     return enhanced
 
+def detail_score(campaign):
+    """Length of the rationale and outcome, the fields duplicates differ in"""
+    return len(campaign.get('rationale', '')) + len(campaign.get('outcome', ''))
+
 def find_duplicates(campaigns):
     """Find and mark duplicates"""
+    resolver = CampaignResolver()
     seen = {}
     duplicates = []
     
     for i, campaign in enumerate(campaigns):
-        # Create key for comparison
-        key = f"{campaign.get('campaign', '').lower().strip()}-{campaign.get('brand', '').lower().strip()}-{campaign.get('year', '')}"
+        key = resolver.assign(campaign)
         
         if key in seen:
             duplicates.append({
@@ -106,55 +111,17 @@ def find_duplicates(campaigns):
 
 def deduplicate_campaigns(campaigns):
     """Remove duplicates, keeping the most complete version"""
-    duplicates = find_duplicates(campaigns)
-    to_remove = set()
-    
-    for dup in duplicates:
-        original = campaigns[dup['original_index']]
-        duplicate = campaigns[dup['index']]
-        
-        # Keep the one with more complete data
-        original_score = len(original.get('rationale', '')) + len(original.get('outcome', ''))
-        duplicate_score = len(duplicate.get('rationale', '')) + len(duplicate.get('outcome', ''))
-        
-        if duplicate_score > original_score:
-            # Keep duplicate, remove original
-            to_remove.add(dup['original_index'])
-        else:
-            # Keep original, remove duplicate
-            to_remove.add(dup['index'])
-    
-    # Remove duplicates in reverse order to maintain indices
-    for index in sorted(to_remove, reverse=True):
-        campaigns.pop(index)
-    
-    return campaigns, len(to_remove)
+    # Single keyed pass; no list.pop() per removed duplicate
+    unique, duplicates = merge_campaigns(campaigns, CampaignResolver().assign, detail_score)
+    return unique, len(duplicates)
 
 def enhance_corpus_diversity(campaigns):
     """Ensure good distribution across years, brands, and devices"""
-    # Count by decade
-    decade_counts = defaultdict(int)
-    brand_counts = defaultdict(int)
-    device_counts = defaultdict(int)
-    
-    for campaign in campaigns:
-        year = campaign.get('year', 0)
-        if year:
-            decade = (year // 10) * 10
-            decade_counts[decade] += 1
-        
-        brand = campaign.get('brand', '')
-        if brand:
-            brand_counts[brand] += 1
-        
-        devices = campaign.get('rhetoricalDevices', [])
-        for device in devices:
-            device_counts[device] += 1
-    
+    summary = CorpusColumns(campaigns).summary(top=15)
     return {
-        'decades': dict(decade_counts),
-        'top_brands': dict(sorted(brand_counts.items(), key=lambda x: x[1], reverse=True)[:15]),
-        'top_devices': dict(sorted(device_counts.items(), key=lambda x: x[1], reverse=True)[:15])
+        'decades': summary['decades'],
+        'top_brands': summary['top_brands'],
+        'top_devices': summary['top_devices']
     }
 
 def main():
@@ -182,19 +149,12 @@ def main():
     # Sort by year for better organization
     final_campaigns.sort(key=lambda x: (x.get('year', 0), x.get('brand', ''), x.get('campaign', '')))
     
-    # Create enhanced corpus
-    enhanced_corpus = {"campaigns": final_campaigns}
-    
-    # Save enhanced corpus
-    with open('data/retrieval-corpus.json', 'w', encoding='utf-8') as f:
-        json.dump(enhanced_corpus, f, indent=2, ensure_ascii=False)
-    
-    # Save backup
-    with open('corpus-enhanced-quality.json', 'w', encoding='utf-8') as f:
-        json.dump(enhanced_corpus, f, indent=2, ensure_ascii=False)
+    # Every entry may change, so the store gets one new segment replacing the
+    # old ones; they stay on disk until the next compaction
+    segment = CorpusStore().replace(final_campaigns, 'enhance-corpus-quality.py')
     
-    print(f"\n💾 Enhanced corpus saved to data/retrieval-corpus.json")
-    print(f"💾 Backup saved to corpus-enhanced-quality.json")
+    print(f"\n💾 Enhanced corpus saved to {CORPUS_FILE}")
+    print(f"💾 Segment {segment['file']} now holds the whole corpus in {STORE_DIR}")
     
     # Generate quality report
     diversity_stats = enhance_corpus_diversity(final_campaigns)
@@ -3,100 +3,35 @@
 Extract complete 157-campaign corpus from the new RTF file
 """
 
-import re
+import os
 import json
-
-def clean_rtf_to_json(rtf_content):
-    """Convert RTF content to clean JSON"""
-    
-    # Remove RTF header and control sequences
-    content = re.sub(r'^.*?\\strokec2\s*', '', rtf_content, flags=re.DOTALL)
-    
-    # Handle RTF escape sequences
-    content = content.replace('\\"', '"')
-    content = content.replace('\\{', '{')
-    content = content.replace('\\}', '}')
-    content = content.replace('\\[', '[')
-    content = content.replace('\\]', ']')
-    content = content.replace('\\\\', '\\')
-    
-    # Handle RTF smart quotes and characters
-    content = content.replace("\\'92", "'")  # Smart apostrophe
-    content = content.replace("\\'93", '"')  # Smart open quote
-    content = content.replace("\\'94", '"')  # Smart close quote
-    content = content.replace("\\'e9", 'é')  # Accented e
-    content = content.replace("\\'a2", '¢')  # Cent symbol
-    
-    # Remove RTF line continuation backslashes
-    content = re.sub(r'\\\s*\n', '', content)
-    content = re.sub(r'\\\s*$', '', content, flags=re.MULTILINE)
-    
-    # Clean up whitespace
-    content = re.sub(r'\s+', ' ', content)
-    content = content.strip()
-    
-    # Remove any trailing RTF markup
-    content = re.sub(r'\s*\}+\s*$', '', content)
-    
-    return content
+from corpus_cache import debug_requested, load_campaigns
+from json_recovery import print_damage
 
 def extract_campaigns_from_rtf(file_path):
     """Extract all campaigns from the RTF file"""
     
     print(f"📖 Reading {file_path}")
     
-    with open(file_path, 'r', encoding='utf-8') as f:
-        rtf_content = f.read()
-    
-    print(f"📏 RTF file size: {len(rtf_content):,} characters ({len(rtf_content.splitlines()):,} lines)")
-    
-    # Clean RTF formatting
-    cleaned = clean_rtf_to_json(rtf_content)
-    print(f"🧹 Cleaned size: {len(cleaned):,} characters")
-    
-    # The file starts with an array, so wrap it in campaigns object
-    if cleaned.startswith('['):
-        json_text = '{"campaigns": ' + cleaned + '}'
-    else:
-        json_text = cleaned
-    
-    # Save for debugging
-    with open('debug-complete-extraction.json', 'w', encoding='utf-8') as f:
-        f.write(json_text)
+    print(f"📏 RTF file size: {os.path.getsize(file_path):,} bytes")
     
+    # Decoded campaigns come from the cache unless the RTF changed;
+    # the cleaned text is only saved with --debug
+    debug_path = 'debug-complete-extraction.json' if debug_requested() else None
     try:
-        data = json.loads(json_text)
-        campaigns = data.get('campaigns', [])
-        
-        print(f"✅ Successfully parsed {len(campaigns)} campaigns")
-        
-        return campaigns
-        
-    except json.JSONDecodeError as e:
-        print(f"❌ JSON parsing failed: {e}")
-        print(f"💾 Debug data saved to debug-complete-extraction.json")
-        
-        # Try to find and fix common issues
-        if 'Expecting' in str(e) and 'delimiter' in str(e):
-            print("🔧 Attempting to fix JSON structure...")
-            
-            # Look for incomplete entries at the end
-            last_brace = json_text.rfind('}')
-            if last_brace > 0:
-                # Try truncating to last complete entry
-                truncated = json_text[:last_brace+1]
-                if not truncated.endswith(']}'):
-                    truncated += ']}'
-                
-                try:
-                    data = json.loads(truncated)
-                    campaigns = data.get('campaigns', [])
-                    print(f"✅ Fixed! Parsed {len(campaigns)} campaigns")
-                    return campaigns
-                except:
-                    pass
-        
+        campaigns, damage, cached = load_campaigns(file_path, debug_path)
+    except ValueError as e:
+        print(f"❌ {e}")
         return []
+    
+    if cached:
+        print(f"⚡ Loaded from decode cache")
+    if debug_path:
+        print(f"💾 Debug data saved to {debug_path}")
+    print_damage(damage)
+    print(f"✅ Successfully parsed {len(campaigns)} campaigns")
+    
+    return campaigns
 
 def main():
     rtf_file = 'attached_assets/CorpusReplacementFile2_1752617878279.rtf'
@@ -1,61 +1,16 @@
 #!/usr/bin/env python3
-import re
 import json
+from rtf_scan import read_array_text
 
 def extract_json_from_rtf(filename):
     """Extract clean JSON from RTF file"""
-    with open(filename, 'r') as f:
-        content = f.read()
-    
-    # Find the JSON content
-    json_start = content.find('{"campaigns"')
-    if json_start == -1:
-        json_start = content.find('{')
-    
-    json_end = content.rfind('}]')
-    if json_end != -1:
-        json_end = content.find('}', json_end + 2) + 1
-    else:
-        json_end = content.rfind('}') + 1
-    
-    if json_start == -1 or json_end == -1:
+    # Only the campaigns array is decoded, straight from the memory-mapped file
+    try:
+        campaigns_json, _ = read_array_text(filename)
+    except ValueError:
         raise ValueError("Could not find JSON boundaries")
     
-    raw_json = content[json_start:json_end]
-    
-    # Clean RTF formatting step by step
-    clean_json = raw_json
-    
-    # Remove RTF escape sequences
-    clean_json = re.sub(r'\\[a-z]+\d*\s*', '', clean_json)
-    
-    # Fix escaped characters
-    clean_json = clean_json.replace('\\"', '"')
-    clean_json = clean_json.replace('\\\\', '\\')
-    clean_json = clean_json.replace('\\.', '.')
-    clean_json = clean_json.replace('\\,', ',')
-    clean_json = clean_json.replace('\\:', ':')
-    clean_json = clean_json.replace('\\;', ';')
-    clean_json = clean_json.replace('\\-', '-')
-    clean_json = clean_json.replace('\\_', '_')
-    clean_json = clean_json.replace('\\(', '(')
-    clean_json = clean_json.replace('\\)', ')')
-    clean_json = clean_json.replace('\\[', '[')
-    clean_json = clean_json.replace('\\]', ']')
-    clean_json = clean_json.replace('\\{', '{')
-    clean_json = clean_json.replace('\\}', '}')
-    
-    # Handle special characters
-    clean_json = clean_json.replace("\\'93", '"')
-    clean_json = clean_json.replace("\\'94", '"')
-    clean_json = clean_json.replace("\\'92", "'")
-    clean_json = clean_json.replace("\\'91", "'")
-    
-    # Normalize whitespace
-    clean_json = re.sub(r'\s+', ' ', clean_json)
-    clean_json = clean_json.strip()
-    
-    return clean_json
+    return '{"campaigns": ' + campaigns_json.strip() + '}'
 
 if __name__ == "__main__":
     try:
@@ -4,125 +4,32 @@ Comprehensive RTF corpus extraction tool
 Extracts all campaigns from the RTF file to ensure we get all 157 expected entries
 """
 
-import re
+import os
 import json
+from json_recovery import print_damage
+from rtf_parallel import WORKERS, decode_array
+from rtf_scan import find_array, mapped
 
-def extract_campaigns_from_rtf(file_path):
-    """Extract all campaigns from RTF file with robust pattern matching"""
-    
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    print(f"📁 File size: {len(content):,} characters")
-    
-    # Count total campaign entries
-    campaign_patterns = [
-        r'\\"campaign\\"',
-        r'"campaign"',
-        r'campaign.*:',
-    ]
-    
-    for pattern in campaign_patterns:
-        matches = re.findall(pattern, content, re.IGNORECASE)
-        print(f"🔍 Pattern '{pattern}': {len(matches)} matches")
-    
-    # Find the JSON structure in RTF
-    # RTF escapes quotes and backslashes, so we need to handle that
-    
-    # Look for the campaigns array start
-    start_pattern = r'\\"campaigns\\":\s*\['
-    start_match = re.search(start_pattern, content)
-    
-    if not start_match:
-        print("❌ Could not find campaigns array start")
-        return []
-    
-    print(f"✅ Found campaigns array at position {start_match.start()}")
-    
-    # Extract everything from campaigns start to end
-    start_pos = start_match.start()
-    
-    # Find the matching closing bracket
-    bracket_count = 0
-    in_string = False
-    escape_next = False
-    campaigns_content = ""
-    
-    i = start_pos
-    while i < len(content):
-        char = content[i]
-        
-        if escape_next:
-            escape_next = False
-            campaigns_content += char
-            i += 1
-            continue
-            
-        if char == '\\':
-            escape_next = True
-            campaigns_content += char
-            i += 1
-            continue
-            
-        if char == '"' and not escape_next:
-            in_string = not in_string
-            
-        if not in_string:
-            if char == '[':
-                bracket_count += 1
-            elif char == ']':
-                bracket_count -= 1
-                
-        campaigns_content += char
-        
-        if bracket_count == 0 and char == ']':
-            break
-            
-        i += 1
-    
-    print(f"📝 Extracted {len(campaigns_content):,} characters of campaigns data")
-    
-    # Clean up RTF formatting
-    # Remove RTF escaping
-    cleaned = campaigns_content.replace('\\"', '"')
-    cleaned = cleaned.replace('\\\\', '\\')
-    cleaned = cleaned.replace('\\\n', '')
-    cleaned = cleaned.replace('\\', '')
-    
-    # Remove RTF line breaks and formatting
-    cleaned = re.sub(r'\s*\\\s*', '', cleaned)
-    cleaned = re.sub(r'\s+', ' ', cleaned)
-    
-    print(f"🧹 Cleaned to {len(cleaned):,} characters")
-    
-    # Extract just the array content
-    array_match = re.search(r'"campaigns":\s*(\[.*\])', cleaned, re.DOTALL)
-    
-    if not array_match:
-        print("❌ Could not extract campaigns array")
-        return []
-    
-    array_content = array_match.group(1)
-    print(f"📊 Found campaigns array: {len(array_content):,} characters")
-    
-    try:
-        campaigns = json.loads(array_content)
-        print(f"✅ Successfully parsed {len(campaigns)} campaigns")
-        return campaigns
-        
-    except json.JSONDecodeError as e:
-        print(f"❌ JSON parsing error: {e}")
-        
-        # Save the cleaned content for debugging
-        with open('debug-extracted-content.json', 'w') as f:
-            f.write(array_content)
-        print("💾 Saved debug content to debug-extracted-content.json")
-        
-        # Try to extract individual campaign objects
-        campaign_objects = re.findall(r'\{[^}]*"campaign"[^}]*\}', array_content, re.DOTALL)
-        print(f"🔧 Found {len(campaign_objects)} individual campaign objects")
-        
-        return []
+def extract_campaigns_from_rtf(file_path, workers=WORKERS):
+    """Extract all campaigns from RTF file, decoding only the campaigns array"""
+    
+    print(f"📁 File size: {os.path.getsize(file_path):,} bytes")
+    
+    # Search the memory-mapped bytes in place instead of loading the document
+    with mapped(file_path) as data:
+        try:
+            start_pos = find_array(data)
+        except ValueError:
+            print("❌ Could not find campaigns array start")
+            return []
+    
+    print(f"✅ Found campaigns array at byte {start_pos:,}")
+    
+    # Large arrays are decoded as line-aligned segments on a process pool
+    campaigns, damage, _ = decode_array(file_path, workers)
+    print_damage(damage)
+    print(f"✅ Successfully parsed {len(campaigns)} campaigns")
+    return campaigns
 
 def main():
     rtf_file = 'attached_assets/CorpusRelacementFile_1752615052487.rtf'
@@ -4,113 +4,48 @@ RTF to JSON corpus extractor
 Handles RTF escape sequences and extracts the complete JSON structure
 """
 
-import re
 import json
-
-def clean_rtf_content(content):
-    """Clean RTF formatting to extract pure JSON"""
-    
-    # Remove RTF header and formatting commands
-    content = re.sub(r'^.*?\\strokec2 ', '', content, flags=re.DOTALL)
-    
-    # Remove RTF escape sequences
-    content = content.replace('\\"', '"')
-    content = content.replace('\\\\', '\\')
-    content = content.replace('\\\n', '')
-    content = content.replace('\\}', '}')
-    content = content.replace('\\{', '{')
-    content = content.replace('\\[', '[')
-    content = content.replace('\\]', ']')
-    content = content.replace('\\/', '/')
-    content = content.replace("\\'92", "'")  # Smart apostrophe
-    content = content.replace("\\'93", '"')  # Smart quote
-    content = content.replace("\\'94", '"')  # Smart quote
-    content = content.replace("\\'e9", 'é')  # accented e
-    
-    # Remove RTF line continuation backslashes
-    content = re.sub(r'\\\s*\n', '', content)
-    content = re.sub(r'\\\s*$', '', content, flags=re.MULTILINE)
-    
-    # Remove trailing RTF markup
-    content = re.sub(r'\s*\}+\s*$', '', content)
-    
-    # Clean up whitespace
-    content = re.sub(r'\s+', ' ', content)
-    content = content.strip()
-    
-    return content
+from corpus_cache import debug_requested, load_campaigns
+from json_recovery import print_damage
 
 def extract_campaigns(file_path):
     """Extract campaigns from RTF file"""
     
     print(f"📖 Reading RTF file: {file_path}")
     
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    print(f"📏 Original file size: {len(content):,} characters")
-    
-    # Clean RTF formatting
-    cleaned = clean_rtf_content(content)
-    print(f"🧹 Cleaned size: {len(cleaned):,} characters")
+    # Decoded campaigns come from the cache unless the RTF changed;
+    # the cleaned text is only saved with --debug
+    debug_path = 'debug-cleaned-rtf.txt' if debug_requested() else None
+    try:
+        campaigns, damage, cached = load_campaigns(file_path, debug_path)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return []
     
-    # Save cleaned content for debugging
-    with open('debug-cleaned-rtf.txt', 'w', encoding='utf-8') as f:
-        f.write(cleaned)
+    if cached:
+        print(f"⚡ Loaded from decode cache")
+    if debug_path:
+        print(f"💾 Cleaned text saved to {debug_path}")
+    print_damage(damage)
+    print(f"✅ Successfully parsed {len(campaigns)} campaigns")
     
-    try:
-        # Parse the JSON
-        data = json.loads(cleaned)
-        campaigns = data.get('campaigns', [])
+    # Filter out placeholder/example campaigns
+    real_campaigns = []
+    for campaign in campaigns:
+        campaign_name = campaign.get('campaign', '')
+        brand_name = campaign.get('brand', '')
         
-        print(f"✅ Successfully parsed {len(campaigns)} campaigns")
-        
-        # Filter out placeholder/example campaigns
-        real_campaigns = []
-        for campaign in campaigns:
-            campaign_name = campaign.get('campaign', '')
-            brand_name = campaign.get('brand', '')
-            
-            # Skip obvious placeholders
-            if ('Example' in campaign_name or 'Example' in brand_name or 
-                'Fill 157' in campaign_name or 'To Fill' in campaign_name):
-                print(f"⏭️  Skipping placeholder: {campaign_name}")
-                continue
-                
-            real_campaigns.append(campaign)
-        
-        print(f"📊 Real campaigns after filtering: {len(real_campaigns)}")
-        
-        return real_campaigns
-        
-    except json.JSONDecodeError as e:
-        print(f"❌ JSON parsing failed: {e}")
-        
-        # Look for comments that might indicate incomplete data
-        if '// Continuing to add more' in cleaned:
-            print("🔍 Found comment indicating incomplete dataset")
+        # Skip obvious placeholders
+        if ('Example' in campaign_name or 'Example' in brand_name or 
+            'Fill 157' in campaign_name or 'To Fill' in campaign_name):
+            print(f"⏭️  Skipping placeholder: {campaign_name}")
+            continue
             
-        # Try to find the end of actual campaign data
-        comment_start = cleaned.find('// Continuing to add more')
-        if comment_start > 0:
-            print(f"✂️  Truncating at comment position {comment_start}")
-            before_comment = cleaned[:comment_start].rstrip().rstrip(',')
-            
-            # Add proper JSON closing
-            if not before_comment.endswith(']'):
-                before_comment += ']'
-            if not before_comment.endswith('}'):
-                before_comment += '}'
-                
-            try:
-                data = json.loads(before_comment)
-                campaigns = data.get('campaigns', [])
-                print(f"✅ Parsed {len(campaigns)} campaigns from truncated data")
-                return campaigns
-            except json.JSONDecodeError as e2:
-                print(f"❌ Still failed after truncation: {e2}")
-        
-        return []
+        real_campaigns.append(campaign)
+    
+    print(f"📊 Real campaigns after filtering: {len(real_campaigns)}")
+    
+    return real_campaigns
 
 def main():
     rtf_file = 'attached_assets/CorpusRelacementFile_1752615052487.rtf'
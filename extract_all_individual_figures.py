@@ -1,58 +1,19 @@
-import os
-import json
-from bs4 import BeautifulSoup
+from figures_ingest import FOLDER_PATH, WORKERS, find_html_files, is_top_level, iter_pages
+from figures_io import write_json
 
-FOLDER_PATH = './Figures'
-output = []
+def main():
+    all_files = [
+        file_path for file_path in find_html_files(FOLDER_PATH)
+        if not is_top_level(file_path, FOLDER_PATH)
+    ]
 
-def process_html(file_path):
-    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-        soup = BeautifulSoup(f, 'html.parser')
-        title_tag = soup.find('h2')
-        if not title_tag:
-            return None
+    print(f"Found {len(all_files)} individual figure files to process.")
 
-        figure_name = title_tag.get_text(strip=True)
-        paras = soup.find_all('p')
-        if not paras:
-            return None
+    output = [page['figure'] for page in iter_pages(all_files, WORKERS) if page['figure']]
 
-        definition = paras[0].get_text(" ", strip=True)
+    write_json('figures_individual_data.json', output)
 
-        examples = []
-        notes = []
-        for p in paras[1:]:
-            text = p.get_text(" ", strip=True)
-            if text.lower().startswith('example'):
-                examples.append(text)
-            else:
-                notes.append(text)
+    print(f"Extraction complete. {len(output)} figures saved to figures_individual_data.json.")
 
-        return {
-            "figure_name": figure_name,
-            "definition": definition,
-            "examples": examples,
-            "notes": notes,
-            "source_file": file_path,
-            "attribution": "Silva Rhetoricae (rhetoric.byu.edu), Gideon O. Burton, Brigham Young University"
-        }
-
-all_files = []
-for root, dirs, files in os.walk(FOLDER_PATH):
-    if root == FOLDER_PATH:
-        continue
-    for name in files:
-        if name.endswith('.htm') or name.endswith('.html'):
-            all_files.append(os.path.join(root, name))
-
-print(f"Found {len(all_files)} individual figure files to process.")
-
-for file_path in all_files:
-    result = process_html(file_path)
-    if result:
-        output.append(result)
-
-with open('figures_individual_data.json', 'w', encoding='utf-8') as f:
-    json.dump(output, f, ensure_ascii=False, indent=2)
-
-print(f"Extraction complete. {len(output)} figures saved to figures_individual_data.json.")
\ No newline at end of file
+if __name__ == "__main__":
+    main()
@@ -1,32 +1,27 @@
-import os
-import json
-from bs4 import BeautifulSoup
+import argparse
+from figures_ingest import FOLDER_PATH, WORKERS, find_html_files, iter_pages
+from figures_io import FORMATS, RecordWriter
 
-FOLDER_PATH = './Figures'
 OUTPUT_FILE = 'raw_lines.json'
 
-lines = []
+def iter_lines(file_paths, workers=WORKERS):
+    """Yield raw paragraph lines page by page as they are parsed"""
+    for page in iter_pages(file_paths, workers):
+        yield from page['lines']
 
-for root, dirs, files in os.walk(FOLDER_PATH):
-    for name in files:
-        if name.endswith('.htm') or name.endswith('.html'):
-            file_path = os.path.join(root, name)
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                soup = BeautifulSoup(f, 'html.parser')
-                paragraphs = soup.find_all('p')
-                for p in paragraphs:
-                    text = p.get_text("\n", strip=True)
-                    # Split into individual lines
-                    for line in text.split("\n"):
-                        clean_line = line.strip()
-                        if clean_line:
-                            lines.append({
-                                "source_file": file_path,
-                                "text": clean_line
-                            })
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Extract raw paragraph lines from ./Figures")
+    parser.add_argument('--format', choices=FORMATS, default='jsonl', dest='output_format',
+                        help="jsonl streams raw_lines.jsonl, json writes the legacy raw_lines.json, "
+                             "both writes the two (default: jsonl)")
+    args = parser.parse_args(argv)
 
-with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
-    json.dump(lines, f, ensure_ascii=False, indent=2)
+    with RecordWriter(OUTPUT_FILE, args.output_format) as writer:
+        for line in iter_lines(find_html_files(FOLDER_PATH)):
+            writer.write(line)
 
-print(f"✅ Extraction complete! {len(lines)} lines saved to {OUTPUT_FILE}")
-print("Download link will be available in your Replit file manager.")
\ No newline at end of file
+    print(f"✅ Extraction complete! {writer.count} lines saved to {', '.join(writer.paths)}")
+    print("Download link will be available in your Replit file manager.")
+
+if __name__ == "__main__":
+    main()
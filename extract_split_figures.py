@@ -1,96 +1,23 @@
-import os
-import json
-from bs4 import BeautifulSoup
+from figures_ingest import FOLDER_PATH, WORKERS, find_html_files, iter_pages
+from figures_index import FiguresIndex
+from figures_io import write_json
 
-FOLDER_PATH = './Figures'
 OUTPUT_FILE = 'figures_fully_split.json'
 
-output = []
+def main():
+    all_files = find_html_files(FOLDER_PATH)
 
-def extract_entries_from_file(file_path):
-    entries = []
-    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-        soup = BeautifulSoup(f, 'html.parser')
+    print(f"Found {len(all_files)} HTML files to process.")
 
-        headings = soup.find_all(['h3', 'strong'])
-        if headings:
-            for heading in headings:
-                figure_name = heading.get_text(strip=True)
-                if not figure_name or len(figure_name) < 3:
-                    continue
+    # parse_html already filtered split entries, so the index only de-duplicates
+    index = FiguresIndex(min_name_length=0, require_definition=False)
+    for page in iter_pages(all_files, WORKERS):
+        index.update(page['split'])
+    output = index.records()
 
-                definition = ""
-                examples = []
-                notes = []
-                next_elem = heading.find_next_sibling()
-                while next_elem and next_elem.name not in ['h3', 'strong']:
-                    if next_elem.name == 'p':
-                        text = next_elem.get_text(" ", strip=True)
-                        if not definition:
-                            definition = text
-                        elif text.lower().startswith('example'):
-                            examples.append(text)
-                        else:
-                            notes.append(text)
-                    next_elem = next_elem.find_next_sibling()
+    write_json(OUTPUT_FILE, output)
 
-                if not definition:
-                    continue
+    print(f"✅ Extraction complete! {len(output)} figures saved to {OUTPUT_FILE}")
 
-                entries.append({
-                    "figure_name": figure_name,
-                    "definition": definition,
-                    "examples": examples,
-                    "notes": notes,
-                    "source_file": file_path,
-                    "attribution": "Silva Rhetoricae (rhetoric.byu.edu), Gideon O. Burton, Brigham Young University"
-                })
-
-        else:
-            title_tag = soup.find('h2')
-            if title_tag:
-                figure_name = title_tag.get_text(strip=True)
-                paras = soup.find_all('p')
-                if paras:
-                    definition = paras[0].get_text(" ", strip=True)
-                    examples = []
-                    notes = []
-                    for p in paras[1:]:
-                        text = p.get_text(" ", strip=True)
-                        if text.lower().startswith('example'):
-                            examples.append(text)
-                        else:
-                            notes.append(text)
-                    if definition:
-                        entries.append({
-                            "figure_name": figure_name,
-                            "definition": definition,
-                            "examples": examples,
-                            "notes": notes,
-                            "source_file": file_path,
-                            "attribution": "Silva Rhetoricae (rhetoric.byu.edu), Gideon O. Burton, Brigham Young University"
-                        })
-
-    return entries
-
-all_files = []
-for root, dirs, files in os.walk(FOLDER_PATH):
-    for name in files:
-        if name.endswith('.htm') or name.endswith('.html'):
-            all_files.append(os.path.join(root, name))
-
-print(f"Found {len(all_files)} HTML files to process.")
-
-seen = set()
-for file_path in all_files:
-    entries = extract_entries_from_file(file_path)
-    for e in entries:
-        key = e['figure_name'].lower()
-        if key not in seen:
-            seen.add(key)
-            output.append(e)
-
-with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
-    json.dump(output, f, ensure_ascii=False, indent=2)
-
-print(f"✅ Extraction complete! {len(output)} figures saved to {OUTPUT_FILE}")
\ No newline at end of file
+if __name__ == "__main__":
+    main()
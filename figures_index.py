@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Shared de-duplication index for the Figures cleaners and exporters
+Maps each normalized figure name to one canonical record, merging every
+duplicate into it. The index over figures_all_individual_figures.json is
+built once, persisted next to it and only rebuilt when that output
+changes, so the cleaners and CSV exporters are cheap views over it. The
+output is read through figures_io.iter_records, so a newer .jsonl or
+.compact.jsonl sibling is indexed in place of the .json array.
+"""
+
+import os
+import sys
+import csv
+import json
+import hashlib
+from figures_io import records_source
+from figures_records import FigureRecord, expand
+
+NESTED_FILE = 'figures_all_individual_figures.json'
+INDEX_FILE = 'figures_index.json'
+
+# Bump when the key or merge rules change so stale indexes are rebuilt
+INDEX_VERSION = 2
+
+# Filters the cleaners have always applied before de-duplicating
+MIN_NAME_LENGTH = 3
+
+CSV_FIELDS = ["figure_name", "definition", "examples", "notes", "source_file"]
+
+
+def normalize_name(name):
+    """Index key for a figure name"""
+    return name.strip().lower()
+
+
+def merge_unique(target, values):
+    """Append values missing from target, keeping first-seen order"""
+    for value in values:
+        if value not in target:
+            target.append(value)
+
+
+class FiguresIndex:
+    """Normalized figure name -> canonical record
+
+    Merge rules for a duplicate name: the first non-empty definition wins,
+    examples and notes are unioned in first-seen order and every
+    contributing source file is kept in `sources`.
+    """
+
+    def __init__(self, min_name_length=MIN_NAME_LENGTH, require_definition=True):
+        self.min_name_length = min_name_length
+        self.require_definition = require_definition
+        self.entries = {}
+        self.records_in = 0
+        self.duplicates = 0
+
+    def accepts(self, record):
+        if len(record.figure_name.strip()) < self.min_name_length:
+            return False
+        return bool(record.definition.strip()) or not self.require_definition
+
+    def add(self, record):
+        """Index a FigureRecord or legacy dict; return True for a new name"""
+        self.records_in += 1
+        if not isinstance(record, FigureRecord):
+            record = FigureRecord.from_dict(record)
+        if not self.accepts(record):
+            return False
+
+        key = normalize_name(record.figure_name)
+        entry = self.entries.get(key)
+        if entry is None:
+            canonical = FigureRecord(record.figure_name, record.definition, list(record.examples),
+                                     list(record.notes), record.source_file, record.attribution)
+            self.entries[key] = {"record": canonical, "sources": [record.source_file]}
+            return True
+
+        canonical = entry['record']
+        if not canonical.definition.strip():
+            canonical.definition = record.definition
+        merge_unique(canonical.examples, record.examples)
+        merge_unique(canonical.notes, record.notes)
+        merge_unique(entry['sources'], [record.source_file])
+        self.duplicates += 1
+        return False
+
+    def update(self, records):
+        for record in records:
+            self.add(record)
+        return self
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, name):
+        return normalize_name(name) in self.entries
+
+    def get(self, name):
+        entry = self.entries.get(normalize_name(name))
+        return entry['record'] if entry else None
+
+    def records(self):
+        """Canonical records in first-seen order"""
+        return [entry['record'] for entry in self.entries.values()]
+
+    def csv_rows(self):
+        """Canonical records flattened into the CSV export columns"""
+        return [{
+            "figure_name": record.figure_name.strip(),
+            "definition": record.definition.strip(),
+            "examples": "; ".join(record.examples),
+            "notes": "; ".join(record.notes),
+            "source_file": record.source_file
+        } for record in self.records()]
+
+
+def file_signature(path):
+    stat = os.stat(path)
+    return {"mtime": stat.st_mtime, "size": stat.st_size}
+
+
+def sha256_file(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def save_index(index, input_file, stamp, path=INDEX_FILE):
+    """Persist an index atomically together with the input it was built from"""
+    data = dict(stamp, version=INDEX_VERSION, input=input_file,
+                records_in=index.records_in, duplicates=index.duplicates, figures=[
+                    {"key": key, "sources": entry['sources'], "record": expand(entry['record'])}
+                    for key, entry in index.entries.items()
+                ])
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp_path, path)
+
+
+def read_index(path, input_file, source):
+    """Return a persisted index if it is still valid for input_file, else None
+
+    `source` is the copy of input_file that iter_records would read now.
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    if data.get('version') != INDEX_VERSION or data.get('input') != input_file:
+        return None
+    if data.get('source') != source:
+        return None
+
+    # Unchanged mtime and size are trusted; otherwise the content hash decides
+    signature = file_signature(source)
+    if (data['mtime'], data['size']) != (signature['mtime'], signature['size']):
+        if data['sha256'] != sha256_file(source):
+            return None
+
+    index = FiguresIndex()
+    for item in data['figures']:
+        index.entries[item['key']] = {
+            "record": FigureRecord.from_dict(item['record']),
+            "sources": item['sources']
+        }
+    index.records_in = data['records_in']
+    index.duplicates = data['duplicates']
+    return index
+
+
+def build_index(input_file=NESTED_FILE):
+    """Build an index from a figures output, returning (index, stamp)
+
+    Records come from whichever copy figures_io.iter_records reads; the
+    stamp names that file with its mtime, size and sha256.
+    """
+    source, reader = records_source(input_file)
+    stamp = dict(file_signature(source), source=source, sha256=sha256_file(source))
+    return FiguresIndex().update(reader(source)), stamp
+
+
+def load_index(input_file=NESTED_FILE, path=INDEX_FILE, rebuild=False):
+    """Load the persisted index for input_file, rebuilding it when stale"""
+    index = None
+    if not rebuild:
+        source, _ = records_source(input_file)
+        index = read_index(path, input_file, source)
+    if index is None:
+        index, stamp = build_index(input_file)
+        save_index(index, input_file, stamp, path)
+        print(f"🗂️  Indexed {index.records_in} records from {stamp['source']} into {len(index)} figures")
+    return index
+
+
+def write_csv(path, rows):
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    input_file = argv[0] if argv else NESTED_FILE
+    index = load_index(input_file, rebuild=True)
+    print(f"✅ {len(index)} figures ({index.duplicates} duplicates merged) saved to {INDEX_FILE}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,483 @@
+#!/usr/bin/env python3
+"""
+Single-pass Figures ingestion engine
+Parses every Silva Rhetoricae HTML page exactly once and derives all of the
+record shapes the figure extraction scripts write from that one parse
+"""
+
+import os
+import sys
+import glob
+import argparse
+import zipfile
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
+from figures_parsers import PARSER_PREFERENCE, DEFAULT_PARSER, make_soup, resolve_parser
+from figures_index import FiguresIndex
+from figures_io import FORMATS, RecordWriter
+from figures_records import FigureRecord
+from figures_manifest import (MANIFEST_FILE, file_entries, incremental_pages, load_manifest,
+                              save_manifest, source_entries)
+
+FOLDER_PATH = './Figures'
+ZIP_PATHS = ['Figures.zip'] + sorted(glob.glob('attached_assets/Figures_*.zip'))
+HEADING_TAGS = ['h3', 'strong']
+
+# Worker processes for HTML parsing (1 parses in-process) and how many
+# pages each worker receives per task
+WORKERS = int(os.environ.get('FIGURES_WORKERS', os.cpu_count() or 1))
+CHUNK_SIZE = int(os.environ.get('FIGURES_CHUNK_SIZE', 32))
+
+# Output files written by a full rebuild
+FIGURES_DATA_FILE = 'figures_data.json'
+INDIVIDUAL_FILE = 'figures_individual_data.json'
+NESTED_FILE = 'figures_all_individual_figures.json'
+SPLIT_FILE = 'figures_fully_split.json'
+RAW_LINES_FILE = 'raw_lines.json'
+PARSED_FILE = 'figures_parsed.json'
+
+
+def is_html_name(name):
+    return name.endswith('.htm') or name.endswith('.html')
+
+
+def is_apple_double(name):
+    """True for macOS __MACOSX/ and ._* resource-fork entries"""
+    parts = name.split('/')
+    return parts[0] == '__MACOSX' or parts[-1].startswith('._')
+
+
+def walk_order_key(path):
+    """Sort key that orders paths the way find_html_files walks them"""
+    directory, name = os.path.split(os.path.normpath(path))
+    return (tuple(directory.split(os.sep)), name)
+
+
+def find_html_files(folder_path=FOLDER_PATH):
+    """Walk a Figures folder and return every .htm/.html path in a stable order"""
+    all_files = []
+    for root, dirs, files in os.walk(folder_path):
+        dirs.sort()
+        for name in sorted(files):
+            if is_html_name(name):
+                all_files.append(os.path.join(root, name))
+    return all_files
+
+
+def iter_file_sources(file_paths):
+    """Yield (source_file, raw bytes) for pages on disk"""
+    for file_path in file_paths:
+        with open(file_path, 'rb') as f:
+            yield file_path, f.read()
+
+
+def find_zip_members(zip_ref):
+    """Return the HTML member names of an open Figures archive in walk order"""
+    names = [
+        info.filename for info in zip_ref.infolist()
+        if not info.is_dir()
+        and not is_apple_double(info.filename)
+        and is_html_name(info.filename)
+    ]
+    return sorted(names, key=walk_order_key)
+
+
+def iter_zip_sources(zip_paths=None):
+    """Yield (source_file, raw bytes) straight out of Figures archives
+
+    Members are read into memory and never extracted. Source paths are
+    reported as './Figures/...' so records match a walk of an extracted
+    folder. When several archives carry the same member the first wins.
+    """
+    if zip_paths is None:
+        zip_paths = ZIP_PATHS
+    seen = set()
+    for zip_path in zip_paths:
+        if not os.path.exists(zip_path):
+            continue
+        with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+            for name in find_zip_members(zip_ref):
+                if name in seen:
+                    continue
+                seen.add(name)
+                yield './' + name, zip_ref.read(name)
+
+
+def decode_html(raw):
+    """Decode raw page bytes the way open(..., encoding='utf-8') would
+
+    Returns (text, strict) where strict is False when the page only decodes
+    with errors='ignore'.
+    """
+    try:
+        text = raw.decode('utf-8')
+        strict = True
+    except UnicodeDecodeError:
+        text = raw.decode('utf-8', errors='ignore')
+        strict = False
+    # Text-mode reads translate newlines, so do the same here
+    text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text, strict
+
+
+def split_paragraphs(texts, is_example):
+    """Split paragraph texts into definition, examples and notes"""
+    examples = []
+    notes = []
+    for text in texts[1:]:
+        if is_example(text):
+            examples.append(text)
+        else:
+            notes.append(text)
+    return texts[0], examples, notes
+
+
+def make_record(figure_name, definition, examples, notes, source_file):
+    """Build a compact figure record; FigureRecord.to_dict() gives the JSON schema"""
+    return FigureRecord(figure_name, definition, examples, notes, source_file)
+
+
+def is_example(text):
+    return text.lower().startswith('example')
+
+
+def extract_nested(headings, source_file):
+    """Collect one record per <h3>/<strong> heading from its sibling paragraphs"""
+    entries = []
+    for heading in headings:
+        figure_name = heading.get_text(strip=True)
+        definition = ""
+        examples = []
+        notes = []
+        next_elem = heading.find_next_sibling()
+        while next_elem and next_elem.name not in HEADING_TAGS:
+            if next_elem.name == 'p':
+                text = next_elem.get_text(" ", strip=True)
+                if not definition:
+                    definition = text
+                elif is_example(text):
+                    examples.append(text)
+                else:
+                    notes.append(text)
+            next_elem = next_elem.find_next_sibling()
+        entries.append(make_record(figure_name, definition, examples, notes, source_file))
+    return entries
+
+
+def parse_html(content, source_file, strict=True, parser=None):
+    """Parse one HTML page and return every record shape derived from it
+
+    The returned page dict holds:
+      figure_data - process_figures.py record (None without <p> or strict utf-8)
+      figure      - single <h2> record (None without <h2> or <p>)
+      nested      - <h3>/<strong> records, falling back to [figure]
+      split       - nested records that survive extract_split_figures.py filters
+      lines       - raw paragraph lines for the heading segmenter
+
+    `parser` names a figures_parsers backend (default: html.parser).
+    """
+    source_file = sys.intern(source_file)
+    soup = make_soup(content, parser)
+    title_tag = soup.find('h2')
+    paras = soup.find_all('p')
+
+    figure_data = None
+    figure = None
+    lines = []
+
+    if paras:
+        spaced = [p.get_text(" ", strip=True) for p in paras]
+
+        if strict:
+            stripped = [p.get_text().strip() for p in paras]
+            definition, examples, notes = split_paragraphs(
+                stripped, lambda text: text.startswith("Example"))
+            figure_data = make_record(
+                title_tag.get_text().strip() if title_tag else "",
+                definition, examples, notes, os.path.normpath(source_file))
+
+        if title_tag:
+            definition, examples, notes = split_paragraphs(spaced, is_example)
+            figure = make_record(title_tag.get_text(strip=True),
+                                 definition, examples, notes, source_file)
+
+        for p in paras:
+            for line in p.get_text("\n", strip=True).split("\n"):
+                clean_line = line.strip()
+                if clean_line:
+                    lines.append({
+                        "source_file": source_file,
+                        "text": clean_line
+                    })
+
+    headings = soup.find_all(HEADING_TAGS)
+    if headings:
+        nested = extract_nested(headings, source_file)
+        split = [e for e in nested if len(e.figure_name) >= 3 and e.definition]
+    else:
+        nested = [figure] if figure else []
+        split = [e for e in nested if e.definition]
+
+    return {
+        "source_file": source_file,
+        "figure_data": figure_data,
+        "figure": figure,
+        "nested": nested,
+        "split": split,
+        "lines": lines
+    }
+
+
+def parse_source(source_file, raw, parser=None):
+    """Parse one page from its raw bytes"""
+    content, strict = decode_html(raw)
+    return parse_html(content, source_file, strict, parser)
+
+
+def parse_file(file_path, parser=None):
+    """Parse a single HTML file from disk"""
+    with open(file_path, 'rb') as f:
+        return parse_source(file_path, f.read(), parser)
+
+
+def parse_source_job(source, parser=None):
+    """Process-pool task: parse one source, returning (source_file, page, error)"""
+    source_file, raw = source
+    try:
+        return source_file, parse_source(source_file, raw, parser), None
+    except Exception as e:
+        return source_file, None, str(e)
+
+
+def report_errors(results):
+    """Yield parsed pages, printing a warning for each page that failed"""
+    for source_file, page, error in results:
+        if error is not None:
+            print(f"⚠️ Error processing {source_file}: {error}")
+        else:
+            yield page
+
+
+def parse_sources(sources, workers=1, chunksize=CHUNK_SIZE, parser=None):
+    """Parse each (source_file, raw) pair exactly once, in input order
+
+    With workers > 1 pages are parsed on a process pool. Sources are handed
+    out in chunks of `chunksize` to keep per-page IPC overhead low, and
+    results come back in submission order so the output stays diff-stable.
+    """
+    job = partial(parse_source_job, parser=resolve_parser(parser))
+
+    if workers <= 1:
+        yield from report_errors(map(job, sources))
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from report_errors(executor.map(job, sources, chunksize=chunksize))
+
+
+def iter_pages(file_paths, workers=WORKERS, parser=None):
+    """Parse each file on disk exactly once, yielding page dicts in input order"""
+    return parse_sources(iter_file_sources(file_paths), workers, parser=parser)
+
+
+def is_top_level(source_file, folder_path=FOLDER_PATH):
+    """True for overview pages sitting directly in the Figures folder"""
+    return os.path.normpath(os.path.dirname(source_file)) == os.path.normpath(folder_path)
+
+
+class LineSegmenter:
+    """Group raw paragraph lines into figures as they stream past
+
+    A line of 1-3 words starts a new figure and the lines after it form its
+    definition. feed() returns a finished figure when the next heading
+    arrives; finish() flushes the last one.
+    """
+
+    def __init__(self):
+        self.current_figure = None
+        self.current_definition_lines = []
+        self.current_source = None
+
+    def _flush(self):
+        if self.current_figure and self.current_definition_lines:
+            return {
+                "figure_name": self.current_figure,
+                "definition": " ".join(self.current_definition_lines).strip(),
+                "source_file": self.current_source
+            }
+        return None
+
+    def feed(self, entry):
+        text = entry['text'].strip()
+        if text and len(text.split()) <= 3:
+            figure = self._flush()
+            self.current_figure = text
+            self.current_definition_lines = []
+            self.current_source = entry['source_file']
+            return figure
+        if text:
+            self.current_definition_lines.append(text)
+        return None
+
+    def finish(self):
+        figure = self._flush()
+        self.current_figure = None
+        self.current_definition_lines = []
+        return figure
+
+
+def segment_figures(lines):
+    """Yield figures from a stream of raw line records"""
+    segmenter = LineSegmenter()
+    for entry in lines:
+        figure = segmenter.feed(entry)
+        if figure:
+            yield figure
+    figure = segmenter.finish()
+    if figure:
+        yield figure
+
+
+class OutputRouter:
+    """Route parsed pages to the figures output files
+
+    Raw lines feed the heading segmenter directly; they are only emitted as
+    raw_lines records themselves when dump_lines is set.
+    """
+
+    def __init__(self, folder_path=FOLDER_PATH, dump_lines=False):
+        self.folder_path = folder_path
+        self.dump_lines = dump_lines
+        self.split_index = FiguresIndex(min_name_length=0, require_definition=False)
+        self.segmenter = LineSegmenter()
+
+    @property
+    def output_files(self):
+        files = [FIGURES_DATA_FILE, INDIVIDUAL_FILE, NESTED_FILE, SPLIT_FILE, PARSED_FILE]
+        if self.dump_lines:
+            files.append(RAW_LINES_FILE)
+        return files
+
+    def route(self, page):
+        """Yield (output_file, record) for every record a page contributes"""
+        if page['figure_data']:
+            yield FIGURES_DATA_FILE, page['figure_data']
+        if page['figure'] and not is_top_level(page['source_file'], self.folder_path):
+            yield INDIVIDUAL_FILE, page['figure']
+        for entry in page['nested']:
+            yield NESTED_FILE, entry
+        self.split_index.update(page['split'])
+        for line in page['lines']:
+            if self.dump_lines:
+                yield RAW_LINES_FILE, line
+            figure = self.segmenter.feed(line)
+            if figure:
+                yield PARSED_FILE, figure
+
+    def finish(self):
+        """Yield records still buffered once every page has been routed"""
+        # Split figures are merged across pages, so they are only final here
+        for entry in self.split_index.records():
+            yield SPLIT_FILE, entry
+        figure = self.segmenter.finish()
+        if figure:
+            yield PARSED_FILE, figure
+
+
+def collect_outputs(pages, folder_path=FOLDER_PATH, dump_lines=False):
+    """Fan parsed pages out into every figures output file"""
+    router = OutputRouter(folder_path, dump_lines)
+    outputs = {path: [] for path in router.output_files}
+    for page in pages:
+        for path, record in router.route(page):
+            outputs[path].append(record)
+    for path, record in router.finish():
+        outputs[path].append(record)
+    return outputs
+
+
+def stream_outputs(pages, folder_path=FOLDER_PATH, output_format='json', dump_lines=False):
+    """Write every record to its output file as soon as its page is parsed
+
+    Returns the closed RecordWriters keyed by output file.
+    """
+    router = OutputRouter(folder_path, dump_lines)
+    writers = {path: RecordWriter(path, output_format) for path in router.output_files}
+    try:
+        for page in pages:
+            for path, record in router.route(page):
+                writers[path].write(record)
+        for path, record in router.finish():
+            writers[path].write(record)
+    finally:
+        for writer in writers.values():
+            writer.close()
+    return writers
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rebuild every figures output in one pass")
+    parser.add_argument('--zip', nargs='*', metavar='ZIP', dest='zip_paths',
+                        help="read pages straight from Figures archives instead of ./Figures "
+                             "(defaults to Figures.zip and attached_assets/Figures_*.zip)")
+    parser.add_argument('--workers', type=int, default=WORKERS,
+                        help=f"parser processes, 1 to parse in-process (default: {WORKERS})")
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE,
+                        help=f"pages handed to a worker per task (default: {CHUNK_SIZE})")
+    parser.add_argument('--parser', choices=PARSER_PREFERENCE + ['auto'], default=DEFAULT_PARSER,
+                        help="HTML parser backend; falls back to html.parser when the "
+                             f"requested one is not installed (default: {DEFAULT_PARSER})")
+    parser.add_argument('--format', choices=FORMATS, default='json', dest='output_format',
+                        help="json writes the legacy arrays, jsonl streams JSON-lines files, "
+                             "both writes the two, compact writes interned .compact.jsonl "
+                             "files (default: json)")
+    parser.add_argument('--dump-lines', action='store_true',
+                        help="also write the intermediate raw_lines output for debugging")
+    parser.add_argument('--incremental', action='store_true',
+                        help="only re-parse pages whose content changed since the last run")
+    parser.add_argument('--manifest', default=MANIFEST_FILE,
+                        help=f"manifest used by --incremental (default: {MANIFEST_FILE})")
+    args = parser.parse_args(argv)
+
+    html_parser = resolve_parser(args.parser)
+
+    def parse(sources):
+        return parse_sources(sources, args.workers, args.chunk_size, html_parser)
+
+    if args.zip_paths is not None:
+        zip_paths = args.zip_paths or ZIP_PATHS
+        print(f"📦 Streaming pages from {', '.join(zip_paths)}")
+        sources = iter_zip_sources(zip_paths)
+        entries = source_entries(sources) if args.incremental else None
+    else:
+        all_files = find_html_files(FOLDER_PATH)
+        if not all_files:
+            print(f"❌ No HTML files found in {FOLDER_PATH}")
+            return False
+        print(f"🔍 Found {len(all_files)} HTML files to process (one parse each)")
+        sources = iter_file_sources(all_files)
+        entries = file_entries(all_files) if args.incremental else None
+
+    print(f"🧩 Parsing with {html_parser}")
+    if args.incremental:
+        manifest = load_manifest(args.manifest, html_parser)
+        pages, manifest, stats = incremental_pages(entries, manifest, parse)
+        print(f"♻️  Reused {stats['reused']} pages, parsed {stats['parsed']}, "
+              f"dropped {stats['removed']} removed pages")
+    else:
+        pages = parse(sources)
+    writers = stream_outputs(pages, FOLDER_PATH, args.output_format, args.dump_lines)
+
+    for writer in writers.values():
+        print(f"💾 {writer.count} records saved to {', '.join(writer.paths)}")
+
+    if args.incremental:
+        save_manifest(manifest, args.manifest)
+        print(f"💾 Manifest saved to {args.manifest}")
+
+    print("✅ Figures rebuild complete")
+    return True
+
+
+if __name__ == "__main__":
+    main()
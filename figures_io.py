@@ -0,0 +1,140 @@
+"""
+Record I/O for the Figures pipeline
+JSON-lines writers/readers that stream one record at a time, plus a
+streaming writer for the legacy pretty-printed .json array files
+"""
+
+import os
+import json
+from figures_records import CompactWriter, expand, iter_compact
+
+FORMATS = ['json', 'jsonl', 'both', 'compact']
+
+
+def jsonl_path(path):
+    """Map an output .json path onto its .jsonl sibling"""
+    return os.path.splitext(path)[0] + '.jsonl'
+
+
+def compact_path(path):
+    """Map an output .json path onto its interned .compact.jsonl sibling"""
+    return os.path.splitext(path)[0] + '.compact.jsonl'
+
+
+def write_json(path, records):
+    """Write records as a legacy indent=2 array, expanding compact records"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump([expand(record) for record in records], f, ensure_ascii=False, indent=2)
+
+
+def iter_jsonl(path):
+    """Yield records from a JSON-lines file one line at a time"""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def iter_json(path):
+    """Yield the records of a .json array file"""
+    with open(path, 'r', encoding='utf-8') as f:
+        yield from json.load(f)
+
+
+def records_source(path):
+    """Return (file, reader) for the copy of an output iter_records() reads
+
+    That is whichever of path's .jsonl sibling, its .compact.jsonl sibling
+    and the .json array itself was written last, in that order of
+    preference on a tie. A sibling left behind by an earlier run is older
+    than path, so it is never read in its place.
+    """
+    readers = [(jsonl_path(path), iter_jsonl), (compact_path(path), iter_compact), (path, iter_json)]
+    written = [(os.stat(name).st_mtime_ns, -rank, name, reader)
+               for rank, (name, reader) in enumerate(readers) if os.path.exists(name)]
+    if not written:
+        raise FileNotFoundError(path)
+    _, _, name, reader = max(written)
+    return name, reader
+
+
+def iter_records(path):
+    """Yield legacy dict records for an output from its latest written copy
+
+    Compact records are expanded record by record; see records_source().
+    """
+    name, reader = records_source(path)
+    yield from reader(name)
+
+
+class JsonArrayWriter:
+    """Write a list record by record, byte-identical to json.dump(..., indent=2)"""
+
+    def __init__(self, path):
+        self.f = open(path, 'w', encoding='utf-8')
+        self.count = 0
+
+    def write(self, record):
+        text = json.dumps(expand(record), ensure_ascii=False, indent=2).replace('\n', '\n  ')
+        self.f.write(('[\n  ' if self.count == 0 else ',\n  ') + text)
+        self.count += 1
+
+    def close(self):
+        self.f.write('\n]' if self.count else '[]')
+        self.f.close()
+
+
+class JsonlWriter:
+    """Write one compact JSON record per line"""
+
+    def __init__(self, path):
+        self.f = open(path, 'w', encoding='utf-8')
+        self.count = 0
+
+    def write(self, record):
+        self.f.write(json.dumps(expand(record), ensure_ascii=False, separators=(',', ':')))
+        self.f.write('\n')
+        self.count += 1
+
+    def close(self):
+        self.f.close()
+
+
+class RecordWriter:
+    """Stream records to an output in the requested format(s)
+
+    `path` is the legacy .json name; 'jsonl' writes its .jsonl sibling
+    instead, 'both' writes the two side by side and 'compact' writes an
+    interned .compact.jsonl file.
+    """
+
+    def __init__(self, path, output_format='json'):
+        self.paths = []
+        self.writers = []
+        if output_format in ('jsonl', 'both'):
+            self.paths.append(jsonl_path(path))
+            self.writers.append(JsonlWriter(jsonl_path(path)))
+        if output_format in ('json', 'both'):
+            self.paths.append(path)
+            self.writers.append(JsonArrayWriter(path))
+        if output_format == 'compact':
+            self.paths.append(compact_path(path))
+            self.writers.append(CompactWriter(compact_path(path)))
+        self.count = 0
+
+    def write(self, record):
+        for writer in self.writers:
+            writer.write(record)
+        self.count += 1
+
+    def close(self):
+        # The .json array closes first, so iter_records() prefers the
+        # sibling written alongside it
+        for writer in reversed(self.writers):
+            writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,127 @@
+"""
+Incremental rebuild manifest for the Figures pipeline
+Maps each page to its sha256, mtime and size plus the records extracted
+from it, so a rebuild only re-parses pages whose content changed
+"""
+
+import os
+import json
+import hashlib
+from figures_records import StringTable, pack_page, unpack_page
+
+MANIFEST_FILE = 'figures_manifest.json'
+
+# Bump when parse_html output changes so stale records are not reused
+MANIFEST_VERSION = 2
+
+
+def empty_manifest(parser):
+    return {"version": MANIFEST_VERSION, "parser": parser, "pages": {}}
+
+
+def load_manifest(path=MANIFEST_FILE, parser=None):
+    """Load a manifest, discarding it if it was built by another version or parser"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return empty_manifest(parser)
+    except json.JSONDecodeError as e:
+        print(f"⚠️ Ignoring unreadable manifest {path}: {e}")
+        return empty_manifest(parser)
+
+    if manifest.get('version') != MANIFEST_VERSION or manifest.get('parser') != parser:
+        print(f"🔄 Manifest {path} was built differently, starting from scratch")
+        return empty_manifest(parser)
+
+    # Records are stored packed against one shared source table
+    sources = manifest.pop('sources')
+    for entry in manifest['pages'].values():
+        entry['page'] = unpack_page(entry['page'], sources)
+    return manifest
+
+
+def save_manifest(manifest, path=MANIFEST_FILE):
+    """Write the manifest atomically so an interrupted run keeps the old one"""
+    sources = StringTable()
+    pages = {
+        source_file: dict(entry, page=pack_page(entry['page'], sources))
+        for source_file, entry in manifest['pages'].items()
+    }
+    packed = dict(manifest, pages=pages, sources=sources.values)
+
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(packed, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp_path, path)
+
+
+def read_bytes(file_path):
+    with open(file_path, 'rb') as f:
+        return f.read()
+
+
+def file_entries(file_paths):
+    """Yield (source_file, mtime, size, read) for pages on disk"""
+    for file_path in file_paths:
+        stat = os.stat(file_path)
+        yield file_path, stat.st_mtime, stat.st_size, lambda file_path=file_path: read_bytes(file_path)
+
+
+def source_entries(sources):
+    """Yield (source_file, mtime, size, read) for in-memory (source_file, raw) pairs
+
+    There is no mtime to trust here, so every page is matched by hash.
+    """
+    for source_file, raw in sources:
+        yield source_file, None, len(raw), lambda raw=raw: raw
+
+
+def incremental_pages(entries, manifest, parse):
+    """Reuse cached pages and parse only new or changed ones
+
+    `parse` takes a list of (source_file, raw) pairs and yields page dicts.
+    A page whose mtime and size are unchanged is reused without reading it;
+    otherwise its sha256 decides. Returns (pages in entry order, new manifest,
+    stats) where stats counts reused, parsed and removed pages.
+    """
+    cached = manifest['pages']
+    fresh = {}
+    order = []
+    to_parse = []
+    reused = 0
+
+    for source_file, mtime, size, read in entries:
+        order.append(source_file)
+        entry = cached.get(source_file)
+
+        if entry and mtime is not None and entry['mtime'] == mtime and entry['size'] == size:
+            fresh[source_file] = entry
+            reused += 1
+            continue
+
+        raw = read()
+        digest = hashlib.sha256(raw).hexdigest()
+        if entry and entry['sha256'] == digest:
+            fresh[source_file] = dict(entry, mtime=mtime, size=size)
+            reused += 1
+            continue
+
+        fresh[source_file] = {"sha256": digest, "mtime": mtime, "size": size, "page": None}
+        to_parse.append((source_file, raw))
+
+    for page in parse(to_parse):
+        fresh[page['source_file']]['page'] = page
+
+    # Pages that failed to parse stay out of the manifest so they are retried
+    pages = {
+        source_file: entry for source_file, entry in fresh.items()
+        if entry['page'] is not None
+    }
+    new_manifest = dict(manifest, pages=pages)
+    stats = {
+        "reused": reused,
+        "parsed": len(to_parse),
+        "removed": len(set(cached) - set(fresh))
+    }
+    return [pages[s]['page'] for s in order if s in pages], new_manifest, stats
@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+Near-duplicate clustering for rhetorical figures
+Hashes every figure definition into a MinHash signature and uses
+locality-sensitive hashing to find candidate pairs in roughly linear time,
+instead of comparing every pair of definitions. Candidates whose shingle
+sets really are similar, or whose names only differ by case, punctuation
+or a parenthetical, are clustered; each cluster keeps one canonical figure
+and records the other names as its aliases. Boilerplate definitions (short
+ones, or text repeated across many figures such as "Related Topics of
+Invention") are left out of the shingle input, and two definitions only
+link figures whose names are related as well.
+"""
+
+import os
+import re
+import sys
+import json
+import struct
+import hashlib
+import argparse
+from difflib import SequenceMatcher
+from collections import Counter, defaultdict
+
+# Every figure, before clustering; the deduplicated set the server loads is
+# written separately so reruns always start from the full list
+SOURCE_FILE = 'data/rhetorical_figures_all.json'
+FIGURES_FILE = 'data/rhetorical_figures_cleaned.json'
+REPORT_FILE = 'figures_near_duplicates_report.json'
+
+# 128 permutations in 32 bands of 4 rows: pairs with Jaccard >= ~0.6 almost
+# always share a band, pairs below ~0.3 rarely do
+NUM_PERM = 128
+BANDS = 32
+ROWS = NUM_PERM // BANDS
+
+# Exact shingle Jaccard a candidate pair needs to be called a duplicate
+THRESHOLD = 0.8
+
+# Words per definition shingle
+SHINGLE_SIZE = 2
+
+# Definitions with fewer shingles carry too little text to compare
+MIN_SHINGLES = 5
+
+# A definition shared by more figures than this is boilerplate (a cross
+# reference or a grouping caption), not evidence of a duplicate
+MAX_DEFINITION_REPEATS = 2
+
+# Name similarity two figures need before their definitions can link them
+NAME_SIMILARITY = 0.5
+
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = (1 << 32) - 1
+
+WORD_RE = re.compile(r"[a-z0-9']+")
+PARENTHETICAL_RE = re.compile(r"\s*[\(\[][^\)\]]*[\)\]]")
+
+
+def stable_hash(text):
+    """32-bit hash that does not change between runs (unlike hash())"""
+    return struct.unpack('<I', hashlib.blake2b(text.encode('utf-8'), digest_size=4).digest())[0]
+
+
+def make_permutations(num_perm=NUM_PERM, seed=1):
+    """Fixed (a, b) pairs for the universal hash family a*x + b mod p"""
+    permutations = []
+    for i in range(num_perm):
+        digest = hashlib.blake2b(f"{seed}:{i}".encode('utf-8'), digest_size=16).digest()
+        a, b = struct.unpack('<QQ', digest)
+        permutations.append((a % (MERSENNE_PRIME - 1) + 1, b % MERSENNE_PRIME))
+    return permutations
+
+
+PERMUTATIONS = make_permutations()
+
+
+def normalize_name(name):
+    """Base name used to block figures whose names are trivially different"""
+    name = PARENTHETICAL_RE.sub('', name.lower())
+    return ' '.join(WORD_RE.findall(name))
+
+
+def shingles(text, size=SHINGLE_SIZE):
+    """Set of hashed word n-grams; short texts fall back to single words"""
+    words = WORD_RE.findall(text.lower())
+    if len(words) < size:
+        return {stable_hash(word) for word in words}
+    return {stable_hash(' '.join(words[i:i + size])) for i in range(len(words) - size + 1)}
+
+
+def definition_key(text):
+    return ' '.join(WORD_RE.findall(text.lower()))
+
+
+def comparable_shingles(figures, min_shingles=MIN_SHINGLES, max_repeats=MAX_DEFINITION_REPEATS):
+    """Shingle set per figure, empty for short or repeated boilerplate definitions"""
+    keys = [definition_key(figure.get('definition', '')) for figure in figures]
+    repeats = Counter(keys)
+    shingle_sets = []
+    for figure, key in zip(figures, keys):
+        shingle_set = shingles(figure.get('definition', ''))
+        if len(shingle_set) < min_shingles or repeats[key] > max_repeats:
+            shingle_set = set()
+        shingle_sets.append(shingle_set)
+    return shingle_sets
+
+
+def names_related(a, b, similarity=NAME_SIMILARITY):
+    """Similar names, or one name is where the other figure's definition starts
+
+    The latter catches entries whose name is a truncated copy of the
+    definition (e.g. "Substitution of a" for Periphrasis).
+    """
+    name_a, name_b = normalize_name(a['figure_name']), normalize_name(b['figure_name'])
+    if not name_a or not name_b:
+        return False
+    if SequenceMatcher(None, name_a, name_b).ratio() >= similarity:
+        return True
+    return (definition_key(b.get('definition', '')).startswith(name_a)
+            or definition_key(a.get('definition', '')).startswith(name_b))
+
+
+def minhash(shingle_set, permutations=PERMUTATIONS):
+    """MinHash signature of a set of 32-bit shingle hashes"""
+    if not shingle_set:
+        return [MAX_HASH] * len(permutations)
+    return [
+        min(((a * x + b) % MERSENNE_PRIME) & MAX_HASH for x in shingle_set)
+        for a, b in permutations
+    ]
+
+
+def jaccard(a, b):
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def lsh_candidates(signatures, bands=BANDS, rows=ROWS):
+    """Pairs of ids whose signatures collide in at least one band (None never collides)"""
+    candidates = set()
+    for band in range(bands):
+        buckets = defaultdict(list)
+        start = band * rows
+        for i, signature in enumerate(signatures):
+            if signature is None:
+                continue
+            buckets[tuple(signature[start:start + rows])].append(i)
+        for ids in buckets.values():
+            for j in range(1, len(ids)):
+                for i in ids[:j]:
+                    candidates.add((i, ids[j]))
+    return candidates
+
+
+class DisjointSet:
+    def __init__(self, size):
+        self.parent = list(range(size))
+
+    def find(self, i):
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def union(self, i, j):
+        i, j = self.find(i), self.find(j)
+        if i != j:
+            # Keep the earliest figure as the root so clusters are stable
+            self.parent[max(i, j)] = min(i, j)
+
+
+def cluster_figures(figures, threshold=THRESHOLD):
+    """Cluster near-duplicate figures
+
+    Returns (clusters, stats) where clusters is a list of
+    {"members": [ids], "reasons": {(i, j): reason}} in first-seen order.
+    """
+    shingle_sets = comparable_shingles(figures)
+    # Boilerplate figures get no signature, so they never become candidates
+    signatures = [minhash(s) if s else None for s in shingle_sets]
+    disjoint = DisjointSet(len(figures))
+    reasons = {}
+
+    candidates = lsh_candidates(signatures)
+    confirmed = 0
+    for i, j in sorted(candidates):
+        similarity = jaccard(shingle_sets[i], shingle_sets[j])
+        if similarity >= threshold and names_related(figures[i], figures[j]):
+            disjoint.union(i, j)
+            reasons[(i, j)] = f"definition jaccard {similarity:.2f}"
+            confirmed += 1
+
+    by_name = {}
+    for i, figure in enumerate(figures):
+        key = normalize_name(figure['figure_name'])
+        if key in by_name:
+            disjoint.union(by_name[key], i)
+            reasons[(by_name[key], i)] = f"name '{key}'"
+        else:
+            by_name[key] = i
+
+    members = defaultdict(list)
+    for i in range(len(figures)):
+        members[disjoint.find(i)].append(i)
+
+    clusters = []
+    for root in sorted(members):
+        ids = members[root]
+        if len(ids) > 1:
+            ids_set = set(ids)
+            clusters.append({
+                "members": ids,
+                "reasons": {pair: reason for pair, reason in reasons.items() if pair[0] in ids_set}
+            })
+
+    stats = {
+        "figures": len(figures),
+        "candidate_pairs": len(candidates),
+        "confirmed_pairs": confirmed,
+        "all_pairs": len(figures) * (len(figures) - 1) // 2
+    }
+    return clusters, stats
+
+
+def pick_canonical(figures, ids):
+    """Most informative member: longest definition, earliest on ties"""
+    return max(ids, key=lambda i: (len(figures[i].get('definition', '')), -i))
+
+
+def dedupe_figures(figures, clusters):
+    """Collapse each cluster into its canonical figure, keeping file order
+
+    Dropped names (and any aliases they already carried) move onto the
+    canonical figure's "aliases" list.
+    """
+    dropped = set()
+    aliases = {}
+    for cluster in clusters:
+        canonical = pick_canonical(figures, cluster['members'])
+        cluster['canonical'] = canonical
+        names = list(figures[canonical].get('aliases', []))
+        for i in cluster['members']:
+            if i == canonical:
+                continue
+            dropped.add(i)
+            for name in [figures[i]['figure_name']] + figures[i].get('aliases', []):
+                if name != figures[canonical]['figure_name'] and name not in names:
+                    names.append(name)
+        aliases[canonical] = names
+
+    deduped = []
+    for i, figure in enumerate(figures):
+        if i in dropped:
+            continue
+        figure = dict(figure)
+        if aliases.get(i):
+            figure['aliases'] = aliases[i]
+        deduped.append(figure)
+    return deduped
+
+
+def build_report(figures, clusters, stats):
+    return {
+        "stats": stats,
+        "clusters": [{
+            "canonical": figures[cluster['canonical']]['figure_name'],
+            "members": [figures[i]['figure_name'] for i in cluster['members']],
+            "definition": figures[cluster['canonical']].get('definition', ''),
+            "links": [
+                {"a": figures[i]['figure_name'], "b": figures[j]['figure_name'], "reason": reason}
+                for (i, j), reason in sorted(cluster['reasons'].items())
+            ]
+        } for cluster in clusters]
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--input', default=SOURCE_FILE, help="figures JSON to cluster")
+    parser.add_argument('--output', default=FIGURES_FILE, help="where to write the deduplicated figures")
+    parser.add_argument('--report', default=REPORT_FILE, help="cluster report path")
+    parser.add_argument('--threshold', type=float, default=THRESHOLD,
+                        help="definition shingle Jaccard needed to merge two figures")
+    parser.add_argument('--dry-run', action='store_true', help="write the report only")
+    args = parser.parse_args(argv)
+    if not args.dry_run and os.path.abspath(args.input) == os.path.abspath(args.output):
+        parser.error("--output must differ from --input, or reruns would cluster already deduplicated figures")
+
+    with open(args.input, 'r', encoding='utf-8') as f:
+        figures = json.load(f)
+    print(f"🔍 Clustering {len(figures)} figures from {args.input}")
+
+    clusters, stats = cluster_figures(figures, args.threshold)
+    deduped = dedupe_figures(figures, clusters)
+    report = build_report(figures, clusters, stats)
+    stats['clusters'] = len(clusters)
+    stats['kept'] = len(deduped)
+
+    with open(args.report, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"📊 {stats['candidate_pairs']} LSH candidate pairs of {stats['all_pairs']} possible, "
+          f"{stats['confirmed_pairs']} confirmed")
+    print(f"🧮 {len(clusters)} clusters, report saved to {args.report}")
+
+    if args.dry_run:
+        print(f"✅ Dry run: {len(figures)} -> {len(deduped)} figures")
+        return 0
+
+    # Same escaping as the file tropeConstraints has always loaded
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(deduped, f, indent=2)
+    print(f"✅ {len(figures)} -> {len(deduped)} figures saved to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,136 @@
+"""
+Pluggable HTML parser backends for the Figures pipeline
+Every backend returns a document exposing the small slice of the
+BeautifulSoup API that figures_ingest.parse_html relies on:
+find(), find_all(), get_text(), find_next_sibling() and .name
+"""
+
+import os
+from bs4 import BeautifulSoup
+
+try:
+    import lxml  # noqa: F401
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+    HAS_SELECTOLAX = True
+except ImportError:
+    HAS_SELECTOLAX = False
+
+REFERENCE_PARSER = 'html.parser'
+
+# Fastest first
+PARSER_PREFERENCE = ['selectolax', 'lxml', REFERENCE_PARSER]
+
+# Backends test-figures-parsers.py has shown byte-identical to html.parser on
+# the Figures corpus; 'auto' picks the fastest installed one of these.
+# selectolax and lxml close unclosed <p> tags that html.parser nests (137
+# pages), so they stay opt-in and test-figures-parsers.py fails while they
+# are installed and still differ.
+EQUIVALENT_PARSERS = {REFERENCE_PARSER}
+
+# Backend used when none is requested explicitly
+DEFAULT_PARSER = os.environ.get('FIGURES_PARSER', REFERENCE_PARSER)
+
+# bs4 leaves the text of these elements out of get_text()
+SKIP_TEXT_TAGS = {'script', 'style', 'template'}
+
+# bs4 collapses whitespace-only strings outside these elements
+PRESERVE_WHITESPACE_TAGS = {'pre', 'textarea'}
+ASCII_SPACES = '\x20\x0a\x09\x0c\x0d'
+
+
+def available_parsers():
+    """Return the installed backends in preference order"""
+    installed = {
+        'selectolax': HAS_SELECTOLAX,
+        'lxml': HAS_LXML,
+        REFERENCE_PARSER: True
+    }
+    return [name for name in PARSER_PREFERENCE if installed[name]]
+
+
+def resolve_parser(name=None):
+    """Map a requested backend name onto one that is installed
+
+    'auto' selects the fastest installed backend in EQUIVALENT_PARSERS; an
+    unknown or missing backend falls back to html.parser.
+    """
+    name = name or DEFAULT_PARSER
+    available = available_parsers()
+    if name == 'auto':
+        return next(parser for parser in available if parser in EQUIVALENT_PARSERS)
+    if name in available:
+        return name
+    return REFERENCE_PARSER
+
+
+class LexborNode:
+    """BeautifulSoup-style wrapper around a selectolax lexbor node"""
+
+    __slots__ = ('node',)
+
+    def __init__(self, node):
+        self.node = node
+
+    @property
+    def name(self):
+        return self.node.tag
+
+    def _strings(self, node, preserve=False):
+        child = node.child
+        while child is not None:
+            tag = child.tag
+            if tag == '-text':
+                text = child.text_content
+                # Match bs4, which stores whitespace-only strings as '\n' or ' '
+                if not preserve and not text.strip(ASCII_SPACES):
+                    text = '\n' if '\n' in text else ' '
+                yield text
+            elif not tag.startswith(('-', '!')) and tag not in SKIP_TEXT_TAGS:
+                yield from self._strings(child, preserve or tag in PRESERVE_WHITESPACE_TAGS)
+            child = child.next
+
+    def get_text(self, separator="", strip=False):
+        strings = self._strings(self.node)
+        if strip:
+            strings = (s.strip() for s in strings)
+            strings = (s for s in strings if s)
+        return separator.join(strings)
+
+    def find_next_sibling(self):
+        sibling = self.node.next
+        while sibling is not None:
+            if not sibling.tag.startswith(('-', '!')):
+                return LexborNode(sibling)
+            sibling = sibling.next
+        return None
+
+
+class LexborDocument:
+    """Parsed selectolax document answering find()/find_all() lookups"""
+
+    __slots__ = ('tree',)
+
+    def __init__(self, content):
+        self.tree = LexborHTMLParser(content)
+
+    def find(self, tag):
+        node = self.tree.css_first(tag)
+        return LexborNode(node) if node is not None else None
+
+    def find_all(self, tags):
+        if isinstance(tags, str):
+            tags = [tags]
+        return [LexborNode(node) for node in self.tree.css(', '.join(tags))]
+
+
+def make_soup(content, parser=None):
+    """Parse an HTML page with the requested backend"""
+    parser = resolve_parser(parser)
+    if parser == 'selectolax':
+        return LexborDocument(content)
+    return BeautifulSoup(content, parser)
@@ -0,0 +1,205 @@
+"""
+Compact record types for the Figures pipeline
+FigureRecord keeps one figure in a slotted dataclass with interned source
+and attribution strings, and the compact JSON-lines format writes each
+shared string once and refers to it by id. Records only expand back into
+the legacy dict schema when a consumer asks for it.
+"""
+
+import sys
+import json
+from dataclasses import dataclass, field, fields
+
+ATTRIBUTION = "Silva Rhetoricae (rhetoric.byu.edu), Gideon O. Burton, Brigham Young University"
+
+COMPACT_FORMAT = 'figures-compact'
+COMPACT_VERSION = 1
+
+# Fields stored as ids into a per-file string table
+TABLE_FIELDS = ('source_file', 'attribution')
+
+
+@dataclass(slots=True)
+class FigureRecord:
+    figure_name: str
+    definition: str
+    examples: list = field(default_factory=list)
+    notes: list = field(default_factory=list)
+    source_file: str = ""
+    attribution: str = ATTRIBUTION
+
+    def __post_init__(self):
+        # Every record from a page shares one copy of these strings
+        self.source_file = sys.intern(self.source_file)
+        self.attribution = sys.intern(self.attribution)
+
+    def to_dict(self):
+        """Expand into the legacy JSON schema"""
+        return {
+            "figure_name": self.figure_name,
+            "definition": self.definition,
+            "examples": self.examples,
+            "notes": self.notes,
+            "source_file": self.source_file,
+            "attribution": self.attribution
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['figure_name'], data['definition'], data.get('examples', []),
+                   data.get('notes', []), data.get('source_file', ""),
+                   data.get('attribution', ATTRIBUTION))
+
+
+FIGURE_FIELDS = [f.name for f in fields(FigureRecord)]
+
+
+def expand(record):
+    """Return a record in the legacy dict schema"""
+    return record.to_dict() if isinstance(record, FigureRecord) else record
+
+
+class StringTable:
+    """Assign a stable integer id to each distinct string"""
+
+    def __init__(self, values=()):
+        self.values = []
+        self.ids = {}
+        for value in values:
+            self.add(value)
+
+    def add(self, value):
+        """Return (id, is_new) for a string"""
+        string_id = self.ids.get(value)
+        if string_id is not None:
+            return string_id, False
+        string_id = len(self.values)
+        self.values.append(value)
+        self.ids[value] = string_id
+        return string_id, True
+
+
+def record_fields(record):
+    """Field names and values of a FigureRecord or a plain dict record"""
+    if isinstance(record, FigureRecord):
+        return FIGURE_FIELDS, [getattr(record, name) for name in FIGURE_FIELDS]
+    return list(record), list(record.values())
+
+
+class CompactWriter:
+    """Stream records as compact JSON lines
+
+    The first line is a header naming the positional fields. A table line
+    ({"t": field, "v": string}) defines the next id for that field the first
+    time a shared string appears, and every record is a positional array
+    with ids in place of those strings.
+    """
+
+    def __init__(self, path):
+        self.f = open(path, 'w', encoding='utf-8')
+        self.fields = None
+        self.tables = {}
+        self.count = 0
+
+    def _dump(self, value):
+        self.f.write(json.dumps(value, ensure_ascii=False, separators=(',', ':')))
+        self.f.write('\n')
+
+    def write(self, record):
+        names, values = record_fields(record)
+        if self.fields is None:
+            self.fields = names
+            self.tables = {name: StringTable() for name in names if name in TABLE_FIELDS}
+            self._dump({
+                "format": COMPACT_FORMAT,
+                "version": COMPACT_VERSION,
+                "fields": names,
+                "figure": isinstance(record, FigureRecord)
+            })
+        elif names != self.fields:
+            raise ValueError(f"Record fields {names} do not match {self.fields}")
+
+        for i, name in enumerate(names):
+            table = self.tables.get(name)
+            if table is not None:
+                string_id, is_new = table.add(values[i])
+                if is_new:
+                    self._dump({"t": name, "v": values[i]})
+                values[i] = string_id
+
+        self._dump(values)
+        self.count += 1
+
+    def close(self):
+        self.f.close()
+
+
+def iter_compact(path, expanded=True):
+    """Yield records from a compact file
+
+    FigureRecord files yield FigureRecords unless `expanded` asks for legacy
+    dicts; other files always yield dicts.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        header = None
+        tables = {}
+        for line in f:
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            if header is None:
+                if item.get('format') != COMPACT_FORMAT or item.get('version') != COMPACT_VERSION:
+                    raise ValueError(f"{path} is not a {COMPACT_FORMAT} v{COMPACT_VERSION} file")
+                header = item
+                tables = {name: [] for name in header['fields'] if name in TABLE_FIELDS}
+                positions = [(i, tables[name]) for i, name in enumerate(header['fields'])
+                             if name in tables]
+                continue
+            if isinstance(item, dict):
+                tables[item['t']].append(item['v'])
+                continue
+            for i, table in positions:
+                item[i] = table[item[i]]
+            if header['figure']:
+                record = FigureRecord(*item)
+                yield record.to_dict() if expanded else record
+            else:
+                yield dict(zip(header['fields'], item))
+
+
+def pack_page(page, sources):
+    """Encode a parsed page for the manifest, sharing a source StringTable"""
+    def pack(record):
+        if record is None:
+            return None
+        source_id, _ = sources.add(record.source_file)
+        return [record.figure_name, record.definition, record.examples, record.notes, source_id]
+
+    source_id, _ = sources.add(page['source_file'])
+    return {
+        "source": source_id,
+        "figure_data": pack(page['figure_data']),
+        "figure": pack(page['figure']),
+        "nested": [pack(record) for record in page['nested']],
+        "split": [pack(record) for record in page['split']],
+        "lines": [line['text'] for line in page['lines']]
+    }
+
+
+def unpack_page(packed, sources):
+    """Rebuild a parsed page from pack_page() output"""
+    def unpack(item):
+        if item is None:
+            return None
+        name, definition, examples, notes, source_id = item
+        return FigureRecord(name, definition, examples, notes, sources[source_id])
+
+    source_file = sys.intern(sources[packed['source']])
+    return {
+        "source_file": source_file,
+        "figure_data": unpack(packed['figure_data']),
+        "figure": unpack(packed['figure']),
+        "nested": [unpack(item) for item in packed['nested']],
+        "split": [unpack(item) for item in packed['split']],
+        "lines": [{"source_file": source_file, "text": text} for text in packed['lines']]
+    }
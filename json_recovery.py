@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Error-tolerant streaming recovery for damaged JSON corpus exports
+Walks a campaigns array once, decoding each element in place with
+raw_decode. Every well-formed campaign object is yielded as soon as it is
+read; broken ones are repaired when the damage is a trailing comma or a
+stray // comment, otherwise skipped. Every problem is reported with its
+character and UTF-8 byte offset, so the whole document never has to be
+re-parsed to get past one bad entry.
+"""
+
+import re
+import sys
+import json
+
+# Bump when recovery behaviour changes so cached results are not reused
+RECOVERY_VERSION = 1
+
+DECODER = json.JSONDecoder()
+
+WHITESPACE_RE = re.compile(r'[ \t\r\n]*')
+ARRAY_KEY_RE = re.compile(r'"campaigns"\s*:\s*\[')
+# Where scanning may pick up again after unreadable text
+RESYNC_RE = re.compile(r'[{\]]')
+# An element starting on its own line inside a span that failed to parse
+LINE_OBJECT_RE = re.compile(r'\n[ \t]*\{')
+
+
+def find_array_start(text, key_re=ARRAY_KEY_RE):
+    """Index just past the '[' of the campaigns array (or a bare top-level array)"""
+    match = key_re.search(text)
+    if match:
+        return match.end()
+    first = WHITESPACE_RE.match(text).end()
+    if first < len(text) and text[first] == '[':
+        return first + 1
+    raise ValueError("Could not find a campaigns array")
+
+
+def scan_value_end(text, start):
+    """End of the bracketed value opening at start, ignoring brackets in strings
+
+    Returns None if the value is never closed.
+    """
+    depth = 0
+    in_string = False
+    escaped = False
+    for i in range(start, len(text)):
+        char = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == '\\':
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in '{[':
+            depth += 1
+        elif char in '}]':
+            depth -= 1
+            if depth == 0:
+                return i + 1
+    return None
+
+
+def strip_noise(span):
+    """Drop // comments and trailing commas outside strings in one pass"""
+    out = []
+    i = 0
+    in_string = False
+    escaped = False
+    pending_comma = None
+    while i < len(span):
+        char = span[i]
+        if in_string:
+            out.append(char)
+            if escaped:
+                escaped = False
+            elif char == '\\':
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif span.startswith('//', i):
+            end = span.find('\n', i)
+            i = len(span) if end == -1 else end
+            continue
+        elif char == ',':
+            pending_comma = len(out)
+            out.append(char)
+        elif char in '}]' and pending_comma is not None:
+            del out[pending_comma]
+            out.append(char)
+            pending_comma = None
+        else:
+            if char == '"':
+                in_string = True
+            if char not in ' \t\r\n':
+                pending_comma = None
+            out.append(char)
+        i += 1
+    return ''.join(out)
+
+
+class ArrayRecovery:
+    """Iterate the objects of a possibly damaged JSON array
+
+    Iterating yields each recovered object; `damage` then lists dicts with
+    offset, byte_offset, kind, message and the action taken. `complete` is
+    True when the array's closing ']' was reached.
+    """
+
+    def __init__(self, text, start=None):
+        self.text = text
+        self.start = find_array_start(text) if start is None else start
+        self.damage = []
+        self.complete = False
+        self.repaired = 0
+        self._char_mark = 0
+        self._byte_mark = 0
+
+    def byte_offset(self, offset):
+        """UTF-8 byte offset of a character offset, counted incrementally"""
+        if offset < self._char_mark:
+            return len(self.text[:offset].encode('utf-8'))
+        self._byte_mark += len(self.text[self._char_mark:offset].encode('utf-8'))
+        self._char_mark = offset
+        return self._byte_mark
+
+    def report(self, offset, kind, message, action, end=None):
+        self.damage.append({
+            "offset": offset,
+            "byte_offset": self.byte_offset(offset),
+            "length": (end - offset) if end is not None else None,
+            "kind": kind,
+            "message": message,
+            "action": action
+        })
+
+    def _skip_separators(self, pos):
+        """Skip whitespace, commas and // comments between elements"""
+        text = self.text
+        while pos < len(text):
+            pos = WHITESPACE_RE.match(text, pos).end()
+            if text.startswith('//', pos):
+                end = text.find('\n', pos)
+                end = len(text) if end == -1 else end
+                self.report(pos, 'comment', text[pos:min(end, pos + 60)], 'skipped', end)
+                pos = end
+            elif text.startswith(',', pos):
+                pos += 1
+            else:
+                break
+        return pos
+
+    def _recover_object(self, pos, error):
+        """Repair or skip a broken object at pos, returning (object, next pos)"""
+        end = scan_value_end(self.text, pos)
+        if end is not None:
+            try:
+                obj = json.loads(strip_noise(self.text[pos:end]))
+            except json.JSONDecodeError:
+                pass
+            else:
+                self.repaired += 1
+                self.report(error.pos, 'invalid', error.msg, 'repaired', end)
+                return obj, end
+
+        # An unclosed object or string swallows the elements after it, so
+        # resume at the next object that starts a line after the error
+        limit = len(self.text) if end is None else end
+        match = LINE_OBJECT_RE.search(self.text, error.pos, limit)
+        if match:
+            resume = match.end() - 1
+            self.report(error.pos, 'invalid', error.msg, 'skipped', resume)
+            return None, resume
+        if end is None:
+            self.report(pos, 'truncated', f"unterminated object ({error.msg})", 'dropped', limit)
+        else:
+            self.report(error.pos, 'invalid', error.msg, 'skipped', end)
+        return None, limit
+
+    def __iter__(self):
+        text = self.text
+        pos = self.start
+        while True:
+            pos = self._skip_separators(pos)
+            if pos >= len(text):
+                self.report(pos, 'truncated', "array is not closed", 'closed')
+                return
+            char = text[pos]
+            if char == ']':
+                self.complete = True
+                return
+
+            if char == '{':
+                try:
+                    obj, pos = DECODER.raw_decode(text, pos)
+                except json.JSONDecodeError as e:
+                    obj, pos = self._recover_object(pos, e)
+                if obj is not None:
+                    yield obj
+                continue
+
+            # Anything else is not an element we can use: skip to the next object
+            match = RESYNC_RE.search(text, pos + 1)
+            end = match.start() if match else len(text)
+            self.report(pos, 'garbage', text[pos:min(end, pos + 60)], 'skipped', end)
+            pos = end
+
+
+def recover_objects(text, start=None):
+    """Return (objects, recovery) for the campaigns array in text"""
+    recovery = ArrayRecovery(text, start)
+    return list(recovery), recovery
+
+
+def print_damage(damage, limit=10):
+    """Print a short report for a list of damage entries"""
+    if not damage:
+        print("✅ No damage found")
+        return
+    repaired = sum(1 for item in damage if item['action'] == 'repaired')
+    print(f"🩹 {len(damage)} damaged region(s), {repaired} object(s) repaired:")
+    for item in damage[:limit]:
+        print(f"   byte {item['byte_offset']:,} (char {item['offset']:,}): "
+              f"{item['kind']} - {item['message']} [{item['action']}]")
+    if len(damage) > limit:
+        print(f"   ... {len(damage) - limit} more")
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        print("Usage: json_recovery.py INPUT.json [OUTPUT.json]")
+        return 1
+    with open(argv[0], 'r', encoding='utf-8') as f:
+        text = f.read()
+    campaigns, recovery = recover_objects(text)
+    print(f"📊 Recovered {len(campaigns)} objects from {argv[0]}")
+    print_damage(recovery.damage)
+    if len(argv) > 1:
+        with open(argv[1], 'w', encoding='utf-8') as f:
+            json.dump({"campaigns": campaigns}, f, indent=2, ensure_ascii=False)
+        print(f"💾 Saved to {argv[1]}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
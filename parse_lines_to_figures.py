@@ -1,43 +1,50 @@
-import json
+import argparse
+from figures_ingest import FOLDER_PATH, WORKERS, RAW_LINES_FILE, find_html_files, segment_figures
+from figures_io import FORMATS, RecordWriter, iter_records
+from extract_raw_lines import iter_lines
 
-INPUT_FILE = 'raw_lines.json'
 OUTPUT_FILE = 'figures_parsed.json'
 
-with open(INPUT_FILE, 'r', encoding='utf-8') as f:
-    data = json.load(f)
+def tee_lines(lines, writer):
+    """Pass lines through while copying them to an intermediate dump"""
+    for line in lines:
+        writer.write(line)
+        yield line
 
-parsed = []
-current_figure = None
-current_definition_lines = []
-current_source = None
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Segment raw paragraph lines into figures")
+    parser.add_argument('--input', metavar='RAW_LINES',
+                        help="read lines from a raw_lines .jsonl/.json dump instead of "
+                             "extracting them straight from ./Figures")
+    parser.add_argument('--dump-lines', action='store_true',
+                        help=f"also write the extracted lines to {RAW_LINES_FILE} for debugging")
+    parser.add_argument('--format', choices=FORMATS, default='jsonl', dest='output_format',
+                        help="jsonl streams .jsonl files, json writes the legacy arrays, "
+                             "both writes the two (default: jsonl)")
+    args = parser.parse_args(argv)
 
-for entry in data:
-    text = entry['text'].strip()
-    source = entry['source_file']
-    # If the line has 1-3 words, treat as figure name
-    if text and len(text.split()) <= 3:
-        if current_figure and current_definition_lines:
-            parsed.append({
-                "figure_name": current_figure,
-                "definition": " ".join(current_definition_lines).strip(),
-                "source_file": current_source
-            })
-        current_figure = text
-        current_definition_lines = []
-        current_source = source
+    dump = None
+    if args.input:
+        # Reads the .jsonl sibling when present, otherwise the .json array
+        lines = iter_records(args.input)
     else:
-        if text:
-            current_definition_lines.append(text)
+        # Fused pipeline: lines go from the HTML parser straight into the segmenter
+        lines = iter_lines(find_html_files(FOLDER_PATH), WORKERS)
+        if args.dump_lines:
+            dump = RecordWriter(RAW_LINES_FILE, args.output_format)
+            lines = tee_lines(lines, dump)
 
-# Save the last figure if any
-if current_figure and current_definition_lines:
-    parsed.append({
-        "figure_name": current_figure,
-        "definition": " ".join(current_definition_lines).strip(),
-        "source_file": current_source
-    })
+    try:
+        with RecordWriter(OUTPUT_FILE, args.output_format) as writer:
+            for figure in segment_figures(lines):
+                writer.write(figure)
+    finally:
+        if dump:
+            dump.close()
 
-with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
-    json.dump(parsed, f, ensure_ascii=False, indent=2)
+    print(f"✅ Parsing complete! {writer.count} figures saved to {', '.join(writer.paths)}")
+    if dump:
+        print(f"💾 {dump.count} raw lines dumped to {', '.join(dump.paths)}")
 
-print(f"✅ Parsing complete! {len(parsed)} figures saved to {OUTPUT_FILE}")
\ No newline at end of file
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Parallel line-segmented decoding of large RTF corpus exports
+Splits the campaigns array of a memory-mapped RTF file into byte segments
+that start on a line opening a new object, then decodes the RTF and
+recovers the JSON objects of every segment on a process pool. Workers map
+the file themselves, so only offsets travel to them. Each segment is
+checked against its neighbours - the RTF decoder state it ends in and
+whether its last object was cut short - and re-decoded in order wherever
+a guess was wrong, so the stitched result matches a sequential decode.
+"""
+
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from json_recovery import ArrayRecovery
+from rtf_scan import find_array, iter_array_text, mapped, source_encoding
+from rtf_text import RtfDecoder
+
+# Bump when segmenting or stitching changes so cached results are not reused
+PARALLEL_VERSION = 1
+
+WORKERS = int(os.environ.get('CORPUS_WORKERS', os.cpu_count() or 1))
+
+# Arrays smaller than this are decoded in-process
+PARALLEL_MIN_BYTES = 2 << 20
+SEGMENT_BYTES = 4 << 20
+
+# "},\" at the end of a line followed by a line opening the next object
+RAW_OBJECT_BREAK_RE = re.compile(rb',\\\r?\n(?=\\\{)')
+
+
+def initial_state(data, start):
+    """Decoder state assumed at the opening '[' (as rtf_scan assumes it)"""
+    decoder = RtfDecoder()
+    decoder.encoding = source_encoding(data, start)
+    return decoder.state()
+
+
+def segment_offsets(data, start, segment_bytes=SEGMENT_BYTES):
+    """Byte offsets splitting data[start:] at lines that open a new object"""
+    offsets = [start]
+    target = start + segment_bytes
+    while target < len(data):
+        match = RAW_OBJECT_BREAK_RE.search(data, target)
+        if not match:
+            break
+        offsets.append(match.end())
+        target = match.end() + segment_bytes
+    offsets.append(len(data))
+    return offsets
+
+
+def decode_segment(data, begin, end, state, first, last):
+    """Decode one segment, returning its objects and how it ended"""
+    decoder = RtfDecoder()
+    decoder.restore(state)
+    # Segments after the first start between objects, one level inside the array
+    text = ''.join(iter_array_text(data, begin, end=end, decoder=decoder,
+                                   depth=0 if first else 1))
+
+    recovery = ArrayRecovery(text, 1 if first else 0)
+    objects = list(recovery)
+    damage = recovery.damage
+    if not last and not recovery.complete and damage and damage[-1]['action'] == 'closed':
+        # Only the segment holding the closing ']' can end the array
+        damage.pop()
+    # An object still open at the end means the segment was cut mid-object
+    cut = any(item['kind'] == 'truncated' and item['length'] is not None
+              and item['offset'] + item['length'] >= len(text) for item in damage)
+    return {
+        "objects": objects,
+        "damage": damage,
+        "complete": recovery.complete,
+        "cut": cut,
+        "chars": len(text),
+        "bytes": len(text.encode('utf-8')),
+        "state": decoder.state()
+    }
+
+
+def _decode_file_segment(path, begin, end, state, first, last):
+    with mapped(path) as data:
+        return decode_segment(data, begin, end, state, first, last)
+
+
+def decode_array(path, workers=WORKERS, segment_bytes=SEGMENT_BYTES):
+    """Return (objects, damage, complete) for the campaigns array of an RTF file
+
+    Damage offsets count from the array's '[' as in a sequential decode.
+    Raises ValueError when the file has no array.
+    """
+    with mapped(path) as data:
+        start = find_array(data)
+        state = initial_state(data, start)
+        if workers <= 1 or len(data) - start < PARALLEL_MIN_BYTES:
+            return stitch(data, [start, len(data)], state)
+        offsets = segment_offsets(data, start, segment_bytes)
+        if len(offsets) <= 2:
+            return stitch(data, offsets, state)
+
+        # Every segment is first decoded from the state the array opened
+        # with, which holds throughout flat exports; stitch() re-decodes any
+        # segment whose real starting state differs
+        count = len(offsets) - 1
+        with ProcessPoolExecutor(max_workers=min(workers, count)) as executor:
+            futures = [
+                executor.submit(_decode_file_segment, path, begin, end, state,
+                                i == 0, i == count - 1)
+                for i, (begin, end) in enumerate(zip(offsets, offsets[1:]))
+            ]
+            try:
+                return stitch(data, offsets, state, futures)
+            finally:
+                # Segments past the end of the array are not needed
+                for future in futures:
+                    future.cancel()
+
+
+def stitch(data, offsets, state, futures=None):
+    """Join segment results in order, re-decoding segments guessed wrong"""
+    spans = list(zip(offsets, offsets[1:]))
+    assumed = [state] * len(spans)
+    results = [None] * len(spans) if futures is None else list(futures)
+
+    objects = []
+    damage = []
+    chars = 0
+    byte_count = 0
+    complete = False
+    i = 0
+    while i < len(spans):
+        last = i + 1 == len(spans)
+        result = results[i]
+        if result is None:
+            result = decode_segment(data, *spans[i], assumed[i], i == 0, last)
+        elif not isinstance(result, dict):
+            result = result.result()
+
+        if result['cut'] and not result['complete'] and not last:
+            # The split landed inside an object: decode both halves as one
+            spans[i:i + 2] = [(spans[i][0], spans[i + 1][1])]
+            del assumed[i + 1]
+            results[i:i + 2] = [None]
+            continue
+
+        for item in result['damage']:
+            damage.append(dict(item, offset=item['offset'] + chars,
+                               byte_offset=item['byte_offset'] + byte_count))
+        objects.extend(result['objects'])
+        chars += result['chars']
+        byte_count += result['bytes']
+        if result['complete']:
+            complete = True
+            break
+
+        # The next segment must start in the state this one ended in
+        if not last and assumed[i + 1] != result['state']:
+            assumed[i + 1] = result['state']
+            results[i + 1] = None
+        i += 1
+
+    return objects, damage, complete
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        print("Usage: rtf_parallel.py FILE.rtf [WORKERS]")
+        return 1
+    workers = int(argv[1]) if len(argv) > 1 else WORKERS
+    objects, damage, complete = decode_array(argv[0], workers)
+    state = "closed" if complete else "not closed"
+    print(f"✅ {len(objects)} objects with {workers} worker(s), "
+          f"{len(damage)} damaged region(s), array {state}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Memory-mapped scanning of large RTF corpus sources
+Maps the file read-only, finds the campaigns array by searching the raw
+bytes in place and decodes only that region, feeding memoryview slices of
+the map to the RTF decoder and stopping as soon as the array closes. The
+document is never read into one string, so tens of megabytes of export
+cost a few chunks of memory plus the array text itself.
+"""
+
+import re
+import sys
+import mmap
+import codecs
+import itertools
+from contextlib import contextmanager
+from rtf_text import DEFAULT_CODEPAGE, RtfDecoder, codepage_encoding
+
+# Bump when the located array region or its decoding changes so cached results are not reused
+SCAN_VERSION = 1
+
+CHUNK_SIZE = 1 << 16
+
+# The array as it appears in the raw RTF, where lines end in '\' continuations
+RAW_ARRAY_KEY_RE = re.compile(rb'"campaigns"(?:\s|\\\r?\n)*:(?:\s|\\\r?\n)*\[')
+RAW_CODEPAGE_RE = re.compile(rb'\\ansicpg(\d+)')
+# A whole JSON string, or a bracket; a lone '"' opens a string left unclosed
+STRUCTURE_RE = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"|["\[\]{}]', re.DOTALL)
+# The rest of a string that was opened in an earlier piece
+STRING_TAIL_RE = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+STRING_RE = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+NOT_BRACKET_RE = re.compile(r'[^\[\]{}]+')
+BRACKET_DEPTH = {'[': 1, '{': 1, ']': -1, '}': -1}
+
+
+@contextmanager
+def mapped(path):
+    """Read-only memory map of a file (empty files give b'')"""
+    with open(path, 'rb') as f:
+        try:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be mapped
+            yield b''
+            return
+        try:
+            yield data
+        finally:
+            data.close()
+
+
+def find_array(data):
+    """Byte offset of the '[' opening the campaigns array (or the first array)"""
+    match = RAW_ARRAY_KEY_RE.search(data)
+    if match:
+        return match.end() - 1
+    index = data.find(b'[')
+    if index == -1:
+        raise ValueError("Could not find a campaigns array")
+    return index
+
+
+def source_encoding(data, end):
+    """Code page declared in the RTF header before end"""
+    match = RAW_CODEPAGE_RE.search(data, 0, end)
+    return codepage_encoding(match.group(1).decode('ascii')) if match else DEFAULT_CODEPAGE
+
+
+class ValueEnd:
+    """Find where a bracketed JSON value closes in text arriving in pieces"""
+
+    def __init__(self):
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+
+    def _open_string(self, tail):
+        """Remember a string still open at the end of a piece"""
+        self.in_string = True
+        # An odd run of trailing backslashes escapes the next piece's first char
+        self.escaped = (len(tail) - len(tail.rstrip('\\'))) % 2 == 1
+
+    def feed(self, text):
+        """Index just past the closing bracket in text, or None if still open"""
+        pos = 0
+        if self.in_string:
+            if self.escaped:
+                self.escaped = False
+                pos = 1
+            match = STRING_TAIL_RE.match(text, pos)
+            if not match:
+                self._open_string(text[pos:])
+                return None
+            self.in_string = False
+            pos = match.end()
+
+        # Fast path: drop whole strings in C and see whether the brackets
+        # left over can bring the depth back to zero in this piece
+        skeleton = STRING_RE.sub('', text[pos:] if pos else text)
+        opener = skeleton.find('"')
+        brackets = NOT_BRACKET_RE.sub('', skeleton if opener == -1 else skeleton[:opener])
+        depths = list(itertools.accumulate(map(BRACKET_DEPTH.get, brackets), initial=self.depth))
+        if min(depths[1:], default=1) > 0:
+            self.depth = depths[-1]
+            if opener != -1:
+                # Trailing backslashes are never inside a removed string
+                self._open_string(skeleton[opener:])
+            return None
+
+        while True:
+            match = STRUCTURE_RE.search(text, pos)
+            if not match:
+                return None
+            start, pos = match.span()
+            char = text[start]
+            if char == '"':
+                if pos - start == 1:
+                    self._open_string(text[pos:])
+                    return None
+            elif char in '[{':
+                self.depth += 1
+            else:
+                self.depth -= 1
+                if self.depth == 0:
+                    return pos
+
+
+def iter_array_text(data, start=None, par='\n', chunk_size=CHUNK_SIZE, end=None,
+                    decoder=None, depth=0):
+    """Yield the decoded text of the array opening at byte start
+
+    Stops at the array's closing ']'; an array that is never closed is
+    decoded up to end (the end of the file by default). To resume inside
+    an array, pass a decoder already carrying the RTF state and the bracket
+    depth at start.
+    """
+    start = find_array(data) if start is None else start
+    end = len(data) if end is None else end
+    if decoder is None:
+        decoder = RtfDecoder(par)
+        decoder.encoding = source_encoding(data, start)
+    utf8 = codecs.getincrementaldecoder('utf-8')()
+    value_end = ValueEnd()
+    value_end.depth = depth
+
+    view = memoryview(data)
+    try:
+        for offset in range(start, end + chunk_size, chunk_size):
+            final = offset >= end
+            piece = utf8.decode(view[offset:min(offset + chunk_size, end)], final=final)
+            texts = decoder.feed(piece)
+            if final:
+                texts = itertools.chain(texts, decoder.close())
+            # Scan each chunk's text at once rather than token by token
+            text = ''.join(texts)
+            close = value_end.feed(text)
+            if close is not None:
+                yield text[:close]
+                return
+            if text:
+                yield text
+    finally:
+        view.release()
+
+
+def read_array_text(path, par='\n', chunk_size=CHUNK_SIZE):
+    """Return (array text, byte offset of the array) for an RTF file
+
+    Raises ValueError when the file has no array.
+    """
+    with mapped(path) as data:
+        start = find_array(data)
+        text = ''.join(iter_array_text(data, start, par, chunk_size))
+    return text, start
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        print("Usage: rtf_scan.py FILE.rtf [OUTPUT.json]")
+        return 1
+    text, start = read_array_text(argv[0])
+    print(f"✅ Array at byte {start:,}: {len(text):,} characters decoded")
+    if len(argv) > 1:
+        with open(argv[1], 'w', encoding='utf-8') as f:
+            f.write(text)
+        print(f"💾 Saved to {argv[1]}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Single-pass RTF to text decoder
+Tokenizes RTF in one linear scan and tracks group state as it goes:
+control words and symbols, \\'hh hex escapes in the document code page,
+\\uN unicode escapes with their \\ucN fallback characters, ignorable
+destinations such as the font and colour tables, and the backslash line
+continuations macOS TextEdit writes at the end of every paragraph.
+Text is yielded as a stream of chunks instead of being rebuilt by a
+cascade of re.sub passes over the whole file.
+"""
+
+import re
+import sys
+
+# Bump when decoded output changes so cached results are not reused
+DECODER_VERSION = 3
+
+DEFAULT_CODEPAGE = 'cp1252'
+
+# Mac code pages, which Python names rather than numbers
+MAC_CODEPAGES = {
+    10000: 'mac_roman',
+    10006: 'mac_greek',
+    10007: 'mac_cyrillic',
+    10029: 'mac_latin2'
+}
+
+SURROGATE_RE = re.compile('[\ud800-\udfff]')
+
+TOKEN_RE = re.compile(r"""
+    (?P<word>\\(?P<name>[a-zA-Z]{1,32})(?P<arg>-?\d{1,10})?[ ]?)   # control word
+  | \\'(?P<hex>[0-9a-fA-F]{2})                          # \\'hh byte in the code page
+  | \\(?P<newline>\r\n|\r|\n)                           # line continuation = \\par
+  | \\(?P<symbol>[^a-zA-Z'\r\n])                        # control symbol
+  | (?P<group>[{}])
+  | (?P<eol>[\r\n]+)                                    # bare newlines carry no text
+  | (?P<text>[^\\{}\r\n]+)
+  | (?P<partial>\\.?)                                   # incomplete escape at end of input
+""", re.VERBOSE | re.DOTALL)
+
+# Groups whose content is never document text
+DESTINATIONS = {
+    'fonttbl', 'colortbl', 'stylesheet', 'info', 'pict', 'header', 'footer',
+    'headerl', 'headerr', 'headerf', 'footerl', 'footerr', 'footerf',
+    'listtable', 'listoverridetable', 'rsidtbl', 'generator', 'xmlnstbl',
+    'themedata', 'colorschememapping', 'latentstyles', 'datastore', 'object',
+    'nonshppict', 'fldinst', 'filetbl', 'revtbl', 'footnote', 'expandedcolortbl'
+}
+
+# Control words that stand for characters
+WORD_TEXT = {
+    'tab': '\t', 'emdash': '\u2014', 'endash': '\u2013', 'emspace': '\u2003',
+    'enspace': '\u2002', 'bullet': '\u2022', 'lquote': '\u2018', 'rquote': '\u2019',
+    'ldblquote': '\u201c', 'rdblquote': '\u201d', 'zwj': '\u200d', 'zwnj': '\u200c'
+}
+
+# Control words that break a line or paragraph
+BREAK_WORDS = {'par', 'line', 'sect', 'page', 'row'}
+
+# Control symbols with a meaning other than the literal character
+SYMBOL_TEXT = {'~': '\u00a0', '-': '', '_': '\u2011'}
+
+CHARSET_WORDS = {'ansi': 'cp1252', 'mac': 'mac_roman', 'pc': 'cp437', 'pca': 'cp850'}
+
+
+def codepage_encoding(number):
+    """Python codec for an \\ansicpgN code page, falling back to cp1252"""
+    name = MAC_CODEPAGES.get(int(number), f"cp{number}")
+    try:
+        ''.encode(name)
+    except LookupError:
+        return DEFAULT_CODEPAGE
+    return name
+
+
+class RtfDecoder:
+    """Incremental RTF tokenizer
+
+    feed() accepts the document in any number of pieces and yields decoded
+    text as soon as it is known; close() flushes whatever is left. `par` is
+    what paragraph and line breaks become in the output.
+    """
+
+    def __init__(self, par='\n'):
+        self.par = par
+        self.encoding = DEFAULT_CODEPAGE
+        self.pending = ''
+        self.hex_bytes = bytearray()
+        # Per-group state: (skipping destination, \\ucN fallback length)
+        self.skip = False
+        self.uc = 1
+        self.stack = []
+        # Fallback characters still to drop after a \\uN escape
+        self.fallback = 0
+        # Set right after '{' so '\\*' and destination words can mark the group
+        self.group_start = False
+        self.starred = False
+        # High half of a \\uN surrogate pair whose low half has not been seen yet
+        self.surrogate = ''
+
+    def state(self):
+        """Group and escape state, for resuming decoding at another offset"""
+        return (self.encoding, self.skip, self.uc, tuple(self.stack), self.fallback,
+                self.group_start, self.starred, self.surrogate)
+
+    def restore(self, state):
+        (self.encoding, self.skip, self.uc, stack, self.fallback,
+         self.group_start, self.starred, self.surrogate) = state
+        self.stack = list(stack)
+
+    def _output(self, text):
+        """Join \\uN surrogate pairs (emoji and other non-BMP characters) into one
+        character; a half without its partner becomes U+FFFD"""
+        text = self.surrogate + text
+        self.surrogate = ''
+        if text and '\ud800' <= text[-1] <= '\udbff':
+            # The low half may come with the next \\uN
+            self.surrogate = text[-1]
+            text = text[:-1]
+        if SURROGATE_RE.search(text):
+            text = text.encode('utf-16-le', 'surrogatepass').decode('utf-16-le', errors='replace')
+        return text
+
+    def _flush_hex(self):
+        if self.hex_bytes:
+            text = self.hex_bytes.decode(self.encoding, errors='replace')
+            self.hex_bytes.clear()
+            return text
+        return ''
+
+    def _text(self, text):
+        if self.fallback:
+            dropped = min(self.fallback, len(text))
+            self.fallback -= dropped
+            text = text[dropped:]
+        return text
+
+    def _control_word(self, word, arg):
+        """Apply a control word, returning the text it produces"""
+        if self.group_start and (self.starred or word in DESTINATIONS):
+            self.skip = True
+        self.group_start = False
+        self.starred = False
+
+        if word == 'u' and arg is not None:
+            code = int(arg)
+            if code < 0:
+                code += 0x10000
+            text = chr(code) if not self.skip else ''
+            self.fallback = self.uc
+            return text
+
+        if self.fallback:
+            # A control word stands in for one fallback character
+            self.fallback -= 1
+            return ''
+        if word == 'uc' and arg is not None:
+            self.uc = int(arg)
+        elif word == 'ansicpg' and arg is not None:
+            self.encoding = codepage_encoding(arg)
+        elif word in CHARSET_WORDS:
+            self.encoding = CHARSET_WORDS[word]
+        elif self.skip:
+            return ''
+        elif word in BREAK_WORDS:
+            return self.par
+        elif word in WORD_TEXT:
+            return WORD_TEXT[word]
+        return ''
+
+    def _tokens(self, data, final):
+        for match in TOKEN_RE.finditer(data):
+            kind = match.lastgroup
+            if not final and (kind == 'partial' or match.end() == len(data)
+                              and kind not in ('text', 'group')
+                              or kind == 'word' and data[match.end():] == '-'):
+                # The escape may continue in the next piece
+                self.pending = data[match.start():]
+                return
+            yield kind, match
+
+        self.pending = ''
+
+    def feed(self, data, final=False):
+        """Decode another piece of the document, yielding text chunks"""
+        data = self.pending + data
+        self.pending = ''
+
+        for kind, match in self._tokens(data, final):
+            if kind == 'hex':
+                if self.fallback:
+                    self.fallback -= 1
+                elif not self.skip:
+                    self.hex_bytes.append(int(match.group('hex'), 16))
+                self.group_start = False
+                continue
+
+            text = self._flush_hex()
+            if kind == 'text':
+                self.group_start = False
+                if not self.skip:
+                    text += self._text(match.group('text'))
+            elif kind == 'word':
+                text += self._control_word(match.group('name'), match.group('arg'))
+            elif kind == 'group':
+                self.fallback = 0
+                if match.group('group') == '{':
+                    self.stack.append((self.skip, self.uc))
+                    self.group_start = True
+                    self.starred = False
+                else:
+                    if self.stack:
+                        self.skip, self.uc = self.stack.pop()
+                    self.group_start = False
+            elif kind == 'symbol':
+                symbol = match.group('symbol')
+                if symbol == '*' and self.group_start:
+                    self.starred = True
+                    continue
+                self.group_start = False
+                if self.fallback:
+                    self.fallback -= 1
+                elif not self.skip:
+                    text += SYMBOL_TEXT.get(symbol, symbol)
+            elif kind == 'newline':
+                self.group_start = False
+                if self.fallback:
+                    self.fallback -= 1
+                elif not self.skip:
+                    text += self.par
+
+            if text:
+                text = self._output(text)
+                if text:
+                    yield text
+
+    def close(self):
+        """Flush any escape held back at the end of the input"""
+        yield from self.feed('', final=True)
+        text = self._flush_hex()
+        if text:
+            yield self._output(text)
+        if self.surrogate:
+            self.surrogate = ''
+            yield '\ufffd'
+
+
+def iter_rtf_text(pieces, par='\n'):
+    """Yield decoded text for an RTF string or an iterable of string pieces"""
+    if isinstance(pieces, str):
+        pieces = [pieces]
+    decoder = RtfDecoder(par)
+    for piece in pieces:
+        yield from decoder.feed(piece)
+    yield from decoder.close()
+
+
+def rtf_to_text(content, par='\n'):
+    """Decode a whole RTF document to plain text"""
+    return ''.join(iter_rtf_text(content, par))
+
+
+def read_rtf_text(file_path, par='\n', chunk_size=1 << 16):
+    """Decode an RTF file to text, reading it in chunks"""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return ''.join(iter_rtf_text(iter(lambda: f.read(chunk_size), ''), par))
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        print("Usage: rtf_text.py FILE.rtf [OUTPUT.txt]")
+        return 1
+    text = read_rtf_text(argv[0])
+    if len(argv) > 1:
+        with open(argv[1], 'w', encoding='utf-8') as f:
+            f.write(text)
+        print(f"✅ {len(text):,} characters saved to {argv[1]}")
+    else:
+        sys.stdout.write(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
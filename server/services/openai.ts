@@ -58,6 +58,14 @@ const openai = new OpenAI({
   baseURL: !process.env.OPENAI_API_KEY && process.env.GEMINI_API_KEY ? "https://generativelanguage.googleapis.com/v1beta/openai/" : undefined,
 });
 
+// Capitalize first letter of each word for consistency
+function capitalizeWords(name: string): string {
+  return name
+    .split(' ')
+    .map((word: string) => word.charAt(0).toUpperCase() + word.slice(1))
+    .join(' ');
+}
+
 // Load rhetorical devices from JSON file (408 figures)
 function loadRhetoricalDevices(): Record<string, string> {
   const possiblePaths = [
@@ -72,12 +80,15 @@ function loadRhetoricalDevices(): Record<string, string> {
         const data = JSON.parse(readFileSync(p, 'utf-8'));
         const devices: Record<string, string> = {};
         for (const item of data) {
-          // Capitalize first letter of each word for consistency
-          const name = item.figure_name
-            .split(' ')
-            .map((word: string) => word.charAt(0).toUpperCase() + word.slice(1))
-            .join(' ');
-          devices[name] = item.definition;
+          // Names merged into a figure as near-duplicates stay devices of their own
+          // (an alias never replaces a figure listed under that name)
+          (item.aliases || []).forEach((alias: string) => {
+            const name = capitalizeWords(alias);
+            if (!Object.prototype.hasOwnProperty.call(devices, name)) {
+              devices[name] = item.definition;
+            }
+          });
+          devices[capitalizeWords(item.figure_name)] = item.definition;
         }
         //console.log(`📚 Loaded ${Object.keys(devices).length} rhetorical devices from ${p}`);
         return devices;
@@ -0,0 +1,243 @@
+// 📂 server/utils/columnarCorpus.ts
+// Lazy reader for data/retrieval-corpus.columns, the columnar copy of the corpus
+// written by corpus_columnar.py. Opening it reads the bytes and parses only a
+// small header; a field is decoded when it is first asked for, so callers that
+// need a few fields never decode the rest (e.g. rationale text).
+
+import { readFileSync, existsSync } from 'fs';
+import { createHash } from 'crypto';
+import { join } from 'path';
+
+const MAGIC = Buffer.from([0x43, 0x46, 0x43, 0x4f, 0x4c, 0x53, 0x00, 0x01]); // "CFCOLS\0\1"
+const COLUMNAR_VERSION = 2;
+
+// Per-campaign state byte of every column
+const MISSING = 0;
+const VALUE = 2;
+
+type FieldKind = 'bool' | 'int' | 'string' | 'strings' | 'json';
+
+export interface SourceSignature {
+  file: string;
+  size: number;
+  sha256: string;
+}
+
+interface FieldSpec {
+  name: string;
+  kind: FieldKind;
+  buffers: { [buffer: string]: [number, number] };
+}
+
+interface ColumnarHeader {
+  version: number;
+  count: number;
+  source: SourceSignature | null;
+  fields: FieldSpec[];
+}
+
+export interface ColumnarCorpus {
+  length: number;
+  fields: string[];
+  source: ColumnarHeader['source'];
+  get(field: string, index: number): unknown;
+  column(field: string): unknown[];
+  rows(fields?: string[]): Record<string, unknown>[];
+}
+
+export function openColumnarCorpus(path: string): ColumnarCorpus {
+  const data = readFileSync(path);
+  if (data.length < MAGIC.length + 4 || !data.subarray(0, MAGIC.length).equals(MAGIC)) {
+    throw new Error(`${path} is not a columnar corpus`);
+  }
+  const headerLength = data.readUInt32LE(MAGIC.length);
+  const headerStart = MAGIC.length + 4;
+  const header: ColumnarHeader = JSON.parse(data.toString('utf8', headerStart, headerStart + headerLength));
+  if (header.version !== COLUMNAR_VERSION) {
+    throw new Error(`${path} has columnar version ${header.version}, expected ${COLUMNAR_VERSION}`);
+  }
+  const body = headerStart + headerLength;
+  const specs = new Map(header.fields.map((spec): [string, FieldSpec] => [spec.name, spec]));
+  const decoded = new Map<string, unknown[]>();
+  const dictionaries = new Map<string, string[]>();
+
+  const start = (spec: FieldSpec, buffer: string) => body + spec.buffers[buffer][0];
+  const u32 = (spec: FieldSpec, buffer: string, i: number) => data.readUInt32LE(start(spec, buffer) + 4 * i);
+  const text = (spec: FieldSpec, offsets: string, bytes: string, i: number) =>
+    data.toString('utf8', start(spec, bytes) + u32(spec, offsets, i), start(spec, bytes) + u32(spec, offsets, i + 1));
+
+  function dictionary(spec: FieldSpec): string[] {
+    let entries = dictionaries.get(spec.name);
+    if (!entries) {
+      const size = spec.buffers.dictOffsets[1] / 4 - 1;
+      entries = Array.from({ length: size }, (_, code) => text(spec, 'dictOffsets', 'dictData', code));
+      dictionaries.set(spec.name, entries);
+    }
+    return entries;
+  }
+
+  function state(spec: FieldSpec, index: number): number {
+    return data[start(spec, 'state') + index];
+  }
+
+  function get(field: string, index: number): unknown {
+    const spec = specs.get(field);
+    if (!spec || index < 0 || index >= header.count || state(spec, index) !== VALUE) {
+      return null;
+    }
+    switch (spec.kind) {
+      case 'bool':
+        return data[start(spec, 'values') + index] === 1;
+      case 'int':
+        return data.readInt32LE(start(spec, 'values') + 4 * index);
+      case 'strings': {
+        const names = dictionary(spec);
+        const values: string[] = [];
+        for (let i = u32(spec, 'offsets', index); i < u32(spec, 'offsets', index + 1); i++) {
+          values.push(names[u32(spec, 'codes', i)]);
+        }
+        return values;
+      }
+      case 'json':
+        return JSON.parse(text(spec, 'offsets', 'data', index));
+      default:
+        return text(spec, 'offsets', 'data', index);
+    }
+  }
+
+  // Copy of a u32 buffer; the file bytes are not guaranteed to be 4-byte aligned
+  function u32s(spec: FieldSpec, buffer: string): Uint32Array {
+    const [offset, length] = spec.buffers[buffer];
+    const begin = data.byteOffset + body + offset;
+    return new Uint32Array(data.buffer.slice(begin, begin + length));
+  }
+
+  function decode(spec: FieldSpec): unknown[] {
+    const states = data.subarray(start(spec, 'state'), start(spec, 'state') + header.count);
+    const values: unknown[] = new Array(header.count).fill(null);
+    if (spec.kind === 'string' || spec.kind === 'json') {
+      const offsets = u32s(spec, 'offsets');
+      const base = start(spec, 'data');
+      // Decode the column once; byte offsets are character offsets when it is all ASCII
+      const blob = data.toString('utf8', base, base + spec.buffers.data[1]);
+      const ascii = blob.length === spec.buffers.data[1];
+      for (let i = 0; i < header.count; i++) {
+        if (states[i] === VALUE) {
+          const value = ascii
+            ? blob.slice(offsets[i], offsets[i + 1])
+            : data.toString('utf8', base + offsets[i], base + offsets[i + 1]);
+          values[i] = spec.kind === 'json' ? JSON.parse(value) : value;
+        }
+      }
+    } else if (spec.kind === 'strings') {
+      const offsets = u32s(spec, 'offsets');
+      const codes = u32s(spec, 'codes');
+      const names = dictionary(spec);
+      for (let i = 0; i < header.count; i++) {
+        if (states[i] === VALUE) {
+          const list: string[] = [];
+          for (let c = offsets[i]; c < offsets[i + 1]; c++) {
+            list.push(names[codes[c]]);
+          }
+          values[i] = list;
+        }
+      }
+    } else {
+      for (let i = 0; i < header.count; i++) {
+        if (states[i] === VALUE) {
+          values[i] = get(spec.name, i);
+        }
+      }
+    }
+    return values;
+  }
+
+  function column(field: string): unknown[] {
+    let values = decoded.get(field);
+    if (!values) {
+      const spec = specs.get(field);
+      values = spec ? decode(spec) : new Array(header.count).fill(null);
+      decoded.set(field, values);
+    }
+    return values;
+  }
+
+  function rows(fields: string[] = header.fields.map(spec => spec.name)): Record<string, unknown>[] {
+    const wanted = fields.filter(field => specs.has(field));
+    const columns = wanted.map(column);
+    const states = wanted.map(field => start(specs.get(field)!, 'state'));
+    const result: Record<string, unknown>[] = new Array(header.count);
+    for (let i = 0; i < header.count; i++) {
+      const row: Record<string, unknown> = {};
+      for (let f = 0; f < wanted.length; f++) {
+        if (data[states[f] + i] !== MISSING) {
+          row[wanted[f]] = columns[f][i];
+        }
+      }
+      result[i] = row;
+    }
+    return result;
+  }
+
+  return {
+    length: header.count,
+    fields: header.fields.map(spec => spec.name),
+    source: header.source,
+    get,
+    column,
+    rows,
+  };
+}
+
+/** True when a derived artifact's recorded source is the JSON at jsonPath, byte for byte */
+export function matchesSource(source: SourceSignature | null | undefined, jsonPath: string): boolean {
+  if (!source) {
+    return false;
+  }
+  const data = readFileSync(jsonPath);
+  return source.size === data.length && source.sha256 === createHash('sha256').update(data).digest('hex');
+}
+
+// Where the corpus is deployed: local checkout, bundled server data, serverless task root
+export const CORPUS_PATHS = [
+  join(process.cwd(), 'data', 'retrieval-corpus.json'),
+  join(process.cwd(), 'server', 'data', 'retrieval-corpus.json'),
+  '/var/task/data/retrieval-corpus.json',
+];
+
+/**
+ * Campaigns of the first corpus found. With `fields`, only those fields are
+ * decoded, from the columnar copy when it was built from the current JSON
+ * (same sha256). Whole campaigns come from the JSON: V8's JSON.parse builds
+ * full rows faster than they can be assembled from columns. The retrieval and
+ * theory modules all need whole campaigns (the theory mappers match against
+ * every field), so they load the JSON; pass `fields` only where a projection
+ * is really enough.
+ */
+export function loadCorpusCampaigns<T = any>(fields?: string[]): T[] {
+  for (const jsonPath of CORPUS_PATHS) {
+    const columnsPath = jsonPath.replace(/\.json$/, '.columns');
+    const hasJson = existsSync(jsonPath);
+    if ((fields || !hasJson) && existsSync(columnsPath)) {
+      try {
+        const corpus = openColumnarCorpus(columnsPath);
+        if (!hasJson || matchesSource(corpus.source, jsonPath)) {
+          return corpus.rows(fields) as T[];
+        }
+      } catch (error) {
+        console.warn(`Ignoring ${columnsPath}:`, error);
+      }
+    }
+    if (hasJson) {
+      const campaigns: any[] = JSON.parse(readFileSync(jsonPath, 'utf-8')).campaigns || [];
+      if (!fields) {
+        return campaigns;
+      }
+      return campaigns.map(campaign =>
+        Object.fromEntries(fields.filter(field => field in campaign).map(field => [field, campaign[field]]))
+      ) as T[];
+    }
+  }
+  console.warn('retrieval-corpus.json not found, using empty corpus');
+  return [];
+}
@@ -0,0 +1,121 @@
+// 📂 server/utils/corpusSearchIndex.ts
+// Trigram index over the rationale tokens of the retrieval corpus, precomputed by
+// corpus_search_index.py and shipped as data/retrieval-corpus.search-index.json.
+// Posting lists hold campaign positions in retrieval-corpus.json and narrow
+// substring searches down to a few candidates to check. When the file is missing
+// or was built from a different corpus, the same index is built here instead, so
+// tokenize() must match the Python tokenizer.
+
+import { readFileSync, existsSync } from 'fs';
+import { CORPUS_PATHS, type SourceSignature, matchesSource } from './columnarCorpus';
+
+const SEARCH_INDEX_VERSION = 4;
+const GRAM_FIELDS = ['rationale'] as const;
+const GRAM_LENGTH = 3;
+const MIN_TOKEN_LENGTH = GRAM_LENGTH;
+
+export type GramField = typeof GRAM_FIELDS[number];
+type Postings = { [key: string]: number[] };
+
+export interface CorpusSearchIndex {
+  version: number;
+  count: number;
+  source: SourceSignature | null;
+  grams: { [field in GramField]: Postings };
+}
+
+export function tokenize(text: unknown): string[] {
+  if (typeof text !== 'string') {
+    return [];
+  }
+  return (text.toLowerCase().match(/[0-9a-z]+/g) || []).filter(token => token.length >= MIN_TOKEN_LENGTH);
+}
+
+export function trigrams(token: string): string[] {
+  const grams = new Set<string>();
+  for (let i = 0; i + GRAM_LENGTH <= token.length; i++) {
+    grams.add(token.slice(i, i + GRAM_LENGTH));
+  }
+  return Array.from(grams);
+}
+
+// Own keys only: keys such as "constructor" must not hit Object.prototype
+export function postingsFor(postings: Postings, key: string): number[] {
+  return Object.prototype.hasOwnProperty.call(postings, key) ? postings[key] : [];
+}
+
+function post(postings: Postings, key: string, id: number): void {
+  if (!Object.prototype.hasOwnProperty.call(postings, key)) {
+    postings[key] = [];
+  }
+  const ids = postings[key];
+  if (ids[ids.length - 1] !== id) {
+    ids.push(id);
+  }
+}
+
+export function buildCorpusSearchIndex(campaigns: any[]): CorpusSearchIndex {
+  const index: CorpusSearchIndex = {
+    version: SEARCH_INDEX_VERSION,
+    count: campaigns.length,
+    source: null,
+    grams: { rationale: {} },
+  };
+  campaigns.forEach((campaign, id) => {
+    for (const field of GRAM_FIELDS) {
+      for (const token of tokenize(campaign[field])) {
+        for (const gram of trigrams(token)) {
+          post(index.grams[field], gram, id);
+        }
+      }
+    }
+  });
+  return index;
+}
+
+/**
+ * The shipped index for `campaigns` (as loaded from the first corpus found),
+ * or one built from them when the shipped file does not match.
+ */
+export function loadCorpusSearchIndex(campaigns: any[]): CorpusSearchIndex {
+  for (const jsonPath of CORPUS_PATHS) {
+    const indexPath = jsonPath.replace(/\.json$/, '.search-index.json');
+    if (!existsSync(jsonPath)) {
+      continue;
+    }
+    if (existsSync(indexPath)) {
+      try {
+        const index: CorpusSearchIndex = JSON.parse(readFileSync(indexPath, 'utf-8'));
+        if (index.version === SEARCH_INDEX_VERSION && index.count === campaigns.length &&
+            matchesSource(index.source, jsonPath)) {
+          return index;
+        }
+      } catch (error) {
+        console.warn(`Ignoring ${indexPath}:`, error);
+      }
+    }
+    break;
+  }
+  return buildCorpusSearchIndex(campaigns);
+}
+
+/**
+ * Sorted ids of campaigns whose field may contain `text` as a substring, to be
+ * checked against the field itself; null when every campaign may (the text
+ * has no token to narrow the search by)
+ */
+export function substringCandidates(index: CorpusSearchIndex, text: string, field: GramField = 'rationale'): number[] | null {
+  const grams = Array.from(new Set(tokenize(text).flatMap(trigrams)));
+  if (grams.length === 0) {
+    return null;
+  }
+  let ids: number[] | null = null;
+  for (const gram of grams) {
+    const postings = new Set(postingsFor(index.grams[field], gram));
+    ids = ids === null ? Array.from(postings) : ids.filter(id => postings.has(id));
+    if (ids.length === 0) {
+      break;
+    }
+  }
+  return (ids || []).sort((a, b) => a - b);
+}
@@ -5,8 +5,8 @@ import { createClient, SupabaseClient } from "@supabase/supabase-js";
 import crypto from "crypto";
 import { cosineSimilarity } from "./embeddingSimilarity";
 import { performanceMonitor, measureAsync } from "./performanceMonitor";
-import { readFileSync, existsSync } from 'fs';
-import { join } from 'path';
+import { loadCorpusCampaigns } from './columnarCorpus';
+import { loadCorpusSearchIndex, substringCandidates } from './corpusSearchIndex';
 
 const GEMINI_API_KEY = process.env.GEMINI_API_KEY || '';
 const GEMINI_EMBEDDING_URL = `https://generativelanguage.googleapis.com/v1beta/models/gemini-embedding-001:embedContent?key=${GEMINI_API_KEY}`;
@@ -20,23 +20,6 @@ function getSupabase(): SupabaseClient | null {
   return supabase;
 }
 
-// Load JSON at runtime to avoid esbuild resolution issues
-function loadRetrievalCorpus() {
-  const possiblePaths = [
-    join(process.cwd(), 'data', 'retrieval-corpus.json'),
-    join(process.cwd(), 'server', 'data', 'retrieval-corpus.json'),
-    '/var/task/data/retrieval-corpus.json',
-  ];
-
-  for (const p of possiblePaths) {
-    if (existsSync(p)) {
-      return JSON.parse(readFileSync(p, 'utf-8'));
-    }
-  }
-  console.warn('retrieval-corpus.json not found, using empty corpus');
-  return { campaigns: [] };
-}
-
 interface CorpusEntry {
   campaign: string;
   brand: string;
@@ -49,8 +32,28 @@ interface CorpusEntry {
   whenNotToUse: string;
 }
 
-const retrievalCorpusData = loadRetrievalCorpus();
-const retrievalCorpus: CorpusEntry[] = retrievalCorpusData.campaigns || [];
+// Load JSON at runtime to avoid esbuild resolution issues
+const retrievalCorpus: CorpusEntry[] = loadCorpusCampaigns<CorpusEntry>();
+
+// Posting lists shipped with the corpus (built here if missing or stale)
+const corpusIndex = loadCorpusSearchIndex(retrievalCorpus);
+
+// Ids of entries whose rationale contains the query's first 20 characters or
+// one of its longer words. The trigram postings narrow each substring check to
+// a few candidate rationales instead of scanning all of them
+function relevantEntryIds(queryLower: string): Set<number> {
+  const ids = new Set<number>();
+  const needles = new Set([queryLower.slice(0, 20), ...queryLower.split(' ').filter(word => word.length > 3)]);
+  for (const needle of needles) {
+    const candidates = substringCandidates(corpusIndex, needle) ?? retrievalCorpus.map((_, id) => id);
+    for (const id of candidates) {
+      if (!ids.has(id) && (retrievalCorpus[id].rationale?.toLowerCase() || '').includes(needle)) {
+        ids.add(id);
+      }
+    }
+  }
+  return ids;
+}
 
 interface RetrievalCacheRecord {
   promptHash: string;
@@ -162,12 +165,8 @@ export async function retrieveTopNWithRotation(
       const promptEmbedding = await getEmbedding(promptText);
 
       // Filter relevant entries by query keywords in rationale
-      const relevantEntries = retrievalCorpus.filter(entry => {
-        const rationale = entry.rationale?.toLowerCase() || '';
-        const campaign = entry.campaign?.toLowerCase() || '';
-        return rationale.includes(queryLower.slice(0, 20)) || // First 20 chars for context
-               queryLower.split(' ').some(word => word.length > 3 && rationale.includes(word));
-      });
+      const relevantIds = relevantEntryIds(queryLower);
+      const relevantEntries = retrievalCorpus.filter((_, id) => relevantIds.has(id));
 
       const entriesToProcess = relevantEntries.length > 10 ? relevantEntries : retrievalCorpus;
 
@@ -5,6 +5,7 @@
 import OpenAI from 'openai';
 import fs from 'fs/promises';
 import crypto from 'crypto';
+import { loadCorpusCampaigns } from './columnarCorpus';
 
 const openai = new OpenAI({
   apiKey: process.env.OPENAI_API_KEY || process.env.GEMINI_API_KEY,
@@ -68,9 +69,7 @@ class EnhancedEmbeddingRetrieval {
 
   private async loadCorpus(): Promise<void> {
     try {
-      const data = await fs.readFile('data/retrieval-corpus.json', 'utf8');
-      const parsed = JSON.parse(data);
-      this.corpus = parsed.campaigns || [];
+      this.corpus = loadCorpusCampaigns<CampaignEntry>();
       //console.log(`📚 Loaded ${this.corpus.length} campaigns`);
     } catch (error) {
       console.error('Failed to load corpus:', error);
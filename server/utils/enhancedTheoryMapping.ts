@@ -2,26 +2,10 @@
 // Enhanced Theory Injection with Expanded Keyword-to-Theory Mapping
 
 import { performance } from 'perf_hooks';
-import { appendFileSync, readFileSync, existsSync } from 'fs';
+import { appendFileSync } from 'fs';
 import { join, dirname } from 'path';
 import { fileURLToPath } from 'url';
-
-// Load JSON at runtime to avoid esbuild resolution issues
-function loadRetrievalCorpus() {
-  const possiblePaths = [
-    join(process.cwd(), 'data', 'retrieval-corpus.json'),
-    join(process.cwd(), 'server', 'data', 'retrieval-corpus.json'),
-    '/var/task/data/retrieval-corpus.json',
-  ];
-
-  for (const p of possiblePaths) {
-    if (existsSync(p)) {
-      return JSON.parse(readFileSync(p, 'utf-8'));
-    }
-  }
-  console.warn('retrieval-corpus.json not found, using empty corpus');
-  return { campaigns: [] };
-}
+import { loadCorpusCampaigns } from './columnarCorpus';
 
 interface CorpusEntry {
   campaign: string;
@@ -35,8 +19,8 @@ interface CorpusEntry {
   whenNotToUse: string;
 }
 
-const retrievalCorpusData = loadRetrievalCorpus();
-const retrievalCorpus: CorpusEntry[] = retrievalCorpusData.campaigns || [];
+// Load JSON at runtime to avoid esbuild resolution issues
+const retrievalCorpus: CorpusEntry[] = loadCorpusCampaigns<CorpusEntry>();
 
 // Performance caching for theory queries
 const corpusQueryCache = new Map<string, any[]>();
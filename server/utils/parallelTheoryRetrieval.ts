@@ -1,6 +1,7 @@
 // Parallel theory retrieval for performance optimization
 import { Worker } from 'worker_threads';
 import { cpus } from 'os';
+import { loadCorpusCampaigns } from './columnarCorpus';
 
 interface TheoryQuery {
   theory: string;
@@ -13,6 +14,9 @@ interface TheoryResult {
   processingTime: number;
 }
 
+// Loaded on first use
+let retrievalCorpus: any[] | null = null;
+
 /**
  * Parallel corpus query to reduce time variance from 5.8s standard deviation
  */
@@ -90,9 +94,11 @@ export async function generateConceptWithParallelTheoryInject(
   
   //console.log(`PARALLEL THEORY MAPPING: ${detectedKeywords.length} keywords → ${selectedTheories.length} theories`);
   
-  // Import corpus data
-  const retrievalCorpusData = await import("../../data/retrieval-corpus.json");
-  const corpus = retrievalCorpusData.campaigns || [];
+  // Corpus data, read once
+  if (!retrievalCorpus) {
+    retrievalCorpus = loadCorpusCampaigns();
+  }
+  const corpus = retrievalCorpus;
   
   // Parallel theory retrieval
   const theoryMatches = await parallelQueryCorpusForTheories(selectedTheories, corpus);
@@ -24,9 +24,12 @@ interface RhetoricalDevice {
   figure_name: string;
   definition: string;
   examples?: string[];
+  // Names merged into this figure by figures_near_duplicates.py
+  aliases?: string[];
 }
 
 let _allRhetoricalDevices: Record<string, string> | null = null;
+let _deviceAliases: Record<string, string> = {};
 
 // Get __dirname equivalent for ESM
 const __filename = fileURLToPath(import.meta.url);
@@ -66,11 +69,16 @@ export function loadAllRhetoricalDevices(): Record<string, string> {
       try {
         const data: RhetoricalDevice[] = JSON.parse(readFileSync(p, 'utf-8'));
         const devices: Record<string, string> = {};
+        const aliases: Record<string, string> = {};
         for (const item of data) {
           // Normalize name: lowercase with underscores for ID
           const id = item.figure_name.toLowerCase().replace(/\s+/g, '_');
           devices[id] = item.definition;
+          for (const alias of item.aliases || []) {
+            aliases[alias.toLowerCase().replace(/\s+/g, '_')] = id;
+          }
         }
+        _deviceAliases = aliases;
         //console.log(`📚 TropeConstraints: Loaded ${Object.keys(devices).length} rhetorical devices from ${p}`);
         _allRhetoricalDevices = devices;
         return devices;
@@ -108,9 +116,9 @@ export function getDeviceDefinition(deviceId: string): string | undefined {
   const pattern = TROPE_PATTERNS[normalizedId];
   if (pattern) return pattern.description;
 
-  // Check full corpus
+  // Check full corpus, resolving names merged as near-duplicates
   const devices = loadAllRhetoricalDevices();
-  return devices[normalizedId];
+  return devices[normalizedId] ?? devices[_deviceAliases[normalizedId]];
 }
 
 // ============================================
@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+Benchmark and golden-corpus regression test for the RTF corpus extractors
+Runs every extraction strategy against the attached_assets RTF exports and
+synthetic 10x/100x copies of them, each in a fresh process, recording wall
+time, peak RSS and campaigns recovered. Results are checked against the
+golden campaign set and the recorded baseline in corpus-extraction-golden.json,
+so a strategy that recovers fewer campaigns or gets markedly slower fails
+the run. Use --update to record a new golden set and baseline.
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import resource
+import tempfile
+import subprocess
+import importlib.util
+from collections import Counter
+from contextlib import redirect_stdout
+from corpus_ingest import ASSETS_DIR, find_sources
+from rtf_scan import RAW_ARRAY_KEY_RE, find_array, mapped
+
+GOLDEN_FILE = 'corpus-extraction-golden.json'
+GOLDEN_VERSION = 1
+REFERENCE_STRATEGY = 'full-text'
+SCALES = (1, 10, 100)
+# A run fails when it takes longer than baseline * TOLERANCE + MIN_SLACK seconds
+TOLERANCE = float(os.environ.get('BENCH_TOLERANCE', '2.0'))
+MIN_SLACK = 0.25
+
+# \uN escapes outside the BMP arrive as UTF-16 surrogate pairs, one escape per half
+SURROGATE_CASES = {
+    r'{\rtf1\ansi Hi \u-10179?\u-8704? there}': 'Hi \U0001F600 there',
+    r'{\rtf1\ansi \u-10179?\u-8704?\u-10179?\u-8703?}': '\U0001F600\U0001F601',
+    r'{\rtf1\ansi lone \u-10179? half}': 'lone \ufffd half',
+}
+
+RTF_ESCAPES = str.maketrans({'\\': '\\\\', '{': '\\{', '}': '\\}', '\n': '\\\n'})
+
+
+def load_script(name):
+    """Import a hyphenated extractor script as a module"""
+    spec = importlib.util.spec_from_file_location(name.replace('-', '_'), f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def full_text(path):
+    from json_recovery import recover_objects
+    from rtf_text import read_rtf_text
+    return recover_objects(read_rtf_text(path))[0]
+
+
+def mapped_region(path):
+    from json_recovery import recover_objects
+    from rtf_scan import read_array_text
+    return recover_objects(read_array_text(path)[0], start=1)[0]
+
+
+def decode_cache(path):
+    from corpus_cache import load_campaigns
+    return load_campaigns(path)[0]
+
+
+def script_strategy(name, function):
+    def run(path):
+        return getattr(load_script(name), function)(path)
+    return run
+
+
+# Strategy name -> callable(path) returning the recovered campaigns
+STRATEGIES = {
+    'full-text': full_text,
+    'mapped-region': mapped_region,
+    'decode-cache': decode_cache,
+    # Same loader, run against the cache the decode-cache run just filled
+    'decode-cache-warm': decode_cache,
+    'extract-rtf-corpus': script_strategy('extract-rtf-corpus', 'extract_campaigns'),
+    'extract-full-corpus': script_strategy('extract-full-corpus', 'extract_campaigns_from_rtf'),
+    'extract-complete-corpus': script_strategy('extract-complete-corpus', 'extract_campaigns_from_rtf'),
+    'extract-robust-corpus': script_strategy('extract-robust-corpus', 'extract_and_validate_json')
+}
+
+
+def campaign_key(campaign):
+    if not isinstance(campaign, dict):
+        return [None, None, None]
+    return [campaign.get('campaign'), campaign.get('brand'), campaign.get('year')]
+
+
+def peak_rss_kb():
+    """Peak resident set size of this process in KB
+
+    Linux carries ru_maxrss over from the parent across fork and exec, so
+    the per-process VmHWM is preferred where /proc is available.
+    """
+    try:
+        with open('/proc/self/status', 'r') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def run_child(strategy, path):
+    """Child process: run one strategy and print its measurements as JSON"""
+    function = STRATEGIES[strategy]
+    startup_rss_kb = peak_rss_kb()
+    with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+        start = time.perf_counter()
+        campaigns = function(path)
+        elapsed = time.perf_counter() - start
+    print(json.dumps({
+        "seconds": elapsed,
+        "peak_rss_kb": peak_rss_kb(),
+        "startup_rss_kb": startup_rss_kb,
+        "keys": [campaign_key(c) for c in campaigns]
+    }))
+    return 0
+
+
+def measure(strategy, path, cache_dir):
+    """Run a strategy in a fresh process so peak RSS belongs to this run alone"""
+    env = dict(os.environ, CORPUS_CACHE_DIR=cache_dir)
+    result = subprocess.run(
+        [sys.executable, __file__, '--child', strategy, path],
+        capture_output=True, text=True, env=env
+    )
+    if result.returncode != 0:
+        return {"error": (result.stderr.strip().splitlines() or ['failed'])[-1]}
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def rtf_escape(text):
+    """Encode plain text as RTF body text, one output line per input line"""
+    return text.translate(RTF_ESCAPES)
+
+
+def check_surrogates():
+    """Return a list of problems decoding SURROGATE_CASES, whole and split at every byte"""
+    from rtf_text import iter_rtf_text
+    problems = []
+    for rtf, expected in SURROGATE_CASES.items():
+        splits = [[rtf]] + [[rtf[:i], rtf[i:]] for i in range(1, len(rtf))]
+        for pieces in splits:
+            text = ''.join(iter_rtf_text(pieces))
+            if text != expected:
+                problems.append(f"{rtf!r} split at {len(pieces[0])}: {text!r} != {expected!r}")
+                break
+    return problems
+
+
+def write_scaled_copy(path, campaigns, scale, folder):
+    """Write an RTF repeating campaigns scale times, returning (path, keys)
+
+    Copies keep the source's RTF header; every repeat after the first gets
+    a distinct campaign name so the copies are separate golden entries.
+    """
+    with mapped(path) as data:
+        start = find_array(data)
+        header = bytes(data[:start])
+        keyed = RAW_ARRAY_KEY_RE.search(data) is not None
+
+    objects = []
+    for copy in range(scale):
+        for campaign in campaigns:
+            if copy and isinstance(campaign, dict):
+                campaign = dict(campaign, campaign=f"{campaign.get('campaign')} (copy {copy})")
+            objects.append(campaign)
+
+    body = ',\n'.join(json.dumps(campaign, ensure_ascii=False) for campaign in objects)
+    trailer = ']\\\n\\}\\\n}' if keyed else ']\\\n}'
+    name = os.path.basename(path)
+    scaled_path = os.path.join(folder, f"x{scale}-{name}")
+    with open(scaled_path, 'wb') as f:
+        f.write(header)
+        f.write(('[\\\n' + rtf_escape(body) + '\\\n' + trailer).encode('utf-8'))
+    return scaled_path, [campaign_key(c) for c in objects]
+
+
+def recall(golden, keys):
+    """Number of golden campaigns found among keys (duplicates counted once each)"""
+    found = Counter(map(tuple, golden)) & Counter(map(tuple, keys))
+    return sum(found.values())
+
+
+def load_golden(path=GOLDEN_FILE):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            golden = json.load(f)
+    except FileNotFoundError:
+        return None
+    if golden.get('version') != GOLDEN_VERSION:
+        print(f"⚠️ Ignoring {path}: version {golden.get('version')} != {GOLDEN_VERSION}")
+        return None
+    return golden
+
+
+def save_golden(path, sources, baseline):
+    """Write the golden file with one campaign key per line for readable diffs"""
+    lines = ['{', f'  "version": {GOLDEN_VERSION},', '  "sources": {']
+    for i, (name, keys) in enumerate(sources.items()):
+        lines.append(f'    {json.dumps(name)}: [')
+        lines.append(',\n'.join(f'      {json.dumps(key, ensure_ascii=False)}' for key in keys))
+        lines.append('    ]' + (',' if i < len(sources) - 1 else ''))
+    lines.append('  },')
+    baseline_json = json.dumps(baseline, indent=2, ensure_ascii=False).replace('\n', '\n  ')
+    lines.append(f'  "baseline": {baseline_json}')
+    lines.append('}')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lines) + '\n')
+
+
+def check(result, golden_keys, baseline):
+    """Return a list of regressions for one run against its baseline"""
+    problems = []
+    if 'error' in result:
+        return [f"failed: {result['error']}"]
+    if baseline is None:
+        return problems
+    if result['found'] < baseline['found']:
+        problems.append(f"recall {result['found']}/{len(golden_keys)} "
+                        f"< baseline {baseline['found']}")
+    limit = baseline['seconds'] * TOLERANCE + MIN_SLACK
+    if result['seconds'] > limit:
+        problems.append(f"{result['seconds']:.2f}s > {limit:.2f}s "
+                        f"(baseline {baseline['seconds']:.2f}s)")
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark and regression-test the RTF extractors")
+    parser.add_argument('--assets', default=ASSETS_DIR, help="folder with the RTF sources")
+    parser.add_argument('--scales', default=','.join(map(str, SCALES)),
+                        help="comma-separated copy factors (default 1,10,100)")
+    parser.add_argument('--strategies', default=','.join(STRATEGIES),
+                        help="comma-separated strategies to run")
+    parser.add_argument('--golden', default=GOLDEN_FILE, help="golden set and baseline file")
+    parser.add_argument('--update', action='store_true',
+                        help="record this run as the new golden set and baseline")
+    parser.add_argument('--child', nargs=2, metavar=('STRATEGY', 'PATH'), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        return run_child(*args.child)
+
+    scales = [int(scale) for scale in args.scales.split(',')]
+    strategies = [name for name in args.strategies.split(',') if name]
+    unknown = [name for name in strategies if name not in STRATEGIES]
+    if unknown:
+        print(f"❌ Unknown strategies: {', '.join(unknown)}")
+        return 1
+
+    failures = [f"rtf_text: {problem}" for problem in check_surrogates()]
+    print(f"{'❌' if failures else '✅'} rtf_text surrogate pairs ({len(SURROGATE_CASES)} cases)")
+
+    golden = None if args.update else load_golden(args.golden)
+    if golden is None and not args.update:
+        print(f"⚠️ No golden set in {args.golden}; run with --update to record one")
+    golden_sources = golden['sources'] if golden else {}
+    baselines = golden['baseline'] if golden else {}
+
+    sources = [path for path in find_sources(args.assets) if path.lower().endswith('.rtf')]
+    workdir = tempfile.mkdtemp(prefix='corpus-bench-')
+    runs = {}
+    new_golden = {}
+
+    try:
+        for path in sources:
+            name = os.path.basename(path)
+            reference = measure(REFERENCE_STRATEGY, path, os.path.join(workdir, 'reference'))
+            if 'error' in reference or not reference['keys']:
+                print(f"⏭️  {name}: no campaigns array")
+                continue
+            if name in golden_sources:
+                keys = golden_sources[name]
+            else:
+                keys = reference['keys']
+                if not args.update:
+                    print(f"⚠️ {name} is not in the golden set; checking against {REFERENCE_STRATEGY}")
+            new_golden[name] = keys
+
+            campaigns = None
+            for scale in scales:
+                if scale == 1:
+                    target, golden_keys = path, keys
+                else:
+                    if campaigns is None:
+                        campaigns = full_text(path)
+                    target, golden_keys = write_scaled_copy(path, campaigns, scale, workdir)
+                label = f"{name} x{scale}"
+                size = os.path.getsize(target)
+                print(f"\n📄 {label} ({size / 1e6:.1f} MB, {len(golden_keys)} golden campaigns)")
+
+                cache_dir = os.path.join(workdir, 'cache')
+                for strategy in strategies:
+                    if strategy != 'decode-cache-warm':
+                        shutil.rmtree(cache_dir, ignore_errors=True)
+                    result = measure(strategy, target, cache_dir)
+                    if 'error' not in result:
+                        result['found'] = recall(golden_keys, result['keys'])
+                        result['recovered'] = len(result.pop('keys'))
+                    baseline = baselines.get(strategy, {}).get(label)
+                    problems = check(result, golden_keys, baseline)
+                    runs.setdefault(strategy, {})[label] = result
+
+                    if 'error' in result:
+                        print(f"   ❌ {strategy:24s} {result['error']}")
+                    else:
+                        status = '❌' if problems else '✅'
+                        print(f"   {status} {strategy:24s} {result['found']:6d}/{len(golden_keys):<6d} "
+                              f"{result['seconds']:7.3f}s {result['peak_rss_kb'] / 1024:7.1f} MB peak "
+                              f"(+{(result['peak_rss_kb'] - result['startup_rss_kb']) / 1024:.1f})")
+                    for problem in problems:
+                        print(f"      ↳ {problem}")
+                        failures.append(f"{strategy} on {label}: {problem}")
+                if scale != 1:
+                    os.remove(target)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if args.update:
+        baseline = {
+            strategy: {
+                label: {"found": r['found'], "seconds": round(r['seconds'], 4),
+                        "peak_rss_kb": r['peak_rss_kb']}
+                for label, r in results.items() if 'error' not in r
+            }
+            for strategy, results in runs.items()
+        }
+        save_golden(args.golden, new_golden, baseline)
+        print(f"\n💾 Golden set and baseline saved to {args.golden}")
+        return 0
+
+    if failures:
+        print(f"\n❌ {len(failures)} regression(s):")
+        for failure in failures:
+            print(f"   {failure}")
+        return 1
+    print(f"\n✅ No regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
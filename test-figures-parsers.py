@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Parser backend equivalence test and benchmark for the Figures pipeline
+Parses the full Figures corpus with every installed backend, checks that
+figure_name/definition/examples/notes come out byte-identical to the
+html.parser reference and reports files/sec for each backend. Fails when
+any installed backend differs, opt-in ones included, so a backend is only
+added to EQUIVALENT_PARSERS (what 'auto' may pick) once this passes.
+"""
+
+import os
+import sys
+import json
+import time
+from figures_ingest import FOLDER_PATH, ZIP_PATHS, find_html_files, iter_file_sources, iter_zip_sources, parse_source
+from figures_parsers import EQUIVALENT_PARSERS, REFERENCE_PARSER, available_parsers
+from figures_records import expand
+
+COMPARED_FIELDS = ['figure_name', 'definition', 'examples', 'notes']
+RECORD_SHAPES = ['figure_data', 'figure', 'nested', 'split']
+
+
+def load_corpus():
+    """Load every page as (source_file, raw) from ./Figures or the archives"""
+    if os.path.isdir(FOLDER_PATH):
+        print(f"📂 Corpus: {FOLDER_PATH}")
+        return list(iter_file_sources(find_html_files(FOLDER_PATH)))
+    print(f"📦 Corpus: {', '.join(ZIP_PATHS)}")
+    return list(iter_zip_sources(ZIP_PATHS))
+
+
+def page_fields(page):
+    """Serialize the compared fields of every record shape on a page"""
+    fields = {}
+    for shape in RECORD_SHAPES:
+        records = page[shape]
+        if not isinstance(records, list):
+            records = [records] if records else []
+        fields[shape] = json.dumps(
+            [[expand(record)[field] for field in COMPARED_FIELDS] for record in records],
+            ensure_ascii=False
+        ).encode('utf-8')
+    return fields
+
+
+def run_backend(corpus, parser):
+    """Parse the corpus with one backend, returning (fields per page, seconds)"""
+    start = time.perf_counter()
+    pages = [parse_source(source_file, raw, parser) for source_file, raw in corpus]
+    elapsed = time.perf_counter() - start
+    return [page_fields(page) for page in pages], elapsed
+
+
+def main():
+    corpus = load_corpus()
+    if not corpus:
+        print("❌ No Figures pages found")
+        return 1
+
+    parsers = available_parsers()
+    print(f"🔍 {len(corpus)} pages, backends: {', '.join(parsers)}")
+
+    reference, elapsed = run_backend(corpus, REFERENCE_PARSER)
+    results = {REFERENCE_PARSER: elapsed}
+    failures = 0
+
+    for parser in parsers:
+        if parser == REFERENCE_PARSER:
+            continue
+        fields, elapsed = run_backend(corpus, parser)
+        results[parser] = elapsed
+
+        mismatched = {}
+        for (source_file, _), expected, actual in zip(corpus, reference, fields):
+            for shape in RECORD_SHAPES:
+                if expected[shape] != actual[shape]:
+                    mismatched.setdefault(shape, []).append(source_file)
+
+        if mismatched:
+            failures += 1
+            print(f"\n❌ {parser} differs from {REFERENCE_PARSER}:")
+            for shape, files in mismatched.items():
+                print(f"   {shape}: {len(files)} pages (e.g. {files[0]})")
+        else:
+            print(f"\n✅ {parser} output is byte-identical to {REFERENCE_PARSER}")
+            if parser not in EQUIVALENT_PARSERS:
+                print(f"   add it to EQUIVALENT_PARSERS to let 'auto' pick it")
+
+    print(f"\n⏱️  Benchmark ({len(corpus)} pages):")
+    for parser, elapsed in results.items():
+        print(f"   {parser:12s} {len(corpus) / elapsed:8.1f} files/sec  ({elapsed:.2f}s)")
+
+    if failures:
+        print(f"\n❌ {failures} backend(s) differ from {REFERENCE_PARSER}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
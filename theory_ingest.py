@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Incremental theory snippet ingestion for the retrieval corpus
+Decodes a batch of theory frameworks through the decode cache, checks it
+against a persisted index of resolved campaign entities and adds the new
+isTheory entries to the segmented corpus store as one new segment, which
+is also appended to the tail of data/retrieval-corpus.json in place.
+"""
+
+import os
+import sys
+import json
+import argparse
+from campaign_resolver import CampaignResolver
+from corpus_cache import load_campaigns
+from corpus_store import CORPUS_FILE, STORE_DIR, CorpusStore, file_signature
+
+INDEX_FILE = 'corpus_key_index.json'
+
+# Bump when the index layout changes so stale indexes are rebuilt
+INDEX_VERSION = 2
+
+THEORY_FIELDS = {
+    'isTheory': True,
+    'outcome': 'Academic Framework',
+    'impactMetric': 'Foundational Theory',
+    'award': 'Theoretical Framework'
+}
+THEORY_DEFAULTS = {
+    'whenToUse': 'Visual rhetoric application in advertising design',
+    'whenNotToUse': 'Direct product claims requiring literal representation'
+}
+
+
+def campaign_key(campaign):
+    """Exact campaign-brand key for reports; duplicates are found by CampaignResolver"""
+    name = str(campaign.get('campaign') or '').lower().strip()
+    brand = str(campaign.get('brand') or '').lower().strip()
+    return f"{name}-{brand}"
+
+
+def enhance_theory_entries(theory_entries):
+    """Enhance theory entries with additional metadata"""
+    enhanced = []
+    for entry in theory_entries:
+        enhanced_entry = dict(entry, **THEORY_FIELDS)
+        for field, default in THEORY_DEFAULTS.items():
+            if not enhanced_entry.get(field):
+                enhanced_entry[field] = default
+        enhanced.append(enhanced_entry)
+    return enhanced
+
+
+class CorpusKeyIndex:
+    """Resolved campaign entities plus the running totals the ingestion scripts report"""
+
+    def __init__(self):
+        self.resolver = CampaignResolver()
+        self.entries = 0
+        self.theory = 0
+        self.devices = set()
+
+    def add(self, campaign):
+        self.resolver.assign(campaign)
+        self.entries += 1
+        if campaign.get('isTheory'):
+            self.theory += 1
+        devices = campaign.get('rhetoricalDevices') or []
+        if isinstance(devices, list):
+            self.devices.update(d for d in devices if isinstance(d, str))
+
+    def __contains__(self, campaign):
+        return campaign in self.resolver
+
+    def __len__(self):
+        return self.entries
+
+
+def build_index(corpus_file=CORPUS_FILE):
+    """Index every entry of the corpus (a full read, only when the index is stale)"""
+    index = CorpusKeyIndex()
+    with open(corpus_file, 'r', encoding='utf-8') as f:
+        for campaign in json.load(f).get('campaigns', []):
+            index.add(campaign)
+    return index
+
+
+def save_index(index, corpus_file, signature, path=INDEX_FILE):
+    """Persist an index atomically together with the corpus signature it matches"""
+    data = dict(signature, version=INDEX_VERSION, input=corpus_file,
+                entries=index.entries, theory=index.theory,
+                devices=sorted(index.devices), entities=index.resolver.entities)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp_path, path)
+
+
+def read_index(path, corpus_file, signature):
+    """Return a persisted index if the corpus is unchanged since it was saved, else None"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    if data.get('version') != INDEX_VERSION or data.get('input') != corpus_file:
+        return None
+    if (data['mtime'], data['size']) != (signature['mtime'], signature['size']):
+        return None
+
+    index = CorpusKeyIndex()
+    for title, brand, year in data['entities']:
+        index.resolver.add_normalized(title, brand, year)
+    index.entries = data['entries']
+    index.theory = data['theory']
+    index.devices = set(data['devices'])
+    return index
+
+
+def load_index(corpus_file=CORPUS_FILE, path=INDEX_FILE, rebuild=False):
+    """Load the persisted key index for corpus_file, rebuilding it when stale"""
+    signature = file_signature(corpus_file)
+    index = None if rebuild else read_index(path, corpus_file, signature)
+    if index is None:
+        index = build_index(corpus_file)
+        save_index(index, corpus_file, signature, path)
+        print(f"🗂️  Indexed {len(index)} corpus entries from {corpus_file}")
+    return index
+
+
+def ingest_theory(source, corpus_file=CORPUS_FILE, index_path=INDEX_FILE, store_dir=STORE_DIR):
+    """Add the new theory entries of one RTF batch to the corpus store
+
+    Returns a dict with the extracted, new and duplicate entries, the new
+    segment (None when nothing was added) and the updated index. Raises
+    ValueError when the source has no array.
+    """
+    theory_data, _, _ = load_campaigns(source)
+    store = CorpusStore(store_dir, corpus_file)
+    store.sync()
+    index = load_index(corpus_file, index_path)
+
+    new_theories = []
+    duplicates = []
+    batch = CampaignResolver()
+    for theory in theory_data:
+        if theory in index or theory in batch:
+            duplicates.append(theory)
+        else:
+            batch.add(theory)
+            new_theories.append(theory)
+
+    # Keep each batch ordered without re-sorting the corpus around it
+    enhanced = sorted(enhance_theory_entries(new_theories), key=lambda x: (
+        x.get('year') or 0, str(x.get('brand', '')), str(x.get('campaign', ''))
+    ))
+
+    segment = None
+    if enhanced:
+        segment = store.append(enhanced, source)
+        for theory in enhanced:
+            index.add(theory)
+        save_index(index, corpus_file, file_signature(corpus_file), index_path)
+
+    return {
+        "extracted": theory_data,
+        "added": enhanced,
+        "duplicates": duplicates,
+        "segment": segment,
+        "index": index
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Append a batch of theory snippets to the corpus")
+    parser.add_argument('source', help="theory batch (RTF or JSON text)")
+    parser.add_argument('--corpus', default=CORPUS_FILE, help="corpus to append to")
+    parser.add_argument('--store', default=STORE_DIR, help="segmented corpus store")
+    parser.add_argument('--rebuild-index', action='store_true', help="re-read the whole corpus first")
+    args = parser.parse_args(argv)
+
+    if args.rebuild_index:
+        load_index(args.corpus, rebuild=True)
+    try:
+        result = ingest_theory(args.source, args.corpus, store_dir=args.store)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+
+    index = result['index']
+    print(f"📊 {len(result['added'])} new, {len(result['duplicates'])} duplicates skipped")
+    print(f"📊 Corpus: {len(index)} entries ({index.theory} theory)")
+    if result['segment']:
+        print(f"💾 Segment {result['segment']['file']} added to {args.store}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
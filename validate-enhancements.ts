@@ -61,23 +61,21 @@ async function validateEnhancements(): Promise<void> {
       }
     }
     
-    // 4. Check backup files
-    console.log('\n💾 Checking backup files...');
-    const backupFiles = [
-      'corpus-enhanced-quality.json',
-      'corpus-with-public-health.json',
-      'corpus-with-classics.json'
-    ];
-    
-    for (const file of backupFiles) {
-      try {
-        await fs.access(file);
-        const data = await fs.readFile(file, 'utf8');
-        const backup = JSON.parse(data);
-        console.log(`${file} (${backup.campaigns?.length || 0} campaigns)`);
-      } catch {
-        console.log(`${file} not found`);
+    // 4. Check corpus versions
+    console.log('\n💾 Checking corpus versions...');
+    try {
+      const versionDir = 'data/corpus-versions/versions';
+      const manifests = await Promise.all(
+        (await fs.readdir(versionDir))
+          .filter(file => file.endsWith('.json'))
+          .map(async file => JSON.parse(await fs.readFile(`${versionDir}/${file}`, 'utf8')))
+      );
+      manifests.sort((a, b) => a.sequence - b.sequence);
+      for (const manifest of manifests) {
+        console.log(`${manifest.name} (${manifest.count} campaigns)`);
       }
+    } catch {
+      console.log('No corpus versions found (python corpus_versions.py commit NAME)');
     }
     
     // 5. Generate quality report